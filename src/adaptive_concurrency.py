@@ -0,0 +1,217 @@
+"""
+Adaptive concurrency module for Obsidian Abstractor.
+
+This module limits the number of LLM requests in flight with an AIMD
+(additive increase, multiplicative decrease) controller: the limit shrinks
+when the API throttles us (429/503) or latency rises well above the
+baseline of requests of the same size, grows back by one slot per window of successful calls, and all
+requests pause for as long as a Retry-After hint asks.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# HTTP status codes that mean "slow down" rather than "this request is wrong"
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Weight of a new sample in the moving average of the latency baseline
+BASELINE_WEIGHT = 0.1
+
+
+def is_throttle(error: BaseException) -> bool:
+    """Whether an API error asks us to send fewer requests."""
+    return getattr(error, 'code', None) in THROTTLE_STATUS_CODES
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Delay requested by a throttling error, in seconds.
+    
+    Reads the Retry-After header, then the RetryInfo detail that Gemini puts
+    in the error body (e.g. "retryDelay": "37s").
+    
+    Args:
+        error: Exception raised by the API client
+    
+    Returns:
+        Seconds to wait, or None if the error carries no hint
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is not None:
+        value = headers.get('retry-after')
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass  # HTTP-date form is not used by the Gemini API
+    
+    details = getattr(error, 'details', None)
+    if isinstance(details, dict):
+        for detail in details.get('error', {}).get('details', []) or []:
+            if isinstance(detail, dict) and detail.get('@type', '').endswith('RetryInfo'):
+                match = re.match(r'([\d.]+)s$', str(detail.get('retryDelay', '')))
+                if match:
+                    return float(match.group(1))
+    return None
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on concurrent requests, driven by throttling and latency."""
+    
+    def __init__(self, max_limit: int = 4, min_limit: int = 1,
+                 decrease_factor: float = 0.5, latency_factor: Optional[float] = 3.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep):
+        """
+        Initialize adaptive concurrency (starting at the upper bound).
+        
+        Args:
+            max_limit: Upper bound of concurrent requests
+            min_limit: Lower bound of concurrent requests
+            decrease_factor: Factor applied to the limit on congestion
+            latency_factor: Latency above this multiple of the baseline counts
+                as congestion (None or 0 to ignore latency)
+            clock: Monotonic clock in seconds (injectable for tests)
+            sleep: Coroutine function used to wait (injectable for tests)
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.clock = clock
+        self.sleep = sleep
+        
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # Latency baseline per size class: a long paper is not compared with a short one
+        self.baseline_latency: Dict[int, float] = {}
+        # Requests started before the last decrease saw the old congestion
+        self._last_decrease = float('-inf')
+        # Created on first use, inside the running loop (see RateLimiter)
+        self._condition: Optional[asyncio.Condition] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'AdaptiveConcurrency':
+        """
+        Create a controller from the rate_limit configuration section.
+        
+        Args:
+            config: Configuration dictionary
+        
+        Returns:
+            AdaptiveConcurrency instance
+        """
+        rate_limit = config.get('rate_limit', {})
+        return cls(
+            max_limit=rate_limit.get('max_concurrent_requests', 4),
+            min_limit=rate_limit.get('min_concurrent_requests', 1),
+            latency_factor=rate_limit.get('latency_factor', 3.0),
+        )
+    
+    @property
+    def condition(self) -> asyncio.Condition:
+        """Condition guarding in_flight, created in the running loop."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    @property
+    def current_limit(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return max(self.min_limit, int(self.limit))
+    
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot and any Retry-After pause to end.
+        
+        Returns:
+            Clock reading when the slot was granted
+        """
+        while True:
+            pause = self.paused_until - self.clock()
+            if pause > 0:
+                await self.sleep(pause)
+                continue
+            
+            async with self.condition:
+                if self.in_flight < self.current_limit and self.clock() >= self.paused_until:
+                    self.in_flight += 1
+                    return self.clock()
+                await self.condition.wait()
+    
+    async def release(self, started: float, error: Optional[BaseException] = None, size: float = 1):
+        """
+        Free a slot and adapt the limit to the outcome of the request.
+        
+        Args:
+            started: Value returned by acquire()
+            error: Exception raised by the request, if any
+            size: Size of the request (e.g. estimated tokens)
+        """
+        now = self.clock()
+        if error is None:
+            self._on_success(started, now - started, size)
+        elif is_throttle(error):
+            self._decrease(started, f"API throttled ({getattr(error, 'code', '')})")
+            delay = retry_after(error)
+            if delay:
+                self.paused_until = max(self.paused_until, now + delay)
+                logger.info(f"Pausing LLM requests for {delay:.1f} seconds (Retry-After)")
+        
+        async with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+    
+    @asynccontextmanager
+    async def slot(self, size: float = 1) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of one request.
+        
+        Args:
+            size: Size of the request (e.g. estimated tokens); latency is only
+                compared with requests of a similar size
+        """
+        started = await self.acquire()
+        try:
+            yield
+        except BaseException as e:
+            await self.release(started, e, size)
+            raise
+        await self.release(started, size=size)
+    
+    def _on_success(self, started: float, latency: float, size: float = 1):
+        """Grow the limit, unless latency shows congestion."""
+        # Requests within a factor of two in size share a baseline, an
+        # exponential moving average so that one fast request does not set it
+        size_class = int(math.log2(max(size, 1)))
+        baseline = self.baseline_latency.get(size_class)
+        if baseline is None:
+            self.baseline_latency[size_class] = latency
+        else:
+            self.baseline_latency[size_class] = baseline + (latency - baseline) * BASELINE_WEIGHT
+        
+        if self.latency_factor and baseline and latency > self.latency_factor * baseline:
+            self._decrease(started, f"latency {latency:.1f}s vs baseline {baseline:.1f}s")
+            return
+        
+        # About one slot more per window of `limit` successful requests
+        self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+    
+    def _decrease(self, started: float, reason: str):
+        """Shrink the limit once per congestion event."""
+        if started < self._last_decrease:
+            return
+        previous = self.current_limit
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._last_decrease = self.clock()
+        if self.current_limit < previous:
+            logger.info(f"LLM concurrency {previous} -> {self.current_limit}: {reason}")
@@ -0,0 +1,356 @@
+"""
+Batch job module for Obsidian Abstractor.
+
+This module backfills large libraries through a Gemini batch prediction
+job instead of one request per paper: the requests of all accepted PDFs are
+written to a JSONL file, uploaded and submitted as one job, which runs
+outside the per-minute rate limits. Once the job is done, every response
+goes through the usual NoteFormatter and rename flow. The state of a job
+(which paper each request belongs to, the extracted data its note needs,
+which notes are written) is kept in cache_dir/batch_jobs, so an interrupted
+run resumes from the job name without extracting the papers again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from .note_formatter import DOI_SEARCH_CHARS
+
+if TYPE_CHECKING:
+    from .paper_abstractor import GenerationRequest
+    from .pdf_monitor import PDFMonitor
+
+logger = logging.getLogger(__name__)
+
+# Job states after which the job no longer changes
+TERMINAL_STATES = (
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED',
+    'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED',
+)
+
+# Terminal states in which results can be collected
+COMPLETED_STATES = ('JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED')
+
+# Extracted fields the response parser and NoteFormatter read
+NOTE_FIELDS = ('metadata', 'figures', 'references', 'page_count', 'file_size_mb', 'pdf_path')
+
+
+def request_json(request: 'GenerationRequest') -> Dict[str, Any]:
+    """
+    GenerateContentRequest body of a request, as one line of a batch input file.
+    
+    Args:
+        request: Request built by PaperAbstractor.build_request
+    
+    Returns:
+        JSON-serializable request with camelCase field names and base64 image data
+    """
+    contents = request.contents
+    if isinstance(contents, str):
+        contents = [types.Content(role='user', parts=[types.Part.from_text(text=contents)])]
+    
+    body: Dict[str, Any] = {
+        'contents': [content.model_dump(mode='json', exclude_none=True, by_alias=True) for content in contents],
+        'generationConfig': request.generation_config.model_dump(mode='json', exclude_none=True, by_alias=True),
+    }
+    # Batch jobs outlive context caches, so split instructions travel with each request
+    if request.instructions:
+        body['systemInstruction'] = {'parts': [{'text': request.instructions}]}
+    return body
+
+
+def response_text(response: Dict[str, Any]) -> str:
+    """
+    Text of a GenerateContentResponse from a batch output file.
+    
+    Args:
+        response: Response object of one output line
+    
+    Returns:
+        Concatenated text parts of the first candidate ('' if there are none)
+    """
+    candidates = response.get('candidates') or []
+    if not candidates:
+        return ''
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    return ''.join(part.get('text', '') for part in parts if not part.get('thought'))
+
+
+def note_data(pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Part of the extracted data needed to write a note, kept in the job state.
+    
+    Args:
+        pdf_data: Data extracted from the PDF
+    
+    Returns:
+        JSON-serializable subset with the text cut to the part searched for a DOI
+    """
+    data = {field: pdf_data[field] for field in NOTE_FIELDS if field in pdf_data}
+    data['text'] = pdf_data.get('text', '')[:DOI_SEARCH_CHARS]
+    return data
+
+
+class BatchJobStore:
+    """Local state of submitted batch jobs."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize batch job store.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        cache_dir = Path(config.get('advanced', {}).get('cache_dir', '~/.cache/obsidian-abstractor')).expanduser()
+        self.folder = cache_dir / 'batch_jobs'
+    
+    def state_path(self, job_name: str) -> Path:
+        """State file of a job ('batches/abc' is stored as batches_abc.json)."""
+        return self.folder / f"{job_name.replace('/', '_')}.json"
+    
+    def load(self, job_name: str) -> Dict[str, Any]:
+        """
+        Load the state of a job.
+        
+        Args:
+            job_name: Name of the batch job
+        
+        Returns:
+            State dictionary
+        
+        Raises:
+            ValueError: If the job was not submitted from this machine
+        """
+        path = self.state_path(job_name)
+        if not path.exists():
+            raise ValueError(f"Unknown batch job: {job_name} (no state in {self.folder})")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save(self, state: Dict[str, Any]):
+        """Write the state of a job atomically."""
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self.state_path(state['name'])
+        fd, tmp_name = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_name, path)
+
+
+class BatchJobRunner:
+    """Submit papers as a batch prediction job and write notes from its results."""
+    
+    def __init__(self, monitor: 'PDFMonitor', poll_seconds: Optional[float] = None,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep):
+        """
+        Initialize batch job runner.
+        
+        Args:
+            monitor: Monitor providing the filter, extraction and note writing
+            poll_seconds: Interval between job status checks
+            sleep: Coroutine function used to wait (injectable for tests)
+        
+        Raises:
+            ValueError: If the LLM backend is not the Gemini API
+        """
+        self.monitor = monitor
+        self.abstractor = monitor.paper_abstractor
+        # Batch prediction is a Gemini API service; other backends have no client
+        self.client = getattr(self.abstractor.backend, 'client', None)
+        if self.client is None:
+            raise ValueError("Batch jobs need the Gemini backend (ai.backend: gemini)")
+        self.store = BatchJobStore(monitor.config)
+        advanced_config = monitor.config.get('advanced', {})
+        self.poll_seconds = poll_seconds if poll_seconds is not None else advanced_config.get('batch_job_poll_seconds', 60)
+        self.sleep = sleep
+    
+    async def run(self, pdf_files: List[Path]) -> Tuple[Optional[str], List[Path]]:
+        """
+        Submit papers, wait for the job and write their notes.
+        
+        Args:
+            pdf_files: PDF files to process
+        
+        Returns:
+            Tuple of the job name (None if nothing had to be submitted) and the note paths
+        """
+        job_name, notes = await self.submit(pdf_files)
+        if job_name is not None:
+            notes.extend(await self.resume(job_name))
+        return job_name, notes
+    
+    async def submit(self, pdf_files: List[Path]) -> Tuple[Optional[str], List[Path]]:
+        """
+        Submit the accepted papers as one batch job.
+        
+        Papers with a cached response get their note right away instead.
+        
+        Args:
+            pdf_files: PDF files to process
+        
+        Returns:
+            Tuple of the job name (None if nothing had to be submitted) and
+            the paths of the notes written from cached responses
+        """
+        self.store.folder.mkdir(parents=True, exist_ok=True)
+        requests_file = self.store.folder / f"requests_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.jsonl"
+        items: Dict[str, Dict[str, Any]] = {}
+        notes: List[Path] = []
+        
+        batch_size = self.monitor.batch_size
+        with open(requests_file, 'w', encoding='utf-8') as f:
+            for i in range(0, len(pdf_files), batch_size):
+                batch = pdf_files[i:i + batch_size]
+                prepared_batch = await asyncio.gather(
+                    *(self.monitor.prepare_accepted(pdf) for pdf in batch), return_exceptions=True
+                )
+                
+                for pdf_path, prepared in zip(batch, prepared_batch):
+                    if isinstance(prepared, BaseException):
+                        # Cancellation and interrupts stop the submission
+                        if not isinstance(prepared, Exception):
+                            raise prepared
+                        logger.error(f"Failed to prepare {pdf_path}: {prepared}")
+                        continue
+                    if prepared is None:
+                        continue
+                    
+                    request = self.abstractor.build_request(prepared.pdf_data, prepared.page_images)
+                    cached = self.abstractor.response_cache.get(request.response_key)
+                    if cached is not None:
+                        notes.append(await self._write_note(pdf_path, cached['text'], prepared.pdf_data))
+                        continue
+                    
+                    key = str(len(items))
+                    f.write(json.dumps({'key': key, 'request': request_json(request)}) + '\n')
+                    items[key] = {
+                        'pdf_path': str(pdf_path),
+                        'response_key': request.response_key,
+                        # Saved so that the results do not need the PDF extracted again
+                        'pdf_data': note_data(prepared.pdf_data),
+                    }
+        
+        if self.monitor.verdict_cache is not None:
+            self.monitor.verdict_cache.save()
+        
+        try:
+            if not items:
+                logger.info("No papers to submit as a batch job")
+                return None, notes
+            
+            uploaded = await self.client.aio.files.upload(
+                file=str(requests_file),
+                config=types.UploadFileConfig(mime_type='jsonl', display_name=requests_file.stem),
+            )
+            job = await self.client.aio.batches.create(
+                model=self.abstractor.model_name,
+                src=types.BatchJobSource(file_name=uploaded.name),
+                config=types.CreateBatchJobConfig(display_name=f"obsidian-abstractor-{requests_file.stem}"),
+            )
+        finally:
+            requests_file.unlink(missing_ok=True)
+        
+        self.store.save({
+            'name': job.name,
+            'model': self.abstractor.model_name,
+            'created_at': datetime.now().isoformat(),
+            'items': items,
+            'written': [],
+        })
+        logger.info(f"Submitted batch job {job.name} with {len(items)} papers")
+        return job.name, notes
+    
+    async def wait(self, job_name: str) -> types.BatchJob:
+        """
+        Poll a job until it ends.
+        
+        Args:
+            job_name: Name of the batch job
+        
+        Returns:
+            The finished job
+        """
+        while True:
+            job = await self.client.aio.batches.get(name=job_name)
+            state = job.state.value if job.state else 'JOB_STATE_UNSPECIFIED'
+            if state in TERMINAL_STATES:
+                logger.info(f"Batch job {job_name} finished: {state}")
+                return job
+            logger.info(f"Batch job {job_name}: {state}, checking again in {self.poll_seconds}s")
+            await self.sleep(self.poll_seconds)
+    
+    async def resume(self, job_name: str) -> List[Path]:
+        """
+        Wait for a submitted job and write the notes not written yet.
+        
+        Args:
+            job_name: Name of the batch job
+        
+        Returns:
+            Paths of the notes written by this call
+        
+        Raises:
+            ValueError: If the job is unknown to this machine
+            RuntimeError: If the job failed, expired or was cancelled
+        """
+        state = self.store.load(job_name)
+        job = await self.wait(job_name)
+        if job.state.value not in COMPLETED_STATES:
+            raise RuntimeError(f"Batch job {job_name} ended in {job.state.value}: {job.error}")
+        if job.dest is None or not job.dest.file_name:
+            raise RuntimeError(f"Batch job {job_name} has no results file")
+        
+        results = await self.client.aio.files.download(file=job.dest.file_name)
+        written = set(state['written'])
+        notes = []
+        for line in results.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            key = str(result.get('key'))
+            item = state['items'].get(key)
+            if item is None or key in written:
+                continue
+            
+            pdf_path = Path(item['pdf_path'])
+            text = response_text(result.get('response') or {})
+            if not text:
+                logger.error(f"No response for {pdf_path}: {result.get('error', 'empty response')}")
+                continue
+            
+            self.abstractor.response_cache.put(
+                item['response_key'], text, state['model'], (result.get('response') or {}).get('usageMetadata')
+            )
+            try:
+                notes.append(await self._write_note(pdf_path, text, item.get('pdf_data')))
+            except Exception as e:
+                logger.error(f"Failed to write note for {pdf_path}: {e}", exc_info=True)
+                continue
+            
+            # Saved after every note so that a resumed run skips it
+            written.add(key)
+            state['written'] = sorted(written, key=int)
+            self.store.save(state)
+        
+        logger.info(f"Batch job {job_name}: {len(written)} of {len(state['items'])} notes written")
+        return notes
+    
+    async def _write_note(self, pdf_path: Path, text: str,
+                          pdf_data: Optional[Dict[str, Any]] = None) -> Path:
+        """Format a response into a note and save it."""
+        if pdf_data is None:
+            # Jobs submitted before the state kept the note data; text only, no page images
+            pdf_data = await asyncio.to_thread(self.monitor.pdf_extractor.extract, pdf_path)
+        
+        abstract_data = self.abstractor.parse_response(text, pdf_data)
+        note_content = self.monitor.note_formatter.format_note(pdf_data, abstract_data, pdf_path)
+        return await self.monitor.write_note(pdf_path, note_content)
@@ -34,23 +34,45 @@ class ConfigLoader:
             'include_citations': True,
             'include_figures': True,
             'extract_keywords': True,
+            'stream_output': False,
         },
         'pdf': {
             'max_size_mb': 100,
             'extraction_mode': 'auto',
             'handle_encrypted': False,
+            'parallel_pages_threshold': 100,
+            'parallel_page_workers': 0,
+            'text_budget_chars': 60000,
+            'text_budget_tokens': None,
+            'tail_pages': 3,
+            'page_cache_max_chars': 2000000,
+            'image_max_kb': 1024,
+            'image_request_max_kb': 6144,
         },
         'advanced': {
             'pdf_cache': True,
             'cache_dir': '~/.cache/obsidian-abstractor',
+            'extraction_cache': True,
+            'extraction_cache_max_mb': 500,
+            'image_cache': True,
+            'image_cache_max_mb': 200,
+            'llm_cache': True,
+            'llm_cache_max_mb': 100,
+            'batch_job_poll_seconds': 60,
             'log_level': 'INFO',
             'log_file': '~/.obsidian-abstractor/logs/app.log',
             'workers': 2,
+            'extraction_workers': 2,
             'retry_failed': True,
             'retry_attempts': 3,
         },
         'rate_limit': {
             'requests_per_minute': 60,
+            'tokens_per_minute': None,
+            'burst': 1,
+            'max_concurrent_requests': 4,
+            'min_concurrent_requests': 1,
+            'latency_factor': 3.0,
             'request_delay': 1,
             'batch_size': 5,
         }
@@ -127,6 +149,9 @@ class ConfigLoader:
     
     def _validate_config(self) -> None:
         """Validate configuration."""
+        # Only the Gemini backend needs a key; the fake backend runs offline
+        if self.config.get('ai', {}).get('backend', 'gemini') != 'gemini':
+            return
         if not self.config['api']['google_ai_key']:
             raise ValueError("Google AI API key not configured. Set GOOGLE_AI_API_KEY environment variable or add to config file.")
     
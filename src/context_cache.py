@@ -0,0 +1,187 @@
+"""
+Context cache module for Obsidian Abstractor.
+
+This module keeps the fixed instructions of the prompt template in a Gemini
+context cache, so that each paper is sent with only its own metadata, text
+and page images. A cache is identified by a hash of the model and the
+instructions: editing the template creates a new one, and a cache close to
+its expiry is replaced. Caches created by an earlier run are reused until
+their TTL ends.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Template fields that differ between papers; the instructions end before the first
+PAPER_FIELDS = ('title', 'authors', 'year', 'pdf_filename', 'pdf_text')
+
+# Status codes meaning these instructions cannot be cached with this model (too
+# short, or caching unsupported); other failures are retried with the next paper
+REFUSED_STATUS_CODES = (400, 403, 404)
+
+# Prefix of the display name of caches created by this tool
+DISPLAY_NAME_PREFIX = 'obsidian-abstractor'
+
+
+def split_prompt_template(template: str, **static_fields: Any) -> Tuple[str, str]:
+    """
+    Split a prompt template into fixed instructions and the per-paper request.
+    
+    The instructions are everything before the paragraph that introduces the
+    first paper field. Fields that do not change between papers (e.g.
+    max_length) are filled in; other fields left in the instructions are
+    replaced by the label they have in the request ("現在日付: {current_date}"
+    turns {current_date} into [現在日付]).
+    
+    Args:
+        template: Unformatted prompt template
+        **static_fields: Values of the fields shared by all papers
+    
+    Returns:
+        Tuple of the formatted instructions and the unformatted request
+        template, or ('', template) if the template has no paper field
+    """
+    starts = [template.find('{' + field + '}') for field in PAPER_FIELDS]
+    starts = [start for start in starts if start >= 0]
+    if not starts:
+        return '', template
+    
+    split_at = template.rfind('\n\n', 0, min(starts))
+    if split_at < 0:
+        return '', template
+    instructions, request = template[:split_at], template[split_at:].lstrip('\n')
+    
+    labels = {field: label.strip() for label, field in re.findall(r'^([^\n:{}]+):\s*\{(\w+)\}\s*$',
+                                                                  request, re.MULTILINE)}
+    
+    class Fields(dict):
+        def __missing__(self, field: str) -> str:
+            return f"[{labels.get(field, field)}]"
+    
+    return instructions.format_map(Fields(static_fields)).strip(), request
+
+
+class ContextCache:
+    """Server-side cached system instructions, shared by requests for every paper."""
+    
+    def __init__(self, caches: Any, model: str, ttl_seconds: int = 3600,
+                 refresh_margin_seconds: int = 300, clock: Callable[[], float] = time.time):
+        """
+        Initialize context cache.
+        
+        Args:
+            caches: Async caches service (client.aio.caches, or a fake in tests)
+            model: Model the cached instructions are used with
+            ttl_seconds: Lifetime of a created cache
+            refresh_margin_seconds: A cache expiring sooner than this is replaced
+            clock: Wall clock in seconds (injectable for tests)
+        """
+        self.caches = caches
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.clock = clock
+        
+        # Instructions hash -> (cache name, expiry time)
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        # Instructions the API refused to cache (e.g. below the model's minimum size)
+        self._refused: set = set()
+        # Created on first use, inside the running loop (see RateLimiter)
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], caches: Any, model: str) -> Optional['ContextCache']:
+        """
+        Create a context cache from the ai configuration section.
+        
+        Args:
+            config: Configuration dictionary
+            caches: Async caches service (None if the LLM backend has none)
+            model: Model name
+        
+        Returns:
+            ContextCache instance, or None if context caching is disabled or unsupported
+        """
+        ai_config = config.get('ai', {})
+        if not ai_config.get('context_cache', False) or caches is None:
+            return None
+        return cls(caches, model, ttl_seconds=ai_config.get('context_cache_ttl', 3600))
+    
+    def instructions_hash(self, instructions: str) -> str:
+        """Hash identifying a cache of these instructions for this model."""
+        return hashlib.sha256(f"{self.model}\n{instructions}".encode('utf-8')).hexdigest()
+    
+    async def get(self, instructions: str) -> Optional[str]:
+        """
+        Name of a live cache holding the instructions, created if needed.
+        
+        Args:
+            instructions: System instructions to cache
+        
+        Returns:
+            Cached content name, or None if the instructions cannot be cached
+            (the caller then sends them with the request)
+        """
+        digest = self.instructions_hash(instructions)
+        if digest in self._refused:
+            return None
+        
+        # One caller creates the cache while the others wait for it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[1] - self.clock() < self.refresh_margin_seconds:
+                entry = await self._find(digest) or await self._create(digest, instructions)
+                if entry is None:
+                    return None
+                self._entries[digest] = entry
+            return entry[0]
+    
+    def invalidate(self, instructions: str):
+        """Forget the cache of these instructions (e.g. after the API no longer finds it)."""
+        self._entries.pop(self.instructions_hash(instructions), None)
+    
+    async def _find(self, digest: str) -> Optional[Tuple[str, float]]:
+        """Live cache of these instructions created by an earlier run."""
+        display_name = f"{DISPLAY_NAME_PREFIX}-{digest[:32]}"
+        try:
+            async for cached in await self.caches.list():
+                expires_at = cached.expire_time.timestamp() if cached.expire_time else 0.0
+                if (cached.display_name == display_name
+                        and expires_at - self.clock() >= self.refresh_margin_seconds):
+                    logger.debug(f"Reusing context cache {cached.name}")
+                    return cached.name, expires_at
+        except Exception as e:
+            logger.debug(f"Could not list context caches: {e}")
+        return None
+    
+    async def _create(self, digest: str, instructions: str) -> Optional[Tuple[str, float]]:
+        """Create a cache of the instructions."""
+        try:
+            cached = await self.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=instructions,
+                    ttl=f"{self.ttl_seconds}s",
+                    display_name=f"{DISPLAY_NAME_PREFIX}-{digest[:32]}",
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Context caching unavailable, sending instructions with each request: {e}")
+            if getattr(e, 'code', None) in REFUSED_STATUS_CODES:
+                self._refused.add(digest)
+            return None
+        
+        expires_at = (cached.expire_time.timestamp() if cached.expire_time
+                      else self.clock() + self.ttl_seconds)
+        logger.info(f"Created context cache {cached.name} (expires in {expires_at - self.clock():.0f}s)")
+        return cached.name, expires_at
@@ -0,0 +1,109 @@
+"""
+Extraction cache module for Obsidian Abstractor.
+
+This module stores the result of PDFExtractor.extract on disk, keyed by the
+content hash of the PDF and the extractor settings, so that re-running on an
+unchanged PDF (process --force, retries, prompt iteration) skips PyMuPDF.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .utils.disk_cache import DiskCache
+from .utils.hashing import cache_key, file_digest
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the shape or content of the extracted data changes
+EXTRACTOR_VERSION = 3
+
+
+class ExtractionCache:
+    """Content-addressed cache of extracted PDF data."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize extraction cache.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        advanced_config = config.get('advanced', {})
+        pdf_config = config.get('pdf', {})
+        
+        self.enabled = advanced_config.get('extraction_cache', True)
+        self.extraction_mode = pdf_config.get('extraction_mode', 'auto')
+        self.handle_encrypted = pdf_config.get('handle_encrypted', False)
+        self.text_budget = (
+            pdf_config.get('text_budget_chars', 60000),
+            pdf_config.get('text_budget_tokens'),
+            pdf_config.get('tail_pages', 3),
+        )
+        
+        self._store: Optional[DiskCache] = None
+        if self.enabled:
+            cache_dir = Path(advanced_config.get('cache_dir', '~/.cache/obsidian-abstractor')).expanduser()
+            try:
+                self._store = DiskCache(
+                    cache_dir / 'extractions',
+                    max_size_mb=advanced_config.get('extraction_cache_max_mb', 500),
+                    suffix='.json.gz'
+                )
+            except OSError as e:
+                logger.warning(f"Extraction cache disabled: {e}")
+                self.enabled = False
+    
+    def _key(self, pdf_path: Path) -> str:
+        """Cache key from the file contents and the extractor settings."""
+        return cache_key(
+            file_digest(pdf_path),
+            self.extraction_mode,
+            self.handle_encrypted,
+            self.text_budget,
+            EXTRACTOR_VERSION
+        )
+    
+    def get(self, pdf_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Look up extracted data for a PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+        
+        Returns:
+            Extracted data with path fields updated for pdf_path, or None on a miss
+        """
+        if not self._store:
+            return None
+        
+        try:
+            pdf_data = self._store.get_json(self._key(pdf_path))
+        except OSError as e:
+            logger.warning(f"Extraction cache lookup failed for {pdf_path.name}: {e}")
+            return None
+        
+        if pdf_data is None:
+            return None
+        
+        # The same contents may have been extracted under another name
+        pdf_data['pdf_path'] = str(pdf_path)
+        pdf_data.setdefault('metadata', {})['filename'] = pdf_path.name
+        logger.info(f"Using cached extraction for {pdf_path.name}")
+        return pdf_data
+    
+    def put(self, pdf_path: Path, pdf_data: Dict[str, Any]):
+        """
+        Store extracted data for a PDF.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            pdf_data: Data returned by PDFExtractor.extract
+        """
+        if not self._store:
+            return
+        
+        try:
+            self._store.put_json(self._key(pdf_path), pdf_data)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache extraction for {pdf_path.name}: {e}")
@@ -0,0 +1,157 @@
+"""
+Extraction pool module for Obsidian Abstractor.
+
+This module runs the CPU-bound part of the pipeline (filtering, text
+extraction and page rendering) in a process pool, so that the asyncio
+workers stay responsive and extraction of one file can overlap with the
+LLM call for another.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .pdf_extractor import PDFExtractor
+from .pdf_filter import FilterResult, PDFFilter
+from .pdf_session import PDFSession
+
+logger = logging.getLogger(__name__)
+
+
+class PreparedPDF(NamedTuple):
+    """Result of the CPU-bound preparation of a PDF."""
+    filter_result: Optional[FilterResult]
+    pdf_data: Optional[Dict[str, Any]]
+    page_images: Optional[List[Dict[str, Any]]]
+
+
+# Components built once per worker process by _init_worker
+_worker_filter: Optional[PDFFilter] = None
+_worker_extractor: Optional[PDFExtractor] = None
+_worker_config: Dict[str, Any] = {}
+
+
+def _init_worker(config: Dict[str, Any]):
+    """Build the filter and extractor once per worker process."""
+    global _worker_filter, _worker_extractor, _worker_config
+    _worker_config = config
+    _worker_filter = PDFFilter(config)
+    # Workers already run one file each; splitting pages across another pool
+    # inside them would nest pools and oversubscribe the CPUs
+    _worker_extractor = PDFExtractor({**config, 'pdf': {**config.get('pdf', {}), 'parallel_page_workers': 1}})
+
+
+def prepare_pdf(pdf_path: str, force: bool = False) -> PreparedPDF:
+    """
+    Prepare a PDF inside a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        force: Skip the academic paper filter
+    
+    Returns:
+        PreparedPDF for the file
+    """
+    if _worker_filter is None or _worker_extractor is None:
+        raise RuntimeError("Extraction worker not initialized")
+    return _prepare(_worker_config, _worker_filter, _worker_extractor, Path(pdf_path), force)
+
+
+def _prepare(config: Dict[str, Any], pdf_filter: PDFFilter, extractor: PDFExtractor,
+             pdf_path: Path, force: bool) -> PreparedPDF:
+    """
+    Filter, extract and render a PDF within a single session.
+    
+    Everything returned must be picklable so it can cross process boundaries.
+    
+    Returns:
+        PreparedPDF. pdf_data is None when the file was filtered out.
+    """
+    abstractor_config = config.get('abstractor', {})
+    render_images = abstractor_config.get('enable_visual_extraction', False)
+    
+    with PDFSession(pdf_path) as session:
+        filter_result = None
+        if not force and pdf_filter.enabled:
+            filter_result = pdf_filter.filter_pdf(pdf_path, session=session)
+            if not filter_result.accepted:
+                return PreparedPDF(filter_result, None, None)
+        
+        pdf_data = extractor.extract(pdf_path, session=session)
+        
+        page_images = None
+        if render_images:
+            page_images = extractor.extract_page_images(
+                pdf_path,
+                dpi=abstractor_config.get('image_dpi', 150),
+                session=session
+            )
+    
+    return PreparedPDF(filter_result, pdf_data, page_images)
+
+
+class ExtractionPool:
+    """Run PDF preparation on a process pool sized separately from LLM concurrency."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize extraction pool.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        # 0 runs extraction in a thread of the current process instead
+        self.max_workers = config.get('advanced', {}).get('extraction_workers', 2)
+        self._executor: Optional[Executor] = None
+        
+        # Used when extraction runs in-process
+        self.pdf_filter = PDFFilter(config)
+        self.pdf_extractor = PDFExtractor(config)
+    
+    def _get_executor(self) -> Optional[Executor]:
+        """Create the process pool on first use."""
+        if self.max_workers <= 0:
+            return None
+        
+        if self._executor is None:
+            # The pool starts inside a running watcher, whose observer and asyncio
+            # threads may hold locks a forked child would inherit; spawn starts clean
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+            logger.info(f"Started extraction pool with {self.max_workers} processes")
+        return self._executor
+    
+    async def prepare(self, pdf_path: Path, force: bool = False) -> PreparedPDF:
+        """
+        Filter, extract and render a PDF without blocking the event loop.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            force: Skip the academic paper filter
+        
+        Returns:
+            PreparedPDF for the file
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        
+        if executor is None:
+            return await loop.run_in_executor(
+                None, _prepare, self.config, self.pdf_filter, self.pdf_extractor, pdf_path, force
+            )
+        
+        return await loop.run_in_executor(executor, prepare_pdf, str(pdf_path), force)
+    
+    def shutdown(self):
+        """Shut down the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
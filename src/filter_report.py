@@ -0,0 +1,234 @@
+"""
+Bulk filtering module for Obsidian Abstractor.
+
+This module runs PDFFilter over many files on a process pool, yields the
+verdicts as they complete and writes them to a CSV or JSONL report, so that
+a folder can be triaged before any LLM call is made.
+"""
+
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .pdf_filter import FilterResult, PDFFilter
+
+logger = logging.getLogger(__name__)
+
+# Funnel levels timed by PDFFilter, in order
+TIMED_STAGES = ('sniff', *PDFFilter.STAGES)
+
+# Report columns, in order
+REPORT_FIELDS = [
+    'path', 'accepted', 'score',
+    'filename_score', 'size_score', 'metadata_score', 'content_score',
+    'skipped_stages', 'elapsed_ms', *(f'{stage}_ms' for stage in TIMED_STAGES), 'cached', 'reasons',
+]
+
+# Filter built once per worker process by _init_worker
+_worker_filter: Optional[PDFFilter] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """Build the filter once per worker process."""
+    global _worker_filter
+    _worker_filter = PDFFilter(config)
+
+
+def _filter_file(pdf_filter: PDFFilter, pdf_path: Path) -> Tuple[FilterResult, float]:
+    """Filter one file and measure the elapsed wall time in milliseconds."""
+    start = time.perf_counter()
+    result = pdf_filter.filter_pdf(pdf_path)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def filter_file(pdf_path: str) -> Tuple[FilterResult, float]:
+    """
+    Filter a PDF inside a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+    
+    Returns:
+        Tuple of (FilterResult, elapsed milliseconds)
+    """
+    if _worker_filter is None:
+        raise RuntimeError("Filter worker not initialized")
+    return _filter_file(_worker_filter, Path(pdf_path))
+
+
+def find_pdfs(folder: Path, patterns: Iterable[str], ignore_patterns: Iterable[str],
+              recursive: bool = False) -> List[Path]:
+    """
+    Find PDF files in a folder the same way batch processing does.
+    
+    Args:
+        folder: Folder to search
+        patterns: Glob patterns of files to include
+        ignore_patterns: Glob patterns of files to skip
+        recursive: Search subfolders recursively
+    
+    Returns:
+        Sorted list of unique file paths
+    """
+    pdf_files = set()
+    for pattern in patterns:
+        pdf_files.update(folder.rglob(pattern) if recursive else folder.glob(pattern))
+    
+    return sorted(
+        f for f in pdf_files
+        if f.is_file() and not any(f.match(p) for p in ignore_patterns)
+    )
+
+
+def filter_files(pdf_files: List[Path], config: Dict[str, Any],
+                 workers: int) -> Iterator[Tuple[Path, FilterResult, float]]:
+    """
+    Filter files on a process pool, yielding verdicts in completion order.
+    
+    Args:
+        pdf_files: Files to filter
+        config: Configuration dictionary
+        workers: Number of worker processes (0 to filter in-process)
+    
+    Yields:
+        Tuples of (path, FilterResult, elapsed milliseconds)
+    """
+    if workers <= 0 or len(pdf_files) <= 1:
+        pdf_filter = PDFFilter(config)
+        for pdf_path in pdf_files:
+            result, elapsed_ms = _filter_file(pdf_filter, pdf_path)
+            yield pdf_path, result, elapsed_ms
+        return
+    
+    # Spawned, not forked: the parent may hold threads and MuPDF state
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(filter_file, str(pdf_path)): pdf_path for pdf_path in pdf_files}
+        try:
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    result, elapsed_ms = future.result()
+                except Exception as e:
+                    logger.warning(f"Error filtering {pdf_path}: {e}")
+                    result = FilterResult(False, 0, [f"Analysis error: {e}"], {'error': str(e)})
+                    elapsed_ms = 0.0
+                yield pdf_path, result, elapsed_ms
+        finally:
+            # Stop queued work if the consumer gives up early (e.g. Ctrl+C)
+            for future in futures:
+                future.cancel()
+
+
+def report_row(pdf_path: Path, result: FilterResult, elapsed_ms: float) -> Dict[str, Any]:
+    """
+    Build a report row from a verdict.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        result: Filter result
+        elapsed_ms: Time spent filtering the file
+    
+    Returns:
+        Dictionary with the REPORT_FIELDS keys
+    """
+    details = result.details
+    timings = details.get('timings', {})
+    return {
+        'path': str(pdf_path),
+        'accepted': result.accepted,
+        'score': result.score,
+        'filename_score': details.get('filename_score'),
+        'size_score': details.get('size_score'),
+        'metadata_score': details.get('metadata_score'),
+        'content_score': details.get('content_score'),
+        'skipped_stages': details.get('skipped_stages', []),
+        'elapsed_ms': round(elapsed_ms, 2),
+        **{f'{stage}_ms': timings.get(stage) for stage in TIMED_STAGES},
+        'cached': 'cached_verdict' in details,
+        'reasons': list(result.reasons),
+    }
+
+
+class FilterReport:
+    """CSV or JSONL report of filter verdicts, written as results arrive."""
+    
+    def __init__(self, report_path: Path):
+        """
+        Initialize filter report.
+        
+        Args:
+            report_path: Output file; .csv writes CSV, anything else JSONL
+        """
+        self.report_path = report_path
+        self.is_csv = report_path.suffix.lower() == '.csv'
+        self.rows: List[Dict[str, Any]] = []
+        
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(report_path, 'w', encoding='utf-8', newline='')
+        self._csv_writer = None
+        if self.is_csv:
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=REPORT_FIELDS)
+            self._csv_writer.writeheader()
+    
+    def _write_row(self, f, row: Dict[str, Any], csv_writer=None):
+        """Write one row to an open report file."""
+        if csv_writer is not None:
+            csv_writer.writerow({
+                **row,
+                'skipped_stages': ';'.join(row['skipped_stages']),
+                'reasons': ' | '.join(row['reasons']),
+            })
+        else:
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    
+    def add(self, row: Dict[str, Any]):
+        """Append a row, flushing it so partial reports survive interruption."""
+        self.rows.append(row)
+        self._write_row(self._file, row, self._csv_writer)
+        self._file.flush()
+    
+    def close(self, ranked: bool = True):
+        """
+        Finish the report.
+        
+        Args:
+            ranked: Rewrite the rows sorted by descending score
+        """
+        self._file.close()
+        if not ranked:
+            return
+        
+        rows = sorted(self.rows, key=lambda row: (-row['score'], row['path']))
+        fd, tmp_name = tempfile.mkstemp(dir=self.report_path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            csv_writer = None
+            if self.is_csv:
+                csv_writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+                csv_writer.writeheader()
+            for row in rows:
+                self._write_row(f, row, csv_writer)
+        os.replace(tmp_name, self.report_path)
+
+
+def should_quarantine(result: FilterResult) -> bool:
+    """
+    Whether a verdict justifies moving the file out of the way.
+    
+    Files still being written, and files whose analysis failed (corrupt,
+    locked or temporarily unreadable), were never actually scored.
+    
+    Args:
+        result: Filter result of the file
+    
+    Returns:
+        True for files rejected on their score
+    """
+    return not result.accepted and 'deferred' not in result.details and 'error' not in result.details
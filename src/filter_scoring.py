@@ -0,0 +1,382 @@
+"""
+Vectorized filter scoring module for Obsidian Abstractor.
+
+This module turns the features extracted by PDFFilter into a matrix, so that
+whole batches of files are scored with one NumPy product, and fits feature
+weights and an academic threshold on labeled examples. It serves the calibrate
+command: filter and watch score one file at a time with PDFFilter's funnel,
+which skips the stages a verdict no longer depends on.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .pdf_filter import PDFFilter
+
+logger = logging.getLogger(__name__)
+
+# Filter built once per worker process by _init_worker
+_worker_filter: Optional[PDFFilter] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """Build the filter once per worker process."""
+    global _worker_filter
+    _worker_filter = PDFFilter(config)
+
+
+def file_features(pdf_path: str) -> Dict[str, float]:
+    """
+    Extract the features of a PDF inside a worker process.
+    
+    Args:
+        pdf_path: Path to the PDF file
+    
+    Returns:
+        Feature dictionary from PDFFilter.extract_features
+    """
+    if _worker_filter is None:
+        raise RuntimeError("Feature worker not initialized")
+    return _worker_filter.extract_features(Path(pdf_path))
+
+
+def extract_features(pdf_files: Sequence[Path], config: Dict[str, Any],
+                     workers: int) -> List[Dict[str, float]]:
+    """
+    Extract the features of many files on a process pool.
+    
+    Args:
+        pdf_files: Files to analyze
+        config: Configuration dictionary
+        workers: Number of worker processes (0 to extract in-process)
+    
+    Returns:
+        Feature dictionaries, in the order of pdf_files
+    """
+    if workers <= 0 or len(pdf_files) <= 1:
+        pdf_filter = PDFFilter(config)
+        return [pdf_filter.extract_features(pdf_path) for pdf_path in pdf_files]
+    
+    # Spawned, not forked: the parent may hold threads and MuPDF state
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,),
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(file_features, [str(p) for p in pdf_files], chunksize=8))
+
+
+class FeatureScorer:
+    """Score feature matrices with the weights of a PDFFilter."""
+    
+    def __init__(self, pdf_filter: PDFFilter):
+        """
+        Initialize feature scorer.
+        
+        Args:
+            pdf_filter: Filter providing the feature names, weights and threshold
+        """
+        self.feature_names = list(pdf_filter.feature_names)
+        self.weights = np.array([pdf_filter.feature_weights[name] for name in self.feature_names], dtype=float)
+        self.threshold = pdf_filter.academic_threshold
+        self.academic_only = pdf_filter.academic_only
+        
+        # Stages whose score alone rejects a file, as in PDFFilter.filter_pdf
+        self.reject_scores = {
+            'filename': pdf_filter.filename_reject_score,
+            'size': pdf_filter.size_reject_score,
+        }
+        self.stage_columns = {
+            stage: np.array([self.feature_names.index(name) for name in pdf_filter.stage_features[stage]], dtype=int)
+            for stage in self.reject_scores
+        }
+    
+    def matrix(self, features: Sequence[Dict[str, float]]) -> np.ndarray:
+        """
+        Stack feature dictionaries into a matrix.
+        
+        Args:
+            features: One feature dictionary per file
+        
+        Returns:
+            Array of shape (files, features)
+        """
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        X = np.zeros((len(features), len(self.feature_names)))
+        for row, file_features in enumerate(features):
+            for name, value in file_features.items():
+                X[row, index[name]] = value
+        return X
+    
+    def scores(self, X: np.ndarray, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Scores of every file (all stages, no early termination)."""
+        return X @ (self.weights if weights is None else weights)
+    
+    def rejected(self, X: np.ndarray, weights: Optional[np.ndarray] = None,
+                 reject_scores: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Files rejected by their filename or size score alone, whatever the threshold."""
+        weights = self.weights if weights is None else weights
+        reject_scores = self.reject_scores if reject_scores is None else reject_scores
+        rejected = np.zeros(len(X), dtype=bool)
+        for stage, columns in self.stage_columns.items():
+            rejected |= X[:, columns] @ weights[columns] <= reject_scores[stage]
+        return rejected
+    
+    def accepted(self, X: np.ndarray) -> np.ndarray:
+        """Verdicts of every file under the current threshold."""
+        if not self.academic_only:
+            return ~self.rejected(X)
+        return (self.scores(X) >= self.threshold) & ~self.rejected(X)
+
+
+class Metrics(NamedTuple):
+    """Classification quality at one threshold."""
+    threshold: float
+    precision: float
+    recall: float
+    f1: float
+
+
+def evaluate(scores: np.ndarray, labels: np.ndarray, threshold: float) -> Metrics:
+    """
+    Precision and recall of accepting files whose score reaches the threshold.
+    
+    Args:
+        scores: Score per file (-inf for files rejected outright)
+        labels: 1 for academic papers, 0 for other files
+        threshold: Minimum accepted score
+    
+    Returns:
+        Metrics at the threshold
+    """
+    predicted = scores >= threshold
+    true_positives = np.sum(predicted & (labels == 1))
+    precision = true_positives / max(np.sum(predicted), 1)
+    recall = true_positives / max(np.sum(labels == 1), 1)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return Metrics(float(threshold), float(precision), float(recall), float(f1))
+
+
+def threshold_curve(scores: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Precision and recall at every distinct score used as the threshold.
+    
+    Args:
+        scores: Score per file
+        labels: 1 for academic papers, 0 for other files
+    
+    Returns:
+        Tuple of (thresholds, precision, recall), thresholds descending
+    """
+    order = np.argsort(-scores, kind='stable')
+    sorted_scores = scores[order]
+    true_positives = np.cumsum(labels[order] == 1)
+    accepted = np.arange(1, len(scores) + 1)
+    
+    # A threshold accepts every file down to the last one with the same score
+    last = np.r_[sorted_scores[1:] != sorted_scores[:-1], True]
+    precision = true_positives[last] / accepted[last]
+    recall = true_positives[last] / max(np.sum(labels == 1), 1)
+    return sorted_scores[last], precision, recall
+
+
+def choose_threshold(scores: np.ndarray, labels: np.ndarray,
+                     min_precision: Optional[float] = None) -> float:
+    """
+    Pick the threshold with the best F1, or the best recall at a minimum precision.
+    
+    Args:
+        scores: Score per file (-inf for files rejected outright)
+        labels: 1 for academic papers, 0 for other files
+        min_precision: Required precision (None to maximize F1)
+    
+    Returns:
+        Threshold
+    """
+    thresholds, precision, recall = threshold_curve(scores, labels)
+    
+    # No threshold accepts files rejected outright
+    finite = np.isfinite(thresholds)
+    if not finite.any():
+        return 0.0
+    thresholds, precision, recall = thresholds[finite], precision[finite], recall[finite]
+    
+    best = None
+    if min_precision is not None:
+        candidates = np.flatnonzero(precision >= min_precision)
+        if len(candidates):
+            # Thresholds are descending, so the last candidate has the best recall
+            best = candidates[-1]
+        else:
+            logger.warning(f"No threshold reaches precision {min_precision}; maximizing F1 instead")
+    
+    if best is None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+        best = np.argmax(f1)
+    
+    # Any value down to the next lower score gives the same verdicts; the
+    # midpoint leaves a margin on both sides
+    if best + 1 < len(thresholds):
+        return float((thresholds[best] + thresholds[best + 1]) / 2)
+    return float(thresholds[best])
+
+
+def fit_logistic(X: np.ndarray, labels: np.ndarray, l2: float = 0.01,
+                 iterations: int = 3000, learning_rate: float = 0.5) -> Tuple[np.ndarray, float, np.ndarray]:
+    """
+    Fit a class-balanced, L2-regularized logistic regression by gradient descent.
+    
+    Args:
+        X: Feature matrix
+        labels: 1 for academic papers, 0 for other files
+        l2: Regularization strength
+        iterations: Gradient descent steps
+        learning_rate: Step size
+    
+    Returns:
+        Tuple of (weights, intercept, learned) where learned marks the
+        features that vary in X (the others get weight 0)
+    """
+    # Standardize so one step size suits every feature
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    learned = std > 0
+    std = np.where(learned, std, 1.0)
+    Z = (X - mean) / std
+    
+    # Weight samples so both classes count equally
+    positives = max(np.sum(labels == 1), 1)
+    negatives = max(np.sum(labels == 0), 1)
+    sample_weights = np.where(labels == 1, 0.5 / positives, 0.5 / negatives)
+    
+    beta = np.zeros(X.shape[1])
+    intercept = 0.0
+    for _ in range(iterations):
+        predicted = 1 / (1 + np.exp(-(Z @ beta + intercept)))
+        error = (predicted - labels) * sample_weights
+        beta -= learning_rate * (Z.T @ error + l2 * beta)
+        intercept -= learning_rate * error.sum()
+    
+    # Back to the scale of the raw features
+    weights = np.where(learned, beta / std, 0.0)
+    return weights, intercept - float(mean @ weights), learned
+
+
+class Calibration(NamedTuple):
+    """Result of calibrating the filter on labeled files."""
+    weights: Dict[str, float]
+    threshold: float
+    reject_scores: Dict[str, float]
+    before: Metrics
+    after: Metrics
+
+
+def rescale_reject_scores(scorer: FeatureScorer, weights: np.ndarray) -> Dict[str, float]:
+    """
+    Move the outright-reject scores along with the weights of their stages.
+    
+    A reject score keeps its ratio to the most negative weight of its stage,
+    so the features that rejected a file on their own still do.
+    
+    Args:
+        scorer: Scorer with the current weights and reject scores
+        weights: New weights
+    
+    Returns:
+        Dictionary of stage name to reject score
+    """
+    reject_scores = {}
+    for stage, reject_score in scorer.reject_scores.items():
+        columns = scorer.stage_columns[stage]
+        current = scorer.weights[columns].min(initial=0)
+        new = weights[columns].min(initial=0)
+        if current < 0 and new < 0:
+            reject_score = round(reject_score * new / current, 1)
+        reject_scores[stage] = reject_score
+    return reject_scores
+
+
+def calibrate(scorer: FeatureScorer, X: np.ndarray, labels: np.ndarray,
+              min_precision: Optional[float] = None) -> Calibration:
+    """
+    Fit feature weights and a threshold on labeled files.
+    
+    Fitted weights are rescaled to the magnitude of the current weights, so
+    the result stays readable next to the default scoring rules. Features
+    that never vary in the labeled set keep their current weight. Files
+    rejected outright by their filename or size score count as rejected at
+    every threshold, with the reject scores rescaled to the new weights.
+    
+    Args:
+        scorer: Scorer with the current weights
+        X: Feature matrix of the labeled files
+        labels: 1 for academic papers, 0 for other files
+        min_precision: Required precision (None to maximize F1)
+    
+    Returns:
+        Calibration with the new weights and metrics before and after
+    """
+    scores = np.where(scorer.rejected(X), -np.inf, scorer.scores(X))
+    before = evaluate(scores, labels, scorer.threshold)
+    
+    fitted, _, learned = fit_logistic(X, labels)
+    largest = np.abs(fitted[learned]).max() if learned.any() else 0.0
+    scale = np.abs(scorer.weights).max() / largest if largest else 1.0
+    weights = np.round(np.where(learned, fitted * scale, scorer.weights), 1)
+    reject_scores = rescale_reject_scores(scorer, weights)
+    
+    scores = np.where(scorer.rejected(X, weights, reject_scores), -np.inf, scorer.scores(X, weights))
+    threshold = round(choose_threshold(scores, labels, min_precision), 1)
+    after = evaluate(scores, labels, threshold)
+    
+    return Calibration(
+        weights={name: float(weight) for name, weight in zip(scorer.feature_names, weights)},
+        threshold=threshold,
+        reject_scores=reject_scores,
+        before=before,
+        after=after
+    )
+
+
+def calibration_config(calibration: Calibration, pdf_filter: PDFFilter) -> Dict[str, Any]:
+    """
+    Configuration snippet applying a calibration.
+    
+    Args:
+        calibration: Result of calibrate()
+        pdf_filter: Filter the calibration was computed for
+    
+    Returns:
+        Dictionary with pdf_filter and scoring_rules sections
+    """
+    positive = {}
+    negative = {}
+    weights = {}
+    for name, weight in calibration.weights.items():
+        if weight == pdf_filter.feature_weights[name]:
+            continue
+        kind, _, rule_name = name.partition(':')
+        if kind == 'positive':
+            positive[rule_name] = weight
+        elif kind == 'negative':
+            negative[rule_name] = weight
+        else:
+            weights[name] = weight
+    
+    scoring_rules = {
+        section: values
+        for section, values in (('positive', positive), ('negative', negative), ('weights', weights))
+        if values
+    }
+    filter_settings = {'academic_threshold': calibration.threshold}
+    for stage, reject_score in calibration.reject_scores.items():
+        if reject_score != getattr(pdf_filter, f"{stage}_reject_score"):
+            filter_settings[f"{stage}_reject_score"] = reject_score
+    
+    return {
+        'pdf_filter': filter_settings,
+        'scoring_rules': scoring_rules,
+    }
@@ -0,0 +1,116 @@
+"""
+Page image cache module for Obsidian Abstractor.
+
+This module stores rendered page images on disk, keyed by the content hash
+of the PDF, the page number, the DPI and the image format, so that repeat
+runs and retried LLM calls do not rasterize the same pages again.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .utils.disk_cache import DiskCache
+from .utils.hashing import cache_key, file_digest
+
+logger = logging.getLogger(__name__)
+
+
+class ImageCache:
+    """Content-addressed cache of rendered page images."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize page image cache.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        advanced_config = config.get('advanced', {})
+        self.enabled = advanced_config.get('image_cache', True)
+        
+        self._store: Optional[DiskCache] = None
+        if self.enabled:
+            cache_dir = Path(advanced_config.get('cache_dir', '~/.cache/obsidian-abstractor')).expanduser()
+            try:
+                self._store = DiskCache(
+                    cache_dir / 'page_images',
+                    max_size_mb=advanced_config.get('image_cache_max_mb', 200),
+                    suffix='.img'
+                )
+            except OSError as e:
+                logger.warning(f"Page image cache disabled: {e}")
+                self.enabled = False
+    
+    def pdf_key(self, pdf_path: Path) -> Optional[str]:
+        """
+        Content hash identifying a PDF, or None if the cache is disabled.
+        
+        Args:
+            pdf_path: Path to the PDF file
+        """
+        if not self._store:
+            return None
+        try:
+            return file_digest(pdf_path)
+        except OSError as e:
+            logger.warning(f"Page image cache unavailable for {pdf_path.name}: {e}")
+            return None
+    
+    @staticmethod
+    def _key(pdf_key: str, page_num: int, dpi: int, image_format: str) -> str:
+        return cache_key(pdf_key, page_num, dpi, image_format)
+    
+    def get(self, pdf_key: Optional[str], page_num: int, dpi: int,
+            image_format: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Look up a rendered page.
+        
+        Args:
+            pdf_key: Content hash from pdf_key()
+            page_num: Page number (0-indexed)
+            dpi: Requested DPI
+            image_format: Image format identifier
+        
+        Returns:
+            Tuple of (image bytes, image info), or None on a miss
+        """
+        if not self._store or pdf_key is None:
+            return None
+        
+        blob = self._store.get(self._key(pdf_key, page_num, dpi, image_format))
+        if blob is None:
+            return None
+        
+        # Entries are a one-line JSON header followed by the image bytes
+        header, sep, image_bytes = blob.partition(b'\n')
+        try:
+            info = json.loads(header)
+        except ValueError:
+            info = None
+        if not sep or not isinstance(info, dict):
+            logger.warning(f"Discarding corrupt page image cache entry for page {page_num + 1}")
+            self._store.delete(self._key(pdf_key, page_num, dpi, image_format))
+            return None
+        
+        return image_bytes, info
+    
+    def put(self, pdf_key: Optional[str], page_num: int, dpi: int, image_format: str,
+            image_bytes: bytes, info: Dict[str, Any]):
+        """
+        Store a rendered page.
+        
+        Args:
+            pdf_key: Content hash from pdf_key()
+            page_num: Page number (0-indexed)
+            dpi: Requested DPI
+            image_format: Image format identifier
+            image_bytes: Encoded image
+            info: JSON-serializable image information (size, DPI actually used)
+        """
+        if not self._store or pdf_key is None:
+            return
+        
+        header = json.dumps(info).encode('utf-8')
+        self._store.put(self._key(pdf_key, page_num, dpi, image_format), header + b'\n' + image_bytes)
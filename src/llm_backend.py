@@ -0,0 +1,446 @@
+"""
+LLM backend module for Obsidian Abstractor.
+
+This module defines the interface PaperAbstractor sends its generation
+requests through, with two implementations: the Gemini API, and a
+deterministic local fake that answers with canned markdown after a sampled
+latency and throttles requests with 429 errors like the real API. The fake
+needs neither an API key nor a network, so watch and batch throughput, rate
+limiting and retry behavior can be load-tested offline.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Protocol, Tuple, Union
+
+from google import genai
+from google.genai import errors, types
+
+logger = logging.getLogger(__name__)
+
+Contents = Union[str, List[types.Content]]
+
+# Gemini clients by API key and endpoint; each holds one pooled set of HTTP connections per process
+_clients: Dict[Tuple[str, Optional[str]], genai.Client] = {}
+# Backends holding each shared client; it is closed when the last one releases it
+_client_users: Dict[Tuple[str, Optional[str]], int] = {}
+
+# Token counts the fake backend reports as usage (same estimate as the rate limiter's)
+CHARS_PER_TOKEN = 4
+IMAGE_TOKENS = 1548
+
+# Response of the fake backend; {request_id} is replaced by a hash of the request text
+DEFAULT_FAKE_MARKDOWN = """---
+title: "Fake Paper {request_id}"
+tags:
+  - fake-backend
+---
+# Fake Paper {request_id}
+
+## 概要
+オフライン用のフェイクバックエンドが返した固定の要約です（リクエスト {request_id}）。
+
+## Summary
+Canned response of the fake LLM backend.
+
+## Key Findings
+- The pipeline ran without calling the Gemini API.
+
+## Keywords
+fake-backend, load-test
+"""
+
+
+def shared_client(api_key: str, base_url: Optional[str] = None) -> genai.Client:
+    """
+    Get the process-wide Gemini client for an API key.
+    
+    Every call counts as one user of the client until release_shared_client().
+    
+    Args:
+        api_key: Google AI API key
+        base_url: API endpoint replacing the default one (e.g. a local mock server)
+    
+    Returns:
+        Client shared by every PaperAbstractor of this process
+    """
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        http_options = types.HttpOptions(base_url=base_url) if base_url else None
+        client = _clients[key] = genai.Client(api_key=api_key, http_options=http_options)
+    _client_users[key] = _client_users.get(key, 0) + 1
+    return client
+
+
+async def release_shared_client(api_key: str, base_url: Optional[str] = None):
+    """
+    Release one use of a shared client, closing it when no user is left.
+    
+    Args:
+        api_key: Google AI API key
+        base_url: API endpoint the client was created for
+    """
+    key = (api_key, base_url)
+    users = _client_users.get(key, 0) - 1
+    if users > 0:
+        _client_users[key] = users
+        return
+    _client_users.pop(key, None)
+    client = _clients.pop(key, None)
+    if client is not None:
+        await client.aio.aclose()
+
+
+class LLMBackend(Protocol):
+    """Service that answers generation requests (the shape of client.aio.models)."""
+    
+    # Async context caches service, or None if the backend cannot cache instructions
+    caches: Any
+    
+    async def generate_content(self, *, model: str, contents: Contents,
+                               config: types.GenerateContentConfig) -> types.GenerateContentResponse:
+        """Generate one complete response."""
+        ...
+    
+    async def generate_content_stream(self, *, model: str, contents: Contents,
+                                      config: types.GenerateContentConfig
+                                      ) -> AsyncIterator[types.GenerateContentResponse]:
+        """Generate one response as a stream of chunks."""
+        ...
+    
+    async def aclose(self):
+        """Release the connections of the backend."""
+        ...
+
+
+class GeminiBackend:
+    """Requests sent to the Gemini API through the SDK's async client."""
+    
+    def __init__(self, client: genai.Client, client_key: Optional[Tuple[str, Optional[str]]] = None):
+        """
+        Initialize Gemini backend.
+        
+        Args:
+            client: Gemini client (requests go through its async surface, client.aio)
+            client_key: Key of the client in the shared client registry, if it came from there
+        """
+        self.client = client
+        self.caches = client.aio.caches
+        self._client_key = client_key
+        self._closed = False
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'GeminiBackend':
+        """
+        Create a Gemini backend on the shared client of the configured key.
+        
+        Args:
+            config: Configuration dictionary
+        
+        Returns:
+            GeminiBackend instance
+        
+        Raises:
+            ValueError: If no API key is configured
+        """
+        api_key = config.get('api', {}).get('google_ai_key', '')
+        if not api_key:
+            raise ValueError("Google AI API key not configured")
+        base_url = config.get('ai', {}).get('base_url') or None
+        return cls(shared_client(api_key, base_url), (api_key, base_url))
+    
+    async def generate_content(self, *, model: str, contents: Contents,
+                               config: types.GenerateContentConfig) -> types.GenerateContentResponse:
+        """Generate one complete response."""
+        return await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+    
+    async def generate_content_stream(self, *, model: str, contents: Contents,
+                                      config: types.GenerateContentConfig
+                                      ) -> AsyncIterator[types.GenerateContentResponse]:
+        """Generate one response as a stream of chunks."""
+        return await self.client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+    
+    async def aclose(self):
+        """Release the client; a shared one is closed only by its last backend."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._client_key is not None:
+            await release_shared_client(*self._client_key)
+        else:
+            await self.client.aio.aclose()
+
+
+def latency_sampler(spec: Dict[str, Any]) -> Callable[[random.Random], float]:
+    """
+    Latency distribution of the fake backend.
+    
+    Args:
+        spec: Distribution settings: {'distribution': 'constant', 'seconds': s},
+            {'distribution': 'uniform', 'min_seconds': a, 'max_seconds': b} or
+            {'distribution': 'lognormal', 'median_seconds': m, 'sigma': s}
+    
+    Returns:
+        Function drawing one latency in seconds from a random generator
+    
+    Raises:
+        ValueError: If the distribution is unknown
+    """
+    distribution = spec.get('distribution', 'constant')
+    if distribution == 'constant':
+        seconds = float(spec.get('seconds', 0.0))
+        return lambda rng: seconds
+    if distribution == 'uniform':
+        low, high = float(spec.get('min_seconds', 0.0)), float(spec.get('max_seconds', 1.0))
+        return lambda rng: rng.uniform(low, high)
+    if distribution == 'lognormal':
+        mu, sigma = math.log(float(spec.get('median_seconds', 1.0))), float(spec.get('sigma', 0.5))
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def throttle_error(retry_delay_seconds: Optional[float] = None) -> errors.ClientError:
+    """
+    429 error shaped like the one the Gemini API returns when over quota.
+    
+    Args:
+        retry_delay_seconds: Delay put in the RetryInfo detail (None for no hint)
+    
+    Returns:
+        ClientError to raise
+    """
+    details = []
+    if retry_delay_seconds is not None:
+        details.append({'@type': 'type.googleapis.com/google.rpc.RetryInfo',
+                        'retryDelay': f"{retry_delay_seconds:.3f}s"})
+    return errors.ClientError(429, {'error': {
+        'code': 429,
+        'message': 'Resource has been exhausted (fake backend).',
+        'status': 'RESOURCE_EXHAUSTED',
+        'details': details,
+    }})
+
+
+class FakeBackend:
+    """Deterministic offline backend answering every request with canned markdown."""
+    
+    # The fake has no context caching; instructions are sent with each request
+    caches = None
+    
+    def __init__(self, markdown: str = DEFAULT_FAKE_MARKDOWN, latency: Optional[Dict[str, Any]] = None,
+                 throttle_rate: float = 0.0, requests_per_minute: Optional[int] = None,
+                 retry_delay_seconds: Optional[float] = 1.0, stream_chunk_chars: int = 200,
+                 seed: int = 0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep):
+        """
+        Initialize fake backend.
+        
+        Args:
+            markdown: Response text ({request_id} is replaced by a hash of the request)
+            latency: Latency distribution settings (see latency_sampler; default no latency)
+            throttle_rate: Fraction of requests answered with a 429 error
+            requests_per_minute: Quota above which requests get a 429 error (None for no quota)
+            retry_delay_seconds: RetryInfo delay of random 429 errors (None for no hint);
+                quota errors ask to wait until the quota frees up
+            stream_chunk_chars: Size of the chunks of a streamed response
+            seed: Seed of the random draws
+            clock: Monotonic clock in seconds (injectable for tests)
+            sleep: Coroutine function used to wait (injectable for tests)
+        """
+        self.markdown = markdown
+        self.sample_latency = latency_sampler(latency or {})
+        self.throttle_rate = throttle_rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_delay_seconds = retry_delay_seconds
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.seed = seed
+        self.clock = clock
+        self.sleep = sleep
+        
+        # Admission times of the requests counted against the quota
+        self._admitted: Deque[float] = deque()
+        # Calls per request, so that a retried request draws new values
+        self._attempts: Dict[str, int] = {}
+        self._in_flight = 0
+        self.stats = {'requests': 0, 'throttled': 0, 'completed': 0, 'max_in_flight': 0}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'FakeBackend':
+        """
+        Create a fake backend from the ai.fake configuration section.
+        
+        Args:
+            config: Configuration dictionary
+        
+        Returns:
+            FakeBackend instance
+        """
+        fake_config = config.get('ai', {}).get('fake', {})
+        markdown = DEFAULT_FAKE_MARKDOWN
+        if fake_config.get('markdown_file'):
+            markdown = Path(fake_config['markdown_file']).expanduser().read_text(encoding='utf-8')
+        return cls(
+            markdown=markdown,
+            latency=fake_config.get('latency', {'distribution': 'lognormal', 'median_seconds': 2.0, 'sigma': 0.5}),
+            throttle_rate=fake_config.get('throttle_rate', 0.0),
+            requests_per_minute=fake_config.get('requests_per_minute'),
+            retry_delay_seconds=fake_config.get('retry_delay_seconds', 1.0),
+            stream_chunk_chars=fake_config.get('stream_chunk_chars', 200),
+            seed=fake_config.get('seed', 0),
+        )
+    
+    async def generate_content(self, *, model: str, contents: Contents,
+                               config: Optional[types.GenerateContentConfig] = None
+                               ) -> types.GenerateContentResponse:
+        """Answer after the sampled latency, or raise a 429 error."""
+        text, latency, usage = self._admit(contents, config)
+        self._enter()
+        try:
+            await self.sleep(latency)
+        finally:
+            self._leave()
+        return self._response(text, usage)
+    
+    async def generate_content_stream(self, *, model: str, contents: Contents,
+                                      config: Optional[types.GenerateContentConfig] = None
+                                      ) -> AsyncIterator[types.GenerateContentResponse]:
+        """Answer in chunks spread over the sampled latency, or raise a 429 error."""
+        text, latency, usage = self._admit(contents, config)
+        chunks = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)] or ['']
+        
+        async def stream() -> AsyncIterator[types.GenerateContentResponse]:
+            self._enter()
+            try:
+                for i, chunk in enumerate(chunks):
+                    await self.sleep(latency / len(chunks))
+                    # Like the API, usage comes with the last chunk
+                    yield self._response(chunk, usage if i == len(chunks) - 1 else None)
+            finally:
+                self._leave()
+        
+        return stream()
+    
+    async def aclose(self):
+        """Nothing to release."""
+    
+    def _admit(self, contents: Contents, config: Optional[types.GenerateContentConfig]
+               ) -> Tuple[str, float, types.GenerateContentResponseUsageMetadata]:
+        """
+        Decide the outcome of one call.
+        
+        Draws are seeded by the request text and its attempt number, so a run
+        gives the same results whatever order concurrent requests arrive in.
+        
+        Returns:
+            Tuple of the response text, its latency and its usage
+        
+        Raises:
+            errors.ClientError: 429 if the call is throttled
+        """
+        request_text = self._request_text(contents, config)
+        request_id = hashlib.sha256(request_text.encode('utf-8')).hexdigest()[:12]
+        attempt = self._attempts.get(request_id, 0)
+        self._attempts[request_id] = attempt + 1
+        rng = random.Random(f"{self.seed}:{request_id}:{attempt}")
+        self.stats['requests'] += 1
+        
+        if self.requests_per_minute:
+            now = self.clock()
+            while self._admitted and now - self._admitted[0] >= 60.0:
+                self._admitted.popleft()
+            if len(self._admitted) >= self.requests_per_minute:
+                self.stats['throttled'] += 1
+                raise throttle_error(60.0 - (now - self._admitted[0]))
+            self._admitted.append(now)
+        
+        if rng.random() < self.throttle_rate:
+            self.stats['throttled'] += 1
+            raise throttle_error(self.retry_delay_seconds)
+        
+        text = self.markdown.replace('{request_id}', request_id)
+        prompt_tokens = len(request_text) // CHARS_PER_TOKEN + IMAGE_TOKENS * self._image_count(contents)
+        output_tokens = len(text) // CHARS_PER_TOKEN
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+        return text, max(0.0, self.sample_latency(rng)), usage
+    
+    def _enter(self):
+        """Count a request in flight."""
+        self._in_flight += 1
+        self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+    
+    def _leave(self):
+        """Count a request done."""
+        self._in_flight -= 1
+        self.stats['completed'] += 1
+    
+    @staticmethod
+    def _request_text(contents: Contents, config: Optional[types.GenerateContentConfig]) -> str:
+        """Text of a request, including instructions sent apart from the contents."""
+        texts = []
+        if config is not None and isinstance(config.system_instruction, str):
+            texts.append(config.system_instruction)
+        if isinstance(contents, str):
+            texts.append(contents)
+        else:
+            for content in contents:
+                texts.extend(part.text for part in content.parts or [] if part.text)
+        return '\n'.join(texts)
+    
+    @staticmethod
+    def _image_count(contents: Contents) -> int:
+        """Number of images in a request."""
+        if isinstance(contents, str):
+            return 0
+        return sum(1 for content in contents for part in content.parts or [] if part.inline_data is not None)
+    
+    @staticmethod
+    def _response(text: str, usage: Optional[types.GenerateContentResponseUsageMetadata]
+                  ) -> types.GenerateContentResponse:
+        """Response object holding one text part."""
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(
+                content=types.Content(role='model', parts=[types.Part.from_text(text=text)]),
+                finish_reason=types.FinishReason.STOP,
+            )],
+            usage_metadata=usage,
+        )
+
+
+# Backends selectable with ai.backend
+BACKENDS = {
+    'gemini': GeminiBackend,
+    'fake': FakeBackend,
+}
+
+
+def create_backend(config: Dict[str, Any]) -> LLMBackend:
+    """
+    Create the backend selected in the configuration.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        Backend instance (Gemini unless ai.backend says otherwise)
+    
+    Raises:
+        ValueError: If the backend is unknown or misconfigured
+    """
+    name = config.get('ai', {}).get('backend', 'gemini')
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown LLM backend: {name} (available: {', '.join(BACKENDS)})")
+    if name != 'gemini':
+        logger.info(f"Using the {name} LLM backend")
+    return backend_class.from_config(config)
@@ -5,10 +5,13 @@ Obsidian Abstractor - Main entry point.
 AI-powered academic paper summarizer for Obsidian.
 """
 
+import os
 import sys
 import asyncio
+import itertools
 import logging
 import click
+import numpy as np
 import uuid
 import yaml
 import re
@@ -22,10 +25,18 @@ from rich.table import Table
 
 from .config_loader import ConfigLoader
 from .pdf_monitor import PDFMonitor
+from .batch_job import BatchJobRunner
 from .pdf_extractor import PDFExtractor
 from .paper_abstractor import PaperAbstractor
 from .note_formatter import NoteFormatter
+from .note_stream import NoteStream
 from .pdf_filter import PDFFilter
+from .filter_report import TIMED_STAGES, FilterReport, filter_files, find_pdfs, report_row, should_quarantine
+from .filter_scoring import FeatureScorer, calibrate as calibrate_weights, calibration_config, extract_features
+from .pdf_session import PDFSession
+from .verdict_cache import VerdictCache
+from .utils.timing import TimingHistogram
+from .utils.quarantine import quarantine_pdf
 from .utils.path_resolver import PathResolver, create_resolver
 from .utils.note_utils import extract_yaml_frontmatter, generate_filename_from_yaml, handle_rename
 from .paperpile_sync import sync_paperpile
@@ -75,6 +86,55 @@ def setup_logging(verbose: bool):
     logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+def timing_table(summary: Dict[str, Dict[str, float]]) -> Table:
+    """Build a table of filter level timing percentiles."""
+    table = Table(title="Filter Timings (ms)")
+    table.add_column("Level", style="cyan")
+    for column in ("Files", "p50", "p95", "p99", "Total"):
+        table.add_column(column, justify="right")
+    
+    for stage, stats in summary.items():
+        table.add_row(
+            stage, str(stats['count']),
+            f"{stats['p50']:.1f}", f"{stats['p95']:.1f}", f"{stats['p99']:.1f}", f"{stats['total_ms']:.0f}"
+        )
+    return table
+
+
+def explain_table(pdf_path: Path, result) -> Table:
+    """Build a table showing how each filter level contributed to a verdict."""
+    details = result.details
+    timings = details.get('timings', {})
+    skipped = details.get('skipped_stages', [])
+    verdict = "[green]accepted[/green]" if result.accepted else "[yellow]rejected[/yellow]"
+    
+    table = Table(title=f"{pdf_path.name}: {verdict} (score: {result.score})", title_justify="left")
+    table.add_column("Level", style="cyan")
+    table.add_column("Score", justify="right")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Status")
+    
+    for stage in TIMED_STAGES:
+        score = details.get('sniff') if stage == 'sniff' else details.get(f'{stage}_score')
+        if stage in skipped:
+            status = "skipped (verdict decided)"
+        elif stage in timings:
+            status = "run"
+        elif 'cached_verdict' in details:
+            status = "cached"
+        else:
+            status = "not reached"
+        elapsed = timings.get(stage)
+        table.add_row(
+            stage, "-" if score is None else str(score),
+            "-" if elapsed is None else f"{elapsed:.2f}", status
+        )
+    
+    for reason in result.reasons:
+        table.add_row("", "", "", f"[dim]{reason}[/dim]")
+    return table
+
+
 @click.group()
 @click.version_option(version="0.1.0")
 def cli():
@@ -204,17 +264,27 @@ def watch(folders, output, config, daemon, verbose, show_config):
 
 
 @cli.command()
-@click.argument('folder', type=click.Path(exists=True), required=True)
+@click.argument('folder', type=click.Path(exists=True), required=False)
 @click.option('--output', '-o', type=click.Path(), required=False, help='Output folder in Obsidian vault')
 @click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
 @click.option('--recursive', '-r', is_flag=True, help='Process folders recursively')
+@click.option('--no-llm-cache', is_flag=True, help='Ignore cached LLM responses (new responses are still cached)')
+@click.option('--async-job', is_flag=True, help='Submit all papers as one Gemini batch prediction job')
+@click.option('--resume-job', metavar='JOB_NAME', help='Wait for a submitted batch job and write its notes')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-def batch(folder, output, config, recursive, verbose):
+def batch(folder, output, config, recursive, no_llm_cache, async_job, resume_job, verbose):
     """Process all PDF files in a folder."""
     setup_logging(verbose)
     
-    console.print(f"[bold blue]Batch processing: {folder}[/bold blue]")
-    console.print(f"[cyan]Recursive:[/cyan] {'Yes' if recursive else 'No'}")
+    if not folder and not resume_job:
+        console.print("[red]Specify a folder, or --resume-job to continue a batch job.[/red]")
+        sys.exit(1)
+    
+    if resume_job:
+        console.print(f"[bold blue]Resuming batch job: {resume_job}[/bold blue]")
+    else:
+        console.print(f"[bold blue]Batch processing: {folder}[/bold blue]")
+        console.print(f"[cyan]Recursive:[/cyan] {'Yes' if recursive else 'No'}")
     
     # Load configuration
     try:
@@ -224,6 +294,9 @@ def batch(folder, output, config, recursive, verbose):
         console.print(f"[red]Failed to load configuration: {e}[/red]")
         sys.exit(1)
     
+    if no_llm_cache:
+        config_loader.config.setdefault('advanced', {})['llm_cache_bypass'] = True
+    
     # Create path resolver
     resolver = create_resolver(config_loader.config)
     
@@ -260,7 +333,25 @@ def batch(folder, output, config, recursive, verbose):
         ) as progress:
             task = progress.add_task("Processing PDFs...", total=None)
             
-            results = await monitor.batch_process(Path(folder), recursive=recursive)
+            try:
+                if async_job or resume_job:
+                    # One batch prediction job instead of rate-limited requests
+                    runner = BatchJobRunner(monitor)
+                    job_name, results = resume_job, []
+                    if not job_name:
+                        job_name, results = await runner.submit(
+                            monitor.find_pdf_files(Path(folder), recursive)
+                        )
+                    if job_name:
+                        console.print(f"[cyan]Batch job:[/cyan] {job_name} "
+                                      f"(resume with --resume-job {job_name})")
+                        progress.update(task, description=f"Waiting for batch job {job_name}...")
+                        results.extend(await runner.resume(job_name))
+                else:
+                    results = await monitor.batch_process(Path(folder), recursive=recursive)
+            finally:
+                monitor.extraction_pool.shutdown()
+                await monitor.paper_abstractor.aclose()
             
             progress.update(task, completed=len(results))
         
@@ -273,6 +364,10 @@ def batch(folder, output, config, recursive, verbose):
         
         console.print(table)
         
+        timing_summary = monitor.get_stats()['filter_timings']
+        if timing_summary:
+            console.print(timing_table(timing_summary))
+        
         if results:
             console.print("\n[green]Generated notes:[/green]")
             for note_path in results[:5]:  # Show first 5
@@ -287,13 +382,213 @@ def batch(folder, output, config, recursive, verbose):
         sys.exit(1)
 
 
+@cli.command(name='filter')
+@click.argument('folder', type=click.Path(exists=True, file_okay=False), required=True)
+@click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
+@click.option('--recursive', '-r', is_flag=True, help='Filter folders recursively')
+@click.option('--report', type=click.Path(dir_okay=False), default='filter_report.csv',
+              show_default=True, help='Report file (.csv or .jsonl)')
+@click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+@click.option('--quarantine', is_flag=True, help='Move rejected PDFs to pdf_filter.quarantine_folder')
+@click.option('--explain', is_flag=True, help='Show the score and time of each filter level per file')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+def filter_cmd(folder, config, recursive, report, workers, quarantine, explain, verbose):
+    """Score all PDFs in a folder without processing them."""
+    setup_logging(verbose)
+    
+    # Load configuration
+    try:
+        config_loader = ConfigLoader(config)
+        console.print("[green]✓[/green] Configuration loaded")
+    except Exception as e:
+        console.print(f"[red]Failed to load configuration: {e}[/red]")
+        sys.exit(1)
+    
+    cfg = config_loader.config
+    filter_config = cfg.get('pdf_filter', {})
+    pdf_filter = PDFFilter(cfg)
+    if not pdf_filter.enabled:
+        console.print("[yellow]PDF filtering is disabled in configuration; every file will be accepted.[/yellow]")
+    
+    quarantine_folder = None
+    if quarantine:
+        if not filter_config.get('quarantine_folder'):
+            console.print("[red]--quarantine requires 'pdf_filter.quarantine_folder' in config.yaml[/red]")
+            sys.exit(1)
+        quarantine_folder = Path(filter_config['quarantine_folder']).expanduser()
+    
+    watch_config = cfg.get('watch', {})
+    pdf_files = find_pdfs(
+        Path(folder).resolve(),
+        watch_config.get('patterns', ['*.pdf', '*.PDF']),
+        watch_config.get('ignore_patterns', ['*draft*', '*tmp*', '.*']),
+        recursive=recursive
+    )
+    
+    # Files with an unchanged, previously computed verdict are not opened again
+    verdict_cache = None
+    advanced_config = cfg.get('advanced', {})
+    if advanced_config.get('pdf_cache', True) and pdf_filter.enabled:
+        cache_dir = Path(advanced_config.get('cache_dir', '~/.cache/obsidian-abstractor')).expanduser()
+        verdict_cache = VerdictCache(cache_dir / 'filter_verdicts.json', pdf_filter.fingerprint())
+    
+    cached = []
+    pending = []
+    for pdf_path in pdf_files:
+        verdict = verdict_cache.get(pdf_path) if verdict_cache is not None else None
+        if verdict is not None:
+            cached.append((pdf_path, verdict, 0.0))
+        else:
+            pending.append(pdf_path)
+    
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    console.print(f"[cyan]Files:[/cyan] {len(pdf_files)} ({len(cached)} cached verdicts)")
+    console.print(f"[cyan]Workers:[/cyan] {workers}")
+    
+    report_path = Path(report)
+    filter_report = FilterReport(report_path)
+    timings = TimingHistogram()
+    accepted = rejected = deferred = quarantined = 0
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        console=console
+    ) as progress:
+        task = progress.add_task("Filtering PDFs...", total=len(pdf_files))
+        
+        try:
+            for pdf_path, result, elapsed_ms in itertools.chain(cached, filter_files(pending, cfg, workers)):
+                filter_report.add(report_row(pdf_path, result, elapsed_ms))
+                if 'cached_verdict' not in result.details:
+                    timings.add(result.details.get('timings', {}))
+                    if verdict_cache is not None:
+                        verdict_cache.put(pdf_path, result)
+                if explain:
+                    progress.console.print(explain_table(pdf_path, result))
+                
+                if result.accepted:
+                    accepted += 1
+                elif result.details.get('deferred'):
+                    # Still being written; never quarantined
+                    deferred += 1
+                else:
+                    rejected += 1
+                    if verbose:
+                        progress.console.print(f"[yellow]✗[/yellow] {pdf_path.name} (score: {result.score})")
+                    # Files that could not be analyzed stay where they are
+                    if quarantine_folder and should_quarantine(result) and quarantine_pdf(
+                        pdf_path, quarantine_folder, result.score, result.reasons, pdf_filter.academic_threshold
+                    ):
+                        quarantined += 1
+                
+                progress.update(task, advance=1,
+                                description=f"Filtering PDFs... [green]{accepted} accepted[/green], "
+                                            f"[yellow]{rejected} rejected[/yellow]")
+        except KeyboardInterrupt:
+            console.print("\n[yellow]Filtering cancelled; writing partial report[/yellow]")
+        finally:
+            filter_report.close()
+            if verdict_cache is not None:
+                verdict_cache.save()
+    
+    # Display results
+    table = Table(title="Filter Results")
+    table.add_column("Status", style="green")
+    table.add_column("Files")
+    
+    table.add_row("✓ Accepted", str(accepted))
+    table.add_row("✗ Rejected", str(rejected))
+    if deferred:
+        table.add_row("… Incomplete (deferred)", str(deferred))
+    if quarantine_folder:
+        table.add_row("→ Quarantined", str(quarantined))
+    
+    console.print(table)
+    
+    timing_summary = timings.summary()
+    if timing_summary:
+        console.print(timing_table(timing_summary))
+    console.print(f"[green]Report written:[/green] {report_path}")
+
+
+@cli.command()
+@click.argument('papers', type=click.Path(exists=True, file_okay=False), required=True)
+@click.argument('others', type=click.Path(exists=True, file_okay=False), required=True)
+@click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
+@click.option('--recursive', '-r', is_flag=True, help='Search folders recursively')
+@click.option('--workers', '-w', type=int, default=None, help='Worker processes (default: CPU count)')
+@click.option('--min-precision', type=click.FloatRange(0, 1), default=None,
+              help='Choose the threshold with the best recall at this precision (default: best F1)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write the suggested settings to a YAML file')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
+def calibrate(papers, others, config, recursive, workers, min_precision, output, verbose):
+    """Fit filter weights on labeled folders of papers and other PDFs."""
+    setup_logging(verbose)
+    
+    # Load configuration
+    try:
+        config_loader = ConfigLoader(config)
+        console.print("[green]✓[/green] Configuration loaded")
+    except Exception as e:
+        console.print(f"[red]Failed to load configuration: {e}[/red]")
+        sys.exit(1)
+    
+    cfg = config_loader.config
+    pdf_filter = PDFFilter(cfg)
+    scorer = FeatureScorer(pdf_filter)
+    
+    watch_config = cfg.get('watch', {})
+    patterns = watch_config.get('patterns', ['*.pdf', '*.PDF'])
+    paper_files = find_pdfs(Path(papers), patterns, [], recursive=recursive)
+    other_files = find_pdfs(Path(others), patterns, [], recursive=recursive)
+    if not paper_files or not other_files:
+        console.print("[red]Both folders must contain PDF files.[/red]")
+        sys.exit(1)
+    
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    console.print(f"[cyan]Papers:[/cyan] {len(paper_files)}  [cyan]Others:[/cyan] {len(other_files)}")
+    
+    with console.status("Extracting filter features..."):
+        features = extract_features(paper_files + other_files, cfg, workers)
+    
+    X = scorer.matrix(features)
+    labels = np.r_[np.ones(len(paper_files)), np.zeros(len(other_files))]
+    result = calibrate_weights(scorer, X, labels, min_precision=min_precision)
+    
+    # Display results
+    table = Table(title="Filter Calibration (on the labeled files)")
+    table.add_column("Weights")
+    table.add_column("Threshold", justify="right")
+    table.add_column("Precision", justify="right")
+    table.add_column("Recall", justify="right")
+    table.add_column("F1", justify="right")
+    for label, metrics in (("Current", result.before), ("Calibrated", result.after)):
+        table.add_row(label, f"{metrics.threshold:g}", f"{metrics.precision:.3f}",
+                      f"{metrics.recall:.3f}", f"{metrics.f1:.3f}")
+    console.print(table)
+    
+    suggested = calibration_config(result, pdf_filter)
+    snippet = yaml.safe_dump(suggested, allow_unicode=True, sort_keys=False)
+    console.print("\n[green]Suggested settings:[/green]")
+    console.print(snippet)
+    
+    if output:
+        Path(output).write_text(snippet, encoding='utf-8')
+        console.print(f"[green]Written:[/green] {output}")
+
+
 @cli.command()
 @click.argument('pdf_file', type=click.Path(exists=True), required=True)
 @click.option('--output', '-o', type=click.Path(), required=False, help='Output folder in Obsidian vault')
 @click.option('--config', '-c', type=click.Path(exists=True), help='Configuration file path')
 @click.option('--force', '-f', is_flag=True, help='Force processing even if filtered out')
+@click.option('--no-llm-cache', is_flag=True, help='Ignore cached LLM responses (new responses are still cached)')
+@click.option('--stream', is_flag=True, help='Write the note while the response is generated')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose output')
-def process(pdf_file, output, config, force, verbose):
+def process(pdf_file, output, config, force, no_llm_cache, stream, verbose):
     """Process a single PDF file."""
     setup_logging(verbose)
     
@@ -309,6 +604,11 @@ def process(pdf_file, output, config, force, verbose):
         console.print(f"[red]Failed to load configuration: {e}[/red]")
         sys.exit(1)
     
+    if no_llm_cache:
+        config_loader.config.setdefault('advanced', {})['llm_cache_bypass'] = True
+    if stream:
+        config_loader.config.setdefault('abstractor', {})['stream_output'] = True
+    
     # Create path resolver
     resolver = create_resolver(config_loader.config)
     
@@ -345,15 +645,16 @@ def process(pdf_file, output, config, force, verbose):
         # Ensure output directory exists
         output_path.mkdir(parents=True, exist_ok=True)
         
+        # The PDF is opened once and shared by the filter, extractor and image renderer
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console
-        ) as progress:
+        ) as progress, PDFSession(pdf_path) as session:
             # Apply PDF filter unless forced
             if not force and pdf_filter.enabled:
                 task = progress.add_task("[cyan]Checking if PDF is academic paper...", total=None)
-                filter_result = pdf_filter.filter_pdf(pdf_path)
+                filter_result = pdf_filter.filter_pdf(pdf_path, session=session)
                 
                 if not filter_result.accepted:
                     progress.update(task, description=f"[yellow]✗ Not an academic paper (score: {filter_result.score})")
@@ -368,20 +669,35 @@ def process(pdf_file, output, config, force, verbose):
             # Extract PDF
             task = progress.add_task("[cyan]Extracting PDF content...", total=None)
             try:
-                pdf_data = pdf_extractor.extract(pdf_path)
+                pdf_data = pdf_extractor.extract(pdf_path, session=session)
                 progress.update(task, description="[green]✓ PDF extracted")
             except Exception as e:
                 progress.update(task, description=f"[red]✗ PDF extraction failed: {e}")
                 raise
             
-            # Generate abstract
-            task = progress.add_task("[cyan]Generating AI abstract...", total=None)
+            # Generate abstract (streamed into the output folder if enabled)
+            note_stream = None
+            if paper_abstractor.stream_output:
+                note_stream = NoteStream.for_paper(
+                    output_path, pdf_data, pdf_path, paper_abstractor, note_formatter
+                )
+                task = progress.add_task(f"[cyan]Generating AI abstract into {note_stream.path.name}...", total=None)
+            else:
+                task = progress.add_task("[cyan]Generating AI abstract...", total=None)
             try:
-                abstract_data = await paper_abstractor.generate_abstract(pdf_data)
+                abstract_data = await paper_abstractor.generate_abstract(
+                    pdf_data, session=session, stream=note_stream
+                )
                 progress.update(task, description="[green]✓ Abstract generated")
             except Exception as e:
                 progress.update(task, description=f"[red]✗ Abstract generation failed: {e}")
+                if note_stream is not None:
+                    partial_path = await note_stream.keep_partial(pdf_path)
+                    if partial_path is not None:
+                        console.print(f"[yellow]Partial note kept: {partial_path}[/yellow]")
                 raise
+            finally:
+                await paper_abstractor.aclose()
             
             # Format note
             task = progress.add_task("[cyan]Creating Obsidian note...", total=None)
@@ -392,7 +708,10 @@ def process(pdf_file, output, config, force, verbose):
                 # Step 1: Save with temporary filename
                 temp_filename = f"temp_{uuid.uuid4()}.md"
                 temp_path = output_path / temp_filename
-                temp_path.write_text(note_content, encoding='utf-8')
+                if note_stream is not None:
+                    await note_stream.finish(note_content, temp_path)
+                else:
+                    temp_path.write_text(note_content, encoding='utf-8')
                 
                 # Step 2: Extract YAML frontmatter
                 yaml_data = extract_yaml_frontmatter(note_content)
@@ -14,6 +14,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Characters at the start of the paper text searched for a DOI
+DOI_SEARCH_CHARS = 5000
+
 
 class NoteFormatter:
     """Format paper data into Obsidian notes."""
@@ -54,17 +57,29 @@ class NoteFormatter:
             return abstract_data.get('markdown_content', '')
         
         # Otherwise, use the traditional formatting approach
-        # Generate frontmatter
-        frontmatter = self.generate_frontmatter(pdf_data, abstract_data, pdf_path)
-        
         # Generate note body
         body = self.format_body(pdf_data, abstract_data)
         
         # Combine frontmatter and body
-        note_content = f"---\n{yaml.dump(frontmatter, allow_unicode=True, sort_keys=False)}---\n\n{body}"
+        note_content = f"{self.format_frontmatter(pdf_data, abstract_data, pdf_path)}{body}"
         
         return note_content
     
+    def format_frontmatter(self, pdf_data: Dict[str, Any], abstract_data: Dict[str, Any], pdf_path: Path) -> str:
+        """
+        Format the YAML frontmatter block that starts a note.
+        
+        Args:
+            pdf_data: Extracted PDF data
+            abstract_data: Generated abstract data (may be partial)
+            pdf_path: Path to the original PDF file
+        
+        Returns:
+            Frontmatter block followed by a blank line
+        """
+        frontmatter = self.generate_frontmatter(pdf_data, abstract_data, pdf_path)
+        return f"---\n{yaml.dump(frontmatter, allow_unicode=True, sort_keys=False)}---\n\n"
+    
     def generate_frontmatter(self, pdf_data: Dict[str, Any], abstract_data: Dict[str, Any], pdf_path: Path) -> Dict[str, Any]:
         """
         Generate YAML frontmatter for the note.
@@ -451,7 +466,7 @@ class NoteFormatter:
         
         # DOI pattern
         doi_pattern = r'10\.\d{4,}/[-._;()/:\w]+'
-        match = re.search(doi_pattern, text[:5000])  # Search in first part
+        match = re.search(doi_pattern, text[:DOI_SEARCH_CHARS])
         
         if match:
             return match.group(0)
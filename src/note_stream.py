@@ -0,0 +1,139 @@
+"""
+Streaming note module for Obsidian Abstractor.
+
+This module writes a note while the LLM response is still streaming in: the
+frontmatter is written first, each chunk of text is appended as it arrives,
+and the finished note replaces the streamed text just before the usual
+atomic rename. If the stream dies, the partial note is kept next to the
+other notes instead of being deleted.
+"""
+
+import logging
+import shutil
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import aiofiles
+
+from .utils.note_utils import handle_rename
+
+if TYPE_CHECKING:
+    from .note_formatter import NoteFormatter
+    from .paper_abstractor import PaperAbstractor
+
+logger = logging.getLogger(__name__)
+
+# Text held back at the start of a response to recognize a ```markdown wrapper
+FENCE_PROBE_CHARS = 16
+
+
+class NoteStream:
+    """Temporary note file that grows while the response streams in."""
+    
+    def __init__(self, folder: Path, header: str = ''):
+        """
+        Initialize a note stream.
+        
+        Args:
+            folder: Folder of the temporary note
+            header: Text written before the response (e.g. frontmatter)
+        """
+        self.path = Path(folder) / f"temp_{uuid.uuid4()}.md"
+        self.header = header
+        self._lead: Optional[str] = ''
+    
+    @classmethod
+    def for_paper(cls, folder: Path, pdf_data: Dict[str, Any], pdf_path: Path,
+                  paper_abstractor: 'PaperAbstractor', note_formatter: 'NoteFormatter') -> 'NoteStream':
+        """
+        Create a note stream for one paper.
+        
+        Markdown responses start with their own frontmatter; structured
+        responses get the frontmatter built from the PDF metadata up front.
+        
+        Args:
+            folder: Folder of the temporary note
+            pdf_data: Extracted PDF data
+            pdf_path: Path to the PDF file
+            paper_abstractor: Abstractor that will generate the response
+            note_formatter: Formatter of the final note
+        
+        Returns:
+            NoteStream instance
+        """
+        header = ''
+        if not paper_abstractor.uses_markdown_format:
+            header = note_formatter.format_frontmatter(
+                pdf_data, {'model_used': paper_abstractor.model_name}, pdf_path
+            )
+        return cls(folder, header)
+    
+    async def reset(self):
+        """Start the note over (called before every generation attempt)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lead = ''
+        async with aiofiles.open(self.path, 'w', encoding='utf-8') as f:
+            await f.write(self.header)
+    
+    async def write(self, text: str):
+        """
+        Append a chunk of the response.
+        
+        Args:
+            text: Response text received since the previous chunk
+        """
+        if self._lead is not None:
+            # Hold back the first line until it is known not to be a code fence
+            self._lead += text
+            if '\n' not in self._lead and (len(self._lead) < FENCE_PROBE_CHARS
+                                           or self._lead.lstrip().startswith('```')):
+                return
+            text, self._lead = self._lead, None
+            if text.lstrip().startswith('```'):
+                text = text.split('\n', 1)[1]
+            text = text.lstrip('\n')
+        
+        if text:
+            async with aiofiles.open(self.path, 'a', encoding='utf-8') as f:
+                await f.write(text)
+    
+    async def finish(self, note_content: str, temp_path: Path) -> Path:
+        """
+        Replace the streamed text with the final note and move it into place.
+        
+        Args:
+            note_content: Formatted note
+            temp_path: Temporary path in the output folder, renamed afterwards
+        
+        Returns:
+            Path of the temporary note holding the final content
+        """
+        async with aiofiles.open(self.path, 'w', encoding='utf-8') as f:
+            await f.write(note_content)
+        if self.path != temp_path:
+            shutil.move(str(self.path), str(temp_path))
+        return temp_path
+    
+    async def keep_partial(self, pdf_path: Path) -> Optional[Path]:
+        """
+        Keep the note of a failed generation under a recognizable name.
+        
+        Args:
+            pdf_path: Path to the PDF file
+        
+        Returns:
+            Path of the partial note, or None if nothing was streamed
+        """
+        if not self.path.exists():
+            return None
+        if self._lead:
+            await self.write('\n')  # Flush text held back for fence detection
+        
+        if self.path.stat().st_size <= len(self.header.encode('utf-8')):
+            self.path.unlink()
+            return None
+        
+        partial_path = handle_rename(self.path, self.path.parent / f"{pdf_path.stem}.partial.md")
+        logger.warning(f"Generation stopped early, partial note kept: {partial_path}")
+        return partial_path
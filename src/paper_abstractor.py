@@ -6,36 +6,60 @@ from academic papers using Google Gemini AI.
 """
 
 import asyncio
-import os
 import logging
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple, Union, TYPE_CHECKING
 from datetime import datetime
-import time
-import json
-from google import genai
+import random
 from google.genai import types
 
+from .pdf_extractor import text_budget_chars
+from .rate_limiter import RateLimiter
+from .adaptive_concurrency import AdaptiveConcurrency, is_throttle, retry_after
+from .response_cache import ResponseCache
+from .context_cache import ContextCache, split_prompt_template
+from .llm_backend import LLMBackend, create_backend
+
+if TYPE_CHECKING:
+    from .note_stream import NoteStream
+    from .pdf_session import PDFSession
+
 logger = logging.getLogger(__name__)
 
+# Rough token estimate used for rate limiting before the API reports usage
+CHARS_PER_TOKEN = 4
+# A page rendered at 150 dpi is split into about six 768px tiles of 258 tokens
+IMAGE_TOKENS = 1548
+# Format of the created field of markdown notes
+NOTE_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+class GenerationRequest(NamedTuple):
+    """One Gemini request built from a paper."""
+    prompt: str
+    contents: Union[str, List[types.Content]]
+    generation_config: types.GenerateContentConfig
+    response_key: str
+    # Fixed template instructions sent apart from the contents ('' if not split)
+    instructions: str
+
 
 class PaperAbstractor:
     """Generate AI-powered abstracts from academic papers."""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], backend: Optional[LLMBackend] = None):
         """
         Initialize the paper abstractor.
         
         Args:
             config: Configuration dictionary
+            backend: Backend answering generation requests (default: the one
+                selected by ai.backend, the Gemini API unless configured otherwise)
         """
         self.config = config
-        self.api_key = config.get('api', {}).get('google_ai_key', '')
-        if not self.api_key:
-            raise ValueError("Google AI API key not configured")
-        
-        # Initialize Gemini client
-        self.client = genai.Client(api_key=self.api_key)
+        self.backend = backend if backend is not None else create_backend(config)
+        # Responses of one backend are never served for another
+        self.backend_name = config.get('ai', {}).get('backend', 'gemini')
         
         # Model settings - check both api and ai sections for compatibility
         self.model_name = (config.get('ai', {}).get('model') or 
@@ -49,13 +73,16 @@ class PaperAbstractor:
         self.include_citations = config.get('abstractor', {}).get('include_citations', True)
         self.include_figures = config.get('abstractor', {}).get('include_figures', True)
         self.extract_keywords = config.get('abstractor', {}).get('extract_keywords', True)
+        self.stream_output = config.get('abstractor', {}).get('stream_output', False)
+        self.text_budget_chars = text_budget_chars(config)
         
         # Visual extraction settings
         self.enable_visual_extraction = config.get('abstractor', {}).get('enable_visual_extraction', False)
         self.max_image_pages = config.get('abstractor', {}).get('max_image_pages', 3)
         self.image_dpi = config.get('abstractor', {}).get('image_dpi', 150)
+        self.image_request_max_kb = config.get('pdf', {}).get('image_request_max_kb', 6144)
         
-        # Rate limiting
+        # Rate limiting (request_delay is the base of the retry backoff)
         self.rate_limit = config.get('rate_limit', {})
         self.requests_per_minute = self.rate_limit.get('requests_per_minute', 60)
         self.request_delay = self.rate_limit.get('request_delay', 1)
@@ -64,8 +91,15 @@ class PaperAbstractor:
         # Load prompt templates
         self.prompt_templates = self._load_prompt_templates()
         
-        # Request tracking for rate limiting
-        self._request_times: List[float] = []
+        # One limiter and concurrency controller shared by every worker using this abstractor
+        self.rate_limiter = RateLimiter.from_config(config)
+        self.concurrency = AdaptiveConcurrency.from_config(config)
+        
+        # Responses of identical requests are reused without calling the API
+        self.response_cache = ResponseCache(config)
+        
+        # Fixed template instructions kept server-side (None when disabled)
+        self.context_cache = ContextCache.from_config(config, self.backend.caches, self.model_name)
     
     
     def _load_prompt_templates(self) -> Dict[str, str]:
@@ -89,31 +123,39 @@ class PaperAbstractor:
         
         return templates
     
-    async def generate_abstract(self, pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+    @property
+    def uses_markdown_format(self) -> bool:
+        """Whether the model writes the complete note, frontmatter included."""
+        return 'markdown_ja' in self.prompt_templates and self.language == 'ja'
+    
+    async def generate_abstract(self, pdf_data: Dict[str, Any],
+                                session: Optional['PDFSession'] = None,
+                                page_images: Optional[List[Dict[str, Any]]] = None,
+                                stream: Optional['NoteStream'] = None) -> Dict[str, Any]:
         """
         Generate an abstract from extracted PDF data.
         
         Args:
             pdf_data: Dictionary containing extracted PDF data
+            session: Optional shared PDF session used to render page images
+            page_images: Page images already rendered by the caller (skips rendering)
+            stream: Note the response is streamed into as it is generated
             
         Returns:
             Dictionary containing the generated abstract and metadata
         """
-        # Rate limiting
-        await self._apply_rate_limit()
-        
         # Prepare input data
         input_text = self._prepare_input_text(pdf_data)
         
-        # Extract page images if visual extraction is enabled
-        page_images = None
-        if self.enable_visual_extraction and pdf_data.get('pdf_path'):
+        # Extract page images if visual extraction is enabled and not already rendered
+        if page_images is None and self.enable_visual_extraction and pdf_data.get('pdf_path'):
             try:
                 from .pdf_extractor import PDFExtractor
                 extractor = PDFExtractor(self.config)
                 page_images = extractor.extract_page_images(
                     Path(pdf_data['pdf_path']),
-                    dpi=self.image_dpi
+                    dpi=self.image_dpi,
+                    session=session
                 )
                 logger.info(f"Extracted {len(page_images)} page images for visual processing")
             except Exception as e:
@@ -121,23 +163,66 @@ class PaperAbstractor:
                 # Continue without images
         
         # Check if we should use markdown template
-        use_markdown = 'markdown_ja' in self.prompt_templates and self.language == 'ja'
+        use_markdown = self.uses_markdown_format
         
         # Generate abstract with retries
         for attempt in range(self.retry_attempts):
             try:
+                if stream is not None:
+                    await stream.reset()
                 if use_markdown:
-                    abstract_data = await self._generate_markdown_with_gemini(input_text, pdf_data, page_images)
+                    abstract_data = await self._generate_markdown_with_gemini(input_text, pdf_data, page_images, stream)
                 else:
-                    abstract_data = await self._generate_with_gemini(input_text, pdf_data, page_images)
+                    abstract_data = await self._generate_with_gemini(input_text, pdf_data, page_images, stream)
                 return abstract_data
             except Exception as e:
                 logger.warning(f"Attempt {attempt + 1} failed: {e}")
                 if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.request_delay * (attempt + 1))
+                    if not is_throttle(e):
+                        await asyncio.sleep(self.request_delay * (attempt + 1))
+                    elif retry_after(e) is None:
+                        # Throttled without a hint: back off exponentially, with jitter so
+                        # that workers throttled together do not retry together
+                        await asyncio.sleep(self.request_delay * 2 ** (attempt + 1) * random.uniform(0.5, 1.5))
+                    # Otherwise the concurrency controller holds requests for the Retry-After delay
                 else:
                     raise RuntimeError(f"Failed to generate abstract after {self.retry_attempts} attempts: {e}")
     
+    def build_request(self, pdf_data: Dict[str, Any],
+                      page_images: Optional[List[Dict[str, Any]]] = None) -> 'GenerationRequest':
+        """
+        Build the generation request of a paper without sending it.
+        
+        Used to submit papers as a batch job; generate_abstract builds and
+        sends the same request.
+        
+        Args:
+            pdf_data: Dictionary containing extracted PDF data
+            page_images: Rendered page images
+        
+        Returns:
+            GenerationRequest of the paper
+        """
+        input_text = self._prepare_input_text(pdf_data)
+        if self.uses_markdown_format:
+            return self._markdown_request(input_text, pdf_data, page_images)
+        return self._abstract_request(input_text, page_images)
+    
+    def parse_response(self, text: str, pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turn a response text into abstract data.
+        
+        Args:
+            text: Response text of a request from build_request
+            pdf_data: Dictionary containing extracted PDF data
+        
+        Returns:
+            Dictionary containing the generated abstract and metadata
+        """
+        if self.uses_markdown_format:
+            return self._parse_markdown_response(text, pdf_data)
+        return self._parse_abstract_response(text, pdf_data)
+    
     def _prepare_input_text(self, pdf_data: Dict[str, Any]) -> str:
         """Prepare input text for the AI model."""
         parts = []
@@ -153,11 +238,11 @@ class PaperAbstractor:
         
         parts.append("")  # Empty line
         
-        # Add main text
+        # Add main text (already cut to the text budget by the extractor;
+        # this only guards data extracted with a larger budget)
         text = pdf_data.get('text', '')
-        # Limit text length to avoid token limits
-        max_chars = 60000  # Approximately 15000 tokens
-        if len(text) > max_chars:
+        max_chars = self.text_budget_chars
+        if max_chars and len(text) > max_chars:
             text = text[:max_chars] + "\n\n[Text truncated due to length...]"
         parts.append(text)
         
@@ -176,16 +261,30 @@ class PaperAbstractor:
         return "\n".join(parts)
     
     async def _generate_with_gemini(self, input_text: str, pdf_data: Dict[str, Any], 
-                                    page_images: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+                                    page_images: Optional[List[Dict[str, Any]]] = None,
+                                    stream: Optional['NoteStream'] = None) -> Dict[str, Any]:
         """Generate abstract using Gemini API."""
+        request = self._abstract_request(input_text, page_images)
+        
+        # Generate response using new SDK
+        abstract_text = await self._generate_content(
+            request.contents, request.generation_config, request.response_key, stream, request.instructions
+        )
+        return self._parse_abstract_response(abstract_text, pdf_data, request.prompt)
+    
+    def _abstract_request(self, input_text: str,
+                          page_images: Optional[List[Dict[str, Any]]] = None) -> 'GenerationRequest':
+        """Build the request of a structured abstract."""
         # Get appropriate prompt template
         prompt_template = self.prompt_templates.get(self.language, self.prompt_templates['en'])
+        language = "日本語" if self.language == 'ja' else "English"
+        instructions, request_template = self._split_prompt(prompt_template, language=language)
         
         # Format the prompt
-        prompt = prompt_template.format(
+        prompt = request_template.format(
             pdf_text=input_text,
             max_length=self.max_length,
-            language="日本語" if self.language == 'ja' else "English",
+            language=language,
         )
         
         # Create generation config
@@ -197,22 +296,12 @@ class PaperAbstractor:
         # Build contents for multimodal request
         contents = self._build_multimodal_contents(prompt, page_images)
         
-        # Generate response using new SDK
-        def _generate_sync():
-            return self.client.models.generate_content(
-                model=self.model_name,
-                contents=contents,
-                config=generation_config
-            )
-        
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            _generate_sync
-        )
-        
-        # Parse the response
-        abstract_text = response.text
-        
+        response_key = self._response_key(prompt_template, input_text, page_images, generation_config)
+        return GenerationRequest(prompt, contents, generation_config, response_key, instructions)
+    
+    def _parse_abstract_response(self, abstract_text: str, pdf_data: Dict[str, Any],
+                                 prompt: str = '') -> Dict[str, Any]:
+        """Structure the response text of a structured abstract."""
         # Debug: Log the raw response
         if self.config.get('advanced', {}).get('log_level') == 'DEBUG':
             logger.debug(f"Raw Gemini response:\n{abstract_text}")
@@ -367,8 +456,20 @@ class PaperAbstractor:
         return result
     
     async def _generate_markdown_with_gemini(self, input_text: str, pdf_data: Dict[str, Any],
-                                            page_images: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+                                            page_images: Optional[List[Dict[str, Any]]] = None,
+                                            stream: Optional['NoteStream'] = None) -> Dict[str, Any]:
         """Generate complete markdown using Gemini API."""
+        request = self._markdown_request(input_text, pdf_data, page_images)
+        
+        # Generate response using new SDK
+        markdown_text = await self._generate_content(
+            request.contents, request.generation_config, request.response_key, stream, request.instructions
+        )
+        return self._parse_markdown_response(markdown_text, pdf_data)
+    
+    def _markdown_request(self, input_text: str, pdf_data: Dict[str, Any],
+                          page_images: Optional[List[Dict[str, Any]]] = None) -> 'GenerationRequest':
+        """Build the request of a complete markdown note."""
         # Get markdown prompt template
         prompt_template = self.prompt_templates.get('markdown_ja')
         
@@ -379,19 +480,18 @@ class PaperAbstractor:
         year = metadata.get('year', datetime.now().year)
         page_count = pdf_data.get('page_count', 0)
         file_size_mb = pdf_data.get('file_size_mb', 0)
-        pdf_filename = pdf_data.get('pdf_path', 'unknown.pdf')
-        if isinstance(pdf_filename, Path):
-            pdf_filename = pdf_filename.name
+        pdf_filename = self._pdf_filename(pdf_data)
         
         # Format the prompt
-        prompt = prompt_template.format(
+        instructions, request_template = self._split_prompt(prompt_template)
+        prompt = request_template.format(
             pdf_text=input_text,
             max_length=self.max_length,
             title=title,
             authors=authors,
             year=year,
             pdf_filename=pdf_filename,
-            current_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            current_date=datetime.now().strftime(NOTE_DATE_FORMAT)
         )
         
         # Create generation config
@@ -403,22 +503,49 @@ class PaperAbstractor:
         # Build contents for multimodal request
         contents = self._build_multimodal_contents(prompt, page_images)
         
-        # Generate response using new SDK
-        def _generate_sync():
-            return self.client.models.generate_content(
-                model=self.model_name,
-                contents=contents,
-                config=generation_config
-            )
-        
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            _generate_sync
+        # The file name and current date do not change the paper, so they
+        # are left out of the response cache key and stamped into the
+        # frontmatter of each response instead (_stamp_frontmatter)
+        response_key = self._response_key(
+            prompt_template, input_text, page_images, generation_config, title, authors, year
         )
+        return GenerationRequest(prompt, contents, generation_config, response_key, instructions)
+    
+    @staticmethod
+    def _pdf_filename(pdf_data: Dict[str, Any]) -> str:
+        """File name of the PDF a note links to."""
+        return Path(pdf_data.get('pdf_path') or 'unknown.pdf').name
+    
+    def _stamp_frontmatter(self, markdown_text: str, pdf_data: Dict[str, Any]) -> str:
+        """
+        Set the PDF link and creation date in the frontmatter of a note.
+        
+        A cached response may have been generated for the same paper under
+        another file name or on another day.
         
-        # Get the markdown response
-        markdown_text = response.text
+        Args:
+            markdown_text: Complete markdown note
+            pdf_data: Dictionary containing extracted PDF data
         
+        Returns:
+            Note with the pdf-path and created fields of this file and run
+        """
+        match = re.match(r'---\n(.*?\n)---', markdown_text, re.DOTALL)
+        if not match:
+            return markdown_text
+        
+        pdf_link = self._pdf_filename(pdf_data).replace("'", "''")
+        fields = {
+            'pdf-path': f"'[[{pdf_link}]]'",
+            'created': f"'{datetime.now().strftime(NOTE_DATE_FORMAT)}'",
+        }
+        frontmatter = match.group(1)
+        for field, value in fields.items():
+            frontmatter = re.sub(rf'^{field}:.*$', lambda _: f"{field}: {value}", frontmatter, flags=re.MULTILINE)
+        return markdown_text[:match.start(1)] + frontmatter + markdown_text[match.end(1):]
+    
+    def _parse_markdown_response(self, markdown_text: str, pdf_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Clean up the response text of a complete markdown note."""
         # Remove markdown code block wrapper if present
         if markdown_text.startswith('```markdown'):
             markdown_text = markdown_text[11:]  # Remove ```markdown
@@ -431,6 +558,7 @@ class PaperAbstractor:
         
         # Strip any leading/trailing whitespace
         markdown_text = markdown_text.strip()
+        markdown_text = self._stamp_frontmatter(markdown_text, pdf_data)
         
         # Debug: Log the raw response
         if self.config.get('advanced', {}).get('log_level') == 'DEBUG':
@@ -496,7 +624,6 @@ class PaperAbstractor:
             
             found_exp = False
             for pattern in exp_patterns:
-                import re
                 match = re.search(pattern, line_stripped)
                 if match:
                     # Save previous experiment if exists
@@ -590,7 +717,6 @@ class PaperAbstractor:
     
     def _extract_experiment_number(self, line: str) -> str:
         """Extract experiment number from line."""
-        import re
         match = re.search(r'実験\s*(\d+)|Experiment\s*(\d+)', line)
         if match:
             return match.group(1) or match.group(2)
@@ -624,26 +750,136 @@ class PaperAbstractor:
         
         return sorted(list(set(keywords)))[:15]  # Limit to 15 keywords
     
-    async def _apply_rate_limit(self):
-        """Apply rate limiting to API requests."""
-        current_time = time.time()
-        
-        # Remove old request times (older than 1 minute)
-        self._request_times = [t for t in self._request_times if current_time - t < 60]
-        
-        # Check if we need to wait
-        if len(self._request_times) >= self.requests_per_minute:
-            oldest_request = self._request_times[0]
-            wait_time = 60 - (current_time - oldest_request) + 0.1
-            if wait_time > 0:
-                logger.info(f"Rate limit reached, waiting {wait_time:.1f} seconds")
-                await asyncio.sleep(wait_time)
-        
-        # Add current request time
-        self._request_times.append(current_time)
-        
-        # Apply minimum delay between requests
-        await asyncio.sleep(self.request_delay)
+    async def aclose(self):
+        """Close the connections of the backend."""
+        await self.backend.aclose()
+    
+    def _response_key(self, prompt_template: str, input_text: str,
+                      page_images: Optional[List[Dict[str, Any]]],
+                      generation_config: types.GenerateContentConfig, *prompt_fields: object) -> str:
+        """Response cache key of a request built from these inputs."""
+        images = [img['image_data'] for img in (page_images or [])[:self.max_image_pages]]
+        return ResponseCache.key(
+            input_text, images, self.backend_name, self.model_name, prompt_template, self.language,
+            generation_config.model_dump_json(exclude_none=True),
+            self.max_length, self.image_request_max_kb, *prompt_fields
+        )
+    
+    def _split_prompt(self, prompt_template: str, **static_fields: Any) -> Tuple[str, str]:
+        """
+        Fixed instructions and request template of a prompt template.
+        
+        Returns:
+            Tuple of the instructions ('' unless context caching is enabled)
+            and the template of the request text
+        """
+        if self.context_cache is None:
+            return '', prompt_template
+        return split_prompt_template(prompt_template, max_length=self.max_length, **static_fields)
+    
+    async def _generate_content(self, contents: Union[str, List[types.Content]],
+                                generation_config: types.GenerateContentConfig,
+                                response_key: Optional[str] = None,
+                                stream: Optional['NoteStream'] = None,
+                                instructions: str = '') -> str:
+        """
+        Send one generation request once the rate limiter admits it.
+        
+        Every attempt, including retries, goes through the limiter and holds a
+        slot of the adaptive concurrency limit while in flight. The token
+        estimate is corrected with the usage reported by the API. Cached
+        responses are returned without using any quota. With a note stream,
+        the response is streamed and each chunk is appended to the note.
+        Instructions are referenced through the context cache, or sent as
+        the system instruction when they cannot be cached.
+        
+        Returns:
+            Response text
+        """
+        if response_key is not None:
+            cached = self.response_cache.get(response_key)
+            if cached is not None:
+                logger.info(f"Using cached LLM response from {cached.get('created_at', 'an earlier run')}")
+                if stream is not None:
+                    await stream.write(cached['text'])
+                return cached['text']
+        
+        cached_content = None
+        if instructions:
+            cached_content = await self.context_cache.get(instructions)
+            generation_config = generation_config.model_copy(update=(
+                {'cached_content': cached_content} if cached_content else {'system_instruction': instructions}
+            ))
+        
+        # Cached instructions still count as input tokens
+        estimated_tokens = self._estimate_tokens(contents) + len(instructions) // CHARS_PER_TOKEN
+        await self.rate_limiter.acquire(estimated_tokens)
+        
+        # The slot bounds requests in flight, measures latency and reacts to
+        # 429/503 responses; waiting requests are coroutines, not threads
+        try:
+            async with self.concurrency.slot(size=estimated_tokens):
+                if stream is None:
+                    response = await self.backend.generate_content(
+                        model=self.model_name,
+                        contents=contents,
+                        config=generation_config
+                    )
+                    text = response.text
+                    usage = getattr(response, 'usage_metadata', None)
+                else:
+                    text, usage = await self._stream_content(contents, generation_config, stream)
+        except Exception as e:
+            # An expired or deleted cache is created again on the next attempt
+            if cached_content and getattr(e, 'code', None) in (403, 404):
+                self.context_cache.invalidate(instructions)
+            raise
+        
+        self.rate_limiter.reconcile(estimated_tokens, getattr(usage, 'prompt_token_count', None))
+        
+        if response_key is not None:
+            self.response_cache.put(
+                response_key, text, self.model_name,
+                usage.model_dump(exclude_none=True, mode='json') if usage is not None else None
+            )
+        return text
+    
+    async def _stream_content(self, contents: Union[str, List[types.Content]],
+                              generation_config: types.GenerateContentConfig,
+                              stream: 'NoteStream') -> Tuple[str, Optional[types.GenerateContentResponseUsageMetadata]]:
+        """
+        Stream one response into a note.
+        
+        Returns:
+            Tuple of the complete response text and the usage reported with the last chunk
+        """
+        parts = []
+        usage = None
+        async for chunk in await self.backend.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=generation_config
+        ):
+            if chunk.text:
+                parts.append(chunk.text)
+                await stream.write(chunk.text)
+            usage = getattr(chunk, 'usage_metadata', None) or usage
+        return ''.join(parts), usage
+    
+    @staticmethod
+    def _estimate_tokens(contents: Union[str, List[types.Content]]) -> int:
+        """Rough input token count of a request, before the API reports the real one."""
+        if isinstance(contents, str):
+            return len(contents) // CHARS_PER_TOKEN + 1
+        
+        tokens = 0
+        for content in contents:
+            for part in content.parts or []:
+                if part.text:
+                    tokens += len(part.text) // CHARS_PER_TOKEN + 1
+                elif part.inline_data is not None:
+                    tokens += IMAGE_TOKENS
+        return tokens
     
     def _get_default_japanese_prompt(self) -> str:
         """Get default Japanese prompt template."""
@@ -702,10 +938,12 @@ Paper text:
 {pdf_text}"""
     
     def _build_multimodal_contents(self, prompt: str, 
-                                 page_images: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+                                 page_images: Optional[List[Dict[str, Any]]] = None) -> Union[str, List[types.Content]]:
         """
         Build contents array for multimodal Gemini request.
         
+        Image bytes are passed to the SDK as they are, without a base64 copy.
+        
         Args:
             prompt: Text prompt
             page_images: Optional list of page images
@@ -716,7 +954,7 @@ Paper text:
         contents = []
         
         # Add text prompt
-        text_parts = [{"text": prompt}]
+        text_parts = [types.Part.from_text(text=prompt)]
         
         # Add images if available
         if page_images:
@@ -726,22 +964,21 @@ Paper text:
             for img in page_images[:self.max_image_pages]:  # Limit number of images
                 total_size_kb += img.get('file_size_kb', 0)
                 
-                # Check total size limit (12MB)
-                if total_size_kb > 12 * 1024:
-                    logger.warning(f"Total image size exceeds 12MB, stopping at page {img['page_number']}")
+                # Check total size limit (request-wide image budget)
+                if total_size_kb > self.image_request_max_kb:
+                    logger.warning(f"Total image size exceeds {self.image_request_max_kb}KB, "
+                                   f"stopping at page {img['page_number']}")
                     break
                 
-                image_parts.append({
-                    "inline_data": {
-                        "mime_type": "image/png",
-                        "data": img['image_data']
-                    }
-                })
+                image_parts.append(types.Part.from_bytes(
+                    data=img['image_data'],
+                    mime_type=img.get('mime_type', 'image/png')
+                ))
                 
                 # Add page reference text
-                text_parts.append({
-                    "text": f"\n[Page {img['page_number']} image above]\n"
-                })
+                text_parts.append(types.Part.from_text(
+                    text=f"\n[Page {img['page_number']} image above]\n"
+                ))
             
             if image_parts:
                 logger.info(f"Added {len(image_parts)} images to multimodal request")
@@ -752,16 +989,10 @@ Paper text:
                     if i + 1 < len(text_parts):
                         all_parts.append(text_parts[i + 1])  # Page reference
                 
-                contents.append({
-                    "role": "user",
-                    "parts": all_parts
-                })
+                contents.append(types.Content(role="user", parts=all_parts))
             else:
                 # Text only
-                contents.append({
-                    "role": "user", 
-                    "parts": text_parts
-                })
+                contents.append(types.Content(role="user", parts=text_parts))
         else:
             # Text only (for SDK v1.26.0 format)
             contents = prompt
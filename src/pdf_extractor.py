@@ -5,16 +5,62 @@ This module provides functionality to extract text, metadata, and structure
 from academic PDF files using PyMuPDF (fitz).
 """
 
+import os
 import re
 import logging
-import base64
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple
 from datetime import datetime
 import fitz  # PyMuPDF
+import numpy as np
+
+from .extraction_cache import ExtractionCache
+from .image_cache import ImageCache
+from .pdf_session import PDFSession
+from .utils.image_encoding import encode_pixmap
+from .utils.page_text import PageTextCache, extract_pages_parallel
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever encode_pixmap produces different images for the same input
+IMAGE_ENCODER_VERSION = 1
+
+# Weights of the structural features used to find figure and table pages
+FIGURE_FEATURE_WEIGHTS = {
+    'image_area': 10.0,     # Fraction of the page covered by raster images
+    'image_count': 2.0,     # Number of raster images (saturates at 5)
+    'drawing_paths': 6.0,   # Number of vector drawing paths (saturates at 50)
+    'captions': 0.5,        # Figure/table caption lines (saturates at 4), structural pages only
+}
+# Needs real structure: a few percent of image coverage plus one image (a
+# lone logo) stays below it, and captions alone can never reach it
+FIGURE_PAGE_MIN_SCORE = 1.0
+
+# Lines starting like "Figure 3", "Fig. 2:", "Table 1", "図 4" or "表 2"
+CAPTION_LINE_PATTERN = re.compile(r'^\s*(?:fig(?:ure)?\.?|table|図|表)\s*\d+', re.IGNORECASE | re.MULTILINE)
+
+# Rough size of a token, used to convert token budgets to characters
+CHARS_PER_TOKEN = 4
+
+
+def text_budget_chars(config: Dict[str, Any]) -> int:
+    """
+    Get the page text budget in characters from the configuration.
+    
+    pdf.text_budget_tokens takes precedence over pdf.text_budget_chars.
+    
+    Args:
+        config: Configuration dictionary
+    
+    Returns:
+        Budget in characters (0 for no limit)
+    """
+    pdf_config = config.get('pdf', {})
+    budget_tokens = pdf_config.get('text_budget_tokens')
+    if budget_tokens:
+        return budget_tokens * CHARS_PER_TOKEN
+    return pdf_config.get('text_budget_chars', 60000)
+
 
 class PDFExtractor:
     """Extract text, metadata, and structure from PDF files."""
@@ -30,13 +76,30 @@ class PDFExtractor:
         self.max_size_mb = self.config.get('pdf', {}).get('max_size_mb', 100)
         self.extraction_mode = self.config.get('pdf', {}).get('extraction_mode', 'auto')
         self.handle_encrypted = self.config.get('pdf', {}).get('handle_encrypted', False)
+        # Documents with at least this many pages are extracted on several processes
+        self.parallel_pages_threshold = self.config.get('pdf', {}).get('parallel_pages_threshold', 100)
+        self.parallel_page_workers = (
+            self.config.get('pdf', {}).get('parallel_page_workers', 0) or os.cpu_count() or 1
+        )
+        # Characters of page text passed on per document (0 for no limit)
+        self.text_budget_chars = text_budget_chars(self.config)
+        # Last pages always included when the budget cuts the text short
+        self.tail_pages = self.config.get('pdf', {}).get('tail_pages', 3)
+        # Characters of page text kept in memory per document
+        self.page_cache_max_chars = self.config.get('pdf', {}).get('page_cache_max_chars', 2_000_000) or None
+        self.cache = ExtractionCache(self.config)
+        self.image_cache = ImageCache(self.config)
+        # Byte budgets for rendered page images, per image and per request
+        self.image_max_bytes = self.config.get('pdf', {}).get('image_max_kb', 1024) * 1024
+        self.image_request_max_bytes = self.config.get('pdf', {}).get('image_request_max_kb', 6144) * 1024
     
-    def extract(self, pdf_path: Path) -> Dict[str, Any]:
+    def extract(self, pdf_path: Path, session: Optional[PDFSession] = None) -> Dict[str, Any]:
         """
         Extract all information from a PDF file.
         
         Args:
             pdf_path: Path to the PDF file
+            session: Optional shared PDF session (opened here if not given)
             
         Returns:
             Dictionary containing extracted text, metadata, and structure
@@ -50,78 +113,200 @@ class PDFExtractor:
         if file_size_mb > self.max_size_mb:
             raise ValueError(f"PDF file too large: {file_size_mb:.1f}MB (max: {self.max_size_mb}MB)")
         
-        try:
-            doc = fitz.open(pdf_path)
-        except Exception as e:
-            raise RuntimeError(f"Failed to open PDF: {e}")
-        
-        # Check if encrypted
-        if doc.is_encrypted:
-            if not self.handle_encrypted:
-                doc.close()
-                raise ValueError("PDF is encrypted and handle_encrypted is False")
-            # Try to decrypt with empty password
-            if not doc.authenticate(""):
-                doc.close()
-                raise ValueError("PDF is encrypted and cannot be opened without password")
+        # Unchanged PDFs are served from the extraction cache without parsing
+        cached = self.cache.get(pdf_path)
+        if cached is not None:
+            return cached
+        
+        owns_session = session is None
+        if owns_session:
+            session = PDFSession(pdf_path)
         
         try:
+            try:
+                doc = session.doc
+            except Exception as e:
+                raise RuntimeError(f"Failed to open PDF: {e}")
+            
+            # Check if encrypted
+            is_encrypted = doc.is_encrypted
+            if is_encrypted:
+                if not self.handle_encrypted:
+                    raise ValueError("PDF is encrypted and handle_encrypted is False")
+                # Try to decrypt with empty password
+                if not doc.authenticate(""):
+                    raise ValueError("PDF is encrypted and cannot be opened without password")
+            
+            # Every extraction step reads page text through the session's cache
+            page_texts = session.page_texts
+            page_texts.set_limit(self.page_cache_max_chars)
+            
+            # Worker processes open the file themselves, which needs no password
+            if not is_encrypted:
+                self._prefill_page_texts_parallel(pdf_path, len(doc), page_texts)
+            
+            # Structure and captions are read from the pages the text budget
+            # reached, so long documents are not read in full
+            text_pages: Set[int] = set()
+            text = "\n\n".join(self.iter_text_chunks(doc, page_texts, pages_read=text_pages))
+            pages = sorted(text_pages) if self.text_budget_chars > 0 else None
+            
             result = {
-                'text': self.extract_text(doc),
-                'metadata': self.extract_metadata(doc, pdf_path),
-                'structure': self.extract_structure(doc),
-                'figures': self.extract_figures(doc),
-                'references': self.extract_references(doc),
+                'text': text,
+                'metadata': self.extract_metadata(doc, pdf_path, page_texts),
+                'structure': self.extract_structure(doc, page_texts, pages),
+                'figures': self.extract_figures(doc, page_texts, pages),
+                'references': self.extract_references(doc, page_texts),
                 'page_count': len(doc),
                 'file_size_mb': round(file_size_mb, 2),
                 'extraction_date': datetime.now().isoformat(),
                 'pdf_path': str(pdf_path),  # Store path for image extraction
             }
+            logger.debug(f"Page text cache stats for {pdf_path.name}: {page_texts.stats()}")
         finally:
-            doc.close()
+            if owns_session:
+                session.close()
         
+        self.cache.put(pdf_path, result)
         return result
     
-    def extract_text(self, doc: fitz.Document) -> str:
+    def _prefill_page_texts_parallel(self, pdf_path: Path, page_count: int,
+                                     page_texts: PageTextCache):
         """
-        Extract text from all pages of the PDF.
+        Extract the pages of a large document on worker processes.
+        
+        Small documents, or a single available worker, are left to the
+        serial path, where process startup would cost more than it saves.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_count: Number of pages in the document
+            page_texts: Page text cache to fill
+        """
+        if page_count < self.parallel_pages_threshold or self.parallel_page_workers < 2:
+            return
+        
+        flags = fitz.TEXTFLAGS_DICT if self.extraction_mode == 'layout' else None
+        try:
+            texts = extract_pages_parallel(pdf_path, page_count, self.parallel_page_workers, flags)
+        except Exception as e:
+            logger.warning(f"Parallel page extraction failed, falling back to serial: {e}")
+            return
+        
+        page_texts.prefill(texts, flags)
+        logger.debug(f"Extracted {len(texts)} pages of {pdf_path.name} "
+                     f"on {self.parallel_page_workers} processes")
+    
+    def extract_text(self, doc: fitz.Document,
+                     page_texts: Optional[PageTextCache] = None) -> str:
+        """
+        Extract text from the pages of the PDF, within the text budget.
         
         Args:
             doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
             
         Returns:
             Extracted text as a single string
         """
-        text_parts = []
+        return "\n\n".join(self.iter_text_chunks(doc, page_texts))
+    
+    def iter_text_chunks(self, doc: fitz.Document,
+                         page_texts: Optional[PageTextCache] = None,
+                         budget_chars: Optional[int] = None,
+                         pages_read: Optional[Set[int]] = None) -> Iterator[str]:
+        """
+        Yield page text chunks, stopping once the text budget is used up.
         
-        for page_num, page in enumerate(doc):
-            try:
-                # Extract text with layout preservation if in auto mode
-                if self.extraction_mode == 'layout':
-                    text = page.get_text("text", flags=fitz.TEXTFLAGS_DICT)
-                else:
-                    text = page.get_text()
-                
+        Pages are read lazily from the start of the document. When the budget
+        does not cover the whole document, part of it is reserved for the last
+        pages, so conclusions and references are still included; the pages
+        in between are never extracted by this method.
+        
+        Args:
+            doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
+            budget_chars: Maximum total length of the chunks
+                (default: the configured text budget, 0 for no limit)
+            pages_read: Optional set collecting the numbers of the pages read
+        
+        Yields:
+            "[Page N]" prefixed page texts and, where pages were skipped,
+            an omission marker
+        """
+        page_texts = page_texts or PageTextCache(doc)
+        if budget_chars is None:
+            budget_chars = self.text_budget_chars
+        if pages_read is None:
+            pages_read = set()
+        
+        # Extract text with layout preservation if in layout mode
+        flags = fitz.TEXTFLAGS_DICT if self.extraction_mode == 'layout' else None
+        page_count = len(doc)
+        separator = len("\n\n")
+        
+        if budget_chars <= 0:
+            for page_num, text in page_texts.iter_pages(flags):
+                pages_read.add(page_num)
                 if text.strip():
-                    text_parts.append(f"[Page {page_num + 1}]\n{text}")
-                    
-            except Exception as e:
-                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+                    yield f"[Page {page_num + 1}]\n{text}"
+            return
+        
+        # Reserve up to a third of the budget for the tail pages
+        tail_chunks: List[str] = []
+        tail_start = page_count
+        tail_used = 0
+        first_tail = max(1, page_count - self.tail_pages)
+        for page_num, text in page_texts.iter_pages(flags, range(page_count - 1, first_tail - 1, -1)):
+            pages_read.add(page_num)
+            if not text.strip():
+                tail_start = page_num
                 continue
+            chunk = f"[Page {page_num + 1}]\n{text}"
+            if tail_used + len(chunk) + separator > budget_chars // 3:
+                break
+            tail_chunks.insert(0, chunk)
+            tail_start = page_num
+            tail_used += len(chunk) + separator
+        
+        # Leave room for the omission marker
+        remaining = budget_chars - tail_used - 64
+        next_page = tail_start
+        for page_num, text in page_texts.iter_pages(flags, range(tail_start)):
+            pages_read.add(page_num)
+            if not text.strip():
+                continue
+            chunk = f"[Page {page_num + 1}]\n{text}"
+            if len(chunk) + separator > remaining:
+                # Fill the rest of the budget with the beginning of the page
+                if remaining > separator:
+                    yield chunk[:remaining - separator]
+                next_page = page_num + 1
+                break
+            yield chunk
+            remaining -= len(chunk) + separator
+        else:
+            next_page = tail_start
+        
+        if next_page < tail_start:
+            yield f"[... pages {next_page + 1}-{tail_start} omitted (text budget) ...]"
         
-        return "\n\n".join(text_parts)
+        yield from tail_chunks
     
-    def extract_metadata(self, doc: fitz.Document, pdf_path: Path) -> Dict[str, Any]:
+    def extract_metadata(self, doc: fitz.Document, pdf_path: Path,
+                         page_texts: Optional[PageTextCache] = None) -> Dict[str, Any]:
         """
         Extract metadata from the PDF.
         
         Args:
             doc: PyMuPDF document object
             pdf_path: Path to the PDF file
+            page_texts: Optional shared page text cache for the document
             
         Returns:
             Dictionary containing metadata
         """
+        page_texts = page_texts or PageTextCache(doc)
         metadata = doc.metadata or {}
         
         # Clean and normalize metadata
@@ -139,7 +324,7 @@ class PDFExtractor:
         
         # Try to extract additional metadata from the first page
         if not cleaned_metadata['title'] or not cleaned_metadata['author']:
-            first_page_meta = self._extract_first_page_metadata(doc)
+            first_page_meta = self._extract_first_page_metadata(doc, page_texts)
             if not cleaned_metadata['title'] and first_page_meta.get('title'):
                 cleaned_metadata['title'] = first_page_meta['title']
             if not cleaned_metadata['author'] and first_page_meta.get('authors'):
@@ -148,19 +333,24 @@ class PDFExtractor:
         # Extract year from creation date or text
         if cleaned_metadata['creation_date']:
             cleaned_metadata['year'] = cleaned_metadata['creation_date'][:4]
-        else:
-            year_match = re.search(r'\b(19|20)\d{2}\b', str(doc.get_page_text(0)))
+        elif len(doc) > 0:
+            year_match = re.search(r'\b(19|20)\d{2}\b', page_texts.get(0))
             if year_match:
                 cleaned_metadata['year'] = year_match.group(0)
         
         return cleaned_metadata
     
-    def extract_structure(self, doc: fitz.Document) -> List[Dict[str, Any]]:
+    def extract_structure(self, doc: fitz.Document,
+                          page_texts: Optional[PageTextCache] = None,
+                          pages: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
         """
         Extract document structure (sections, subsections).
         
         Args:
             doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
+            pages: Pages searched for headings when there is no table of
+                contents (default: all pages)
             
         Returns:
             List of section dictionaries
@@ -177,20 +367,25 @@ class PDFExtractor:
                 })
         else:
             # Try to extract structure from text patterns
-            structure = self._extract_structure_from_text(doc)
+            structure = self._extract_structure_from_text(doc, page_texts, pages)
         
         return structure
     
-    def extract_figures(self, doc: fitz.Document) -> List[Dict[str, Any]]:
+    def extract_figures(self, doc: fitz.Document,
+                        page_texts: Optional[PageTextCache] = None,
+                        pages: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
         """
         Extract figure and table captions.
         
         Args:
             doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
+            pages: Pages searched for captions (default: all pages)
             
         Returns:
             List of figure/table information
         """
+        page_texts = page_texts or PageTextCache(doc)
         figures = []
         
         # Common patterns for figure and table captions
@@ -201,10 +396,8 @@ class PDFExtractor:
             r'表\s*(\d+)[:\.]?\s*([^\n]+)',  # Japanese
         ]
         
-        for page_num, page in enumerate(doc):
+        for page_num, text in page_texts.iter_pages(pages=pages):
             try:
-                text = page.get_text()
-                
                 for pattern in caption_patterns:
                     matches = re.finditer(pattern, text, re.IGNORECASE)
                     for match in matches:
@@ -220,16 +413,19 @@ class PDFExtractor:
         
         return figures
     
-    def extract_references(self, doc: fitz.Document) -> List[str]:
+    def extract_references(self, doc: fitz.Document,
+                           page_texts: Optional[PageTextCache] = None) -> List[str]:
         """
         Extract references/bibliography section.
         
         Args:
             doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
             
         Returns:
             List of reference strings
         """
+        page_texts = page_texts or PageTextCache(doc)
         references = []
         ref_section_found = False
         
@@ -242,8 +438,7 @@ class PDFExtractor:
         ]
         
         for page_num in range(len(doc) - 1, max(0, len(doc) - 10), -1):
-            page = doc[page_num]
-            text = page.get_text()
+            text = page_texts.get(page_num)
             
             if not ref_section_found:
                 for pattern in ref_patterns:
@@ -270,12 +465,14 @@ class PDFExtractor:
         
         return references[::-1]  # Reverse to get correct order
     
-    def _extract_first_page_metadata(self, doc: fitz.Document) -> Dict[str, Any]:
+    def _extract_first_page_metadata(self, doc: fitz.Document,
+                                     page_texts: Optional[PageTextCache] = None) -> Dict[str, Any]:
         """Extract metadata from the first page text."""
         if len(doc) == 0:
             return {}
         
-        first_page_text = doc[0].get_text()
+        page_texts = page_texts or PageTextCache(doc)
+        first_page_text = page_texts.get(0)
         lines = first_page_text.split('\n')
         
         metadata = {}
@@ -304,8 +501,11 @@ class PDFExtractor:
         
         return metadata
     
-    def _extract_structure_from_text(self, doc: fitz.Document) -> List[Dict[str, Any]]:
+    def _extract_structure_from_text(self, doc: fitz.Document,
+                                     page_texts: Optional[PageTextCache] = None,
+                                     pages: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
         """Extract structure from text patterns when TOC is not available."""
+        page_texts = page_texts or PageTextCache(doc)
         structure = []
         
         section_patterns = [
@@ -315,8 +515,7 @@ class PDFExtractor:
             (1, r'^(Abstract|Introduction|Methods?|Results?|Discussion|Conclusion|References)$'),
         ]
         
-        for page_num, page in enumerate(doc):
-            text = page.get_text()
+        for page_num, text in page_texts.iter_pages(pages=pages):
             lines = text.split('\n')
             
             for line in lines:
@@ -355,7 +554,7 @@ class PDFExtractor:
         return None
     
     def extract_page_images(self, pdf_path: Path, page_numbers: Optional[List[int]] = None, 
-                          dpi: int = 150) -> List[Dict[str, Any]]:
+                          dpi: int = 150, session: Optional[PDFSession] = None) -> List[Dict[str, Any]]:
         """
         Extract specified pages as images from PDF (memory-safe implementation).
         
@@ -363,26 +562,48 @@ class PDFExtractor:
             pdf_path: Path to the PDF file
             page_numbers: List of page numbers to extract (0-indexed). If None, selects optimal pages
             dpi: DPI for image extraction (default 150)
+            session: Optional shared PDF session (opened here if not given)
             
         Returns:
             List of dictionaries containing page images and metadata
         """
-        doc = None
+        owns_session = session is None
+        if owns_session:
+            session = PDFSession(pdf_path)
+        
         try:
-            doc = fitz.open(pdf_path)
+            doc = session.doc
             images = []
             
             # If no page numbers specified, select optimal pages
             if page_numbers is None:
-                page_numbers = self._select_optimal_pages(doc)
+                page_numbers = self._select_optimal_pages(doc, page_texts=session.page_texts)
             
+            # Rendered pages are reused across retries and re-runs
+            pdf_key = self.image_cache.pdf_key(pdf_path)
+            
+            valid_pages = []
             for page_num in page_numbers:
                 if page_num >= len(doc):
                     logger.warning(f"Page {page_num} exceeds document length {len(doc)}")
                     continue
-                
-                image_data = self._extract_single_page_image(doc, page_num, dpi)
+                valid_pages.append(page_num)
+            if not valid_pages:
+                return images
+            
+            # Share the request-wide budget evenly between the pages
+            page_numbers = valid_pages
+            max_bytes = min(self.image_max_bytes, self.image_request_max_bytes // len(page_numbers))
+            total_bytes = 0
+            
+            for page_num in page_numbers:
+                image_data = self._extract_single_page_image(doc, page_num, dpi, pdf_key, max_bytes)
                 if image_data:
+                    total_bytes += image_data['file_size_kb'] * 1024
+                    if total_bytes > self.image_request_max_bytes:
+                        logger.warning(f"Page images exceed {self.image_request_max_bytes // 1024}KB, "
+                                       f"stopping at page {page_num + 1}")
+                        break
                     images.append(image_data)
             
             logger.info(f"Extracted {len(images)} page images from PDF")
@@ -392,73 +613,97 @@ class PDFExtractor:
             logger.error(f"Failed to extract page images: {e}")
             return []
         finally:
-            if doc:
-                doc.close()
+            if owns_session:
+                session.close()
     
     def _extract_single_page_image(self, doc: fitz.Document, page_num: int, 
-                                  dpi: int) -> Optional[Dict[str, Any]]:
+                                  dpi: int, pdf_key: Optional[str] = None,
+                                  max_bytes: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
-        Extract a single page as image with size limit handling.
+        Extract a single page as image within a byte budget.
         
         Args:
             doc: PyMuPDF document object
             page_num: Page number (0-indexed)
             dpi: DPI for image extraction
+            pdf_key: Content hash of the PDF for the page image cache (None to bypass)
+            max_bytes: Byte budget for the encoded image (default: pdf.image_max_kb)
             
         Returns:
             Dictionary with image data or None if failed
         """
+        max_bytes = max_bytes or self.image_max_bytes
+        # The encoded result depends on the budget, so it is part of the cache key
+        image_format = f"auto-{max_bytes}-v{IMAGE_ENCODER_VERSION}"
+        
+        cached = self.image_cache.get(pdf_key, page_num, dpi, image_format)
+        if cached is not None:
+            img_data, info = cached
+            logger.debug(f"Using cached image for page {page_num + 1}")
+        else:
+            rendered = self._render_page_image(doc, page_num, dpi, max_bytes)
+            if rendered is None:
+                return None
+            img_data, info = rendered
+            self.image_cache.put(pdf_key, page_num, dpi, image_format, img_data, info)
+        
+        return {
+            'page_number': page_num + 1,
+            'image_data': img_data,  # Raw encoded bytes; the API client handles transport encoding
+            'mime_type': info['mime_type'],
+            'file_size_kb': len(img_data) // 1024,
+            'dpi': info['dpi'],
+            'width': info['width'],
+            'height': info['height'],
+        }
+    
+    def _render_page_image(self, doc: fitz.Document, page_num: int, dpi: int,
+                           max_bytes: int) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Render a page once and encode it to fit the byte budget.
+        
+        Args:
+            doc: PyMuPDF document object
+            page_num: Page number (0-indexed)
+            dpi: DPI for image extraction
+            max_bytes: Byte budget for the encoded image
+        
+        Returns:
+            Tuple of (image bytes, image info) or None if failed
+        """
         try:
             page = doc[page_num]
             
             # Calculate zoom factor from DPI (PDF default is 72 DPI)
             zoom = dpi / 72.0
             mat = fitz.Matrix(zoom, zoom)
-            
-            # First attempt with requested DPI
             pix = page.get_pixmap(matrix=mat, alpha=False)
-            img_data = pix.tobytes("png")
             
-            # Check size limit (4MB)
-            max_size = 4 * 1024 * 1024
-            if len(img_data) > max_size:
-                logger.warning(f"Page {page_num + 1} image too large ({len(img_data) // 1024}KB), reducing DPI")
-                
-                # Retry with lower DPI
-                reduced_dpi = int(dpi * 0.7)
-                zoom = reduced_dpi / 72.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_data = pix.tobytes("png")
-                
-                # If still too large, reduce further
-                if len(img_data) > max_size:
-                    reduced_dpi = int(dpi * 0.5)
-                    zoom = reduced_dpi / 72.0
-                    mat = fitz.Matrix(zoom, zoom)
-                    pix = page.get_pixmap(matrix=mat, alpha=False)
-                    img_data = pix.tobytes("png")
+            encoded = encode_pixmap(pix, max_bytes)
+            if encoded.scale < 1.0 or encoded.mime_type != 'image/png':
+                logger.debug(f"Page {page_num + 1} encoded as {encoded.mime_type} at "
+                             f"{int(dpi * encoded.scale)} DPI ({len(encoded.data) // 1024}KB)")
             
-            return {
-                'page_number': page_num + 1,
-                'image_data': base64.b64encode(img_data).decode('utf-8'),
-                'file_size_kb': len(img_data) // 1024,
-                'dpi': dpi,
-                'width': pix.width,
-                'height': pix.height,
+            return encoded.data, {
+                'mime_type': encoded.mime_type,
+                'dpi': int(dpi * encoded.scale),
+                'width': encoded.width,
+                'height': encoded.height,
             }
             
         except Exception as e:
             logger.warning(f"Failed to extract image from page {page_num + 1}: {e}")
             return None
     
-    def _select_optimal_pages(self, doc: fitz.Document, max_pages: int = 5) -> List[int]:
+    def _select_optimal_pages(self, doc: fitz.Document, max_pages: int = 5,
+                              page_texts: Optional[PageTextCache] = None) -> List[int]:
         """
         Select optimal pages for visual extraction.
         
         Args:
             doc: PyMuPDF document object
             max_pages: Maximum number of pages to select
+            page_texts: Optional shared page text cache for the document
             
         Returns:
             List of page numbers (0-indexed)
@@ -469,7 +714,7 @@ class PDFExtractor:
         selected_pages.add(0)
         
         # Find figure/table pages
-        figure_pages = self._detect_figure_pages_intelligent(doc)
+        figure_pages = self._detect_figure_pages_intelligent(doc, page_texts)
         # Add up to 3 figure pages
         for page_num, score in figure_pages[:3]:
             selected_pages.add(page_num)
@@ -488,62 +733,79 @@ class PDFExtractor:
         # Convert to sorted list and limit to max_pages
         return sorted(list(selected_pages))[:max_pages]
     
-    def _detect_figure_pages_intelligent(self, doc: fitz.Document) -> List[Tuple[int, int]]:
+    def _detect_figure_pages_intelligent(self, doc: fitz.Document,
+                                         page_texts: Optional[PageTextCache] = None) -> List[Tuple[int, float]]:
         """
-        Intelligently detect pages containing figures and tables.
+        Detect pages containing figures and tables from their structure.
+        
+        Every page is described by the same structural features (image
+        coverage, image count, vector drawing paths) taken from PyMuPDF's
+        image and drawing inventories, plus caption lines as a tiebreaker.
+        The features form one row per page of a matrix, scored with a single
+        product with the weight vector.
         
         Args:
             doc: PyMuPDF document object
+            page_texts: Optional shared page text cache for the document
             
         Returns:
             List of (page_number, score) tuples sorted by score
         """
-        figure_pages = []
-        
-        # Keywords indicating figures/tables with weights
-        indicators = {
-            'figure': 3,
-            'table': 3,
-            'fig.': 3,
-            'tab.': 3,
-            '図': 3,
-            '表': 3,
-            'graph': 2,
-            'chart': 2,
-            'plot': 2,
-            'diagram': 2,
-            'グラフ': 2,
-            'experiment': 1,
-            '実験': 1,
-            'result': 1,
-            '結果': 1,
-        }
+        page_texts = page_texts or PageTextCache(doc)
+        weights = np.array(list(FIGURE_FEATURE_WEIGHTS.values()))
         
+        # One row of features per page, in FIGURE_FEATURE_WEIGHTS order
+        features = np.zeros((len(doc), len(weights)))
         for page_num in range(len(doc)):
             try:
-                page = doc[page_num]
-                text = page.get_text().lower()
-                
-                # Calculate score based on indicators
-                score = 0
-                for indicator, weight in indicators.items():
-                    count = text.count(indicator)
-                    score += count * weight
-                
-                # Bonus for pages with less text (likely to have figures)
-                text_density = len(text.strip()) / (page.rect.width * page.rect.height)
-                if text_density < 0.5:  # Low text density
-                    score += 2
-                
-                if score >= 2:  # Threshold for considering as figure page
-                    figure_pages.append((page_num, score))
-                    
+                features[page_num] = self._figure_page_features(doc[page_num], page_texts)
             except Exception as e:
                 logger.warning(f"Error analyzing page {page_num}: {e}")
-                continue
         
-        # Sort by score (descending)
-        figure_pages.sort(key=lambda x: x[1], reverse=True)
+        scores = features @ weights
+        figure_pages = [
+            (int(page_num), round(float(scores[page_num]), 2))
+            for page_num in np.flatnonzero(scores >= FIGURE_PAGE_MIN_SCORE)
+        ]
+        
+        # Sort by score (descending), earlier pages first on ties
+        figure_pages.sort(key=lambda x: (-x[1], x[0]))
         
         logger.debug(f"Detected {len(figure_pages)} figure pages")
-        return figure_pages
\ No newline at end of file
+        return figure_pages
+    
+    def _figure_page_features(self, page: fitz.Page, page_texts: PageTextCache) -> Tuple[float, ...]:
+        """
+        Compute the structural features of a page.
+        
+        Args:
+            page: PyMuPDF page object
+            page_texts: Page text cache for the document
+        
+        Returns:
+            Feature values in FIGURE_FEATURE_WEIGHTS order
+        """
+        page_rect = page.rect
+        page_area = abs(page_rect) or 1.0
+        
+        # Raster images: how much of the page they cover, and how many there are
+        image_boxes = [fitz.Rect(info['bbox']) & page_rect for info in page.get_image_info()]
+        image_area = min(sum(abs(box) for box in image_boxes) / page_area, 1.0)
+        image_count = min(len(image_boxes), 5) / 5
+        
+        # Vector graphics (plots, diagrams, ruled tables) show up as many
+        # paths. Listing them is the expensive call on vector-heavy papers,
+        # so it is skipped once the images alone make this a figure page
+        drawing_paths = 0.0
+        image_score = (FIGURE_FEATURE_WEIGHTS['image_area'] * image_area +
+                       FIGURE_FEATURE_WEIGHTS['image_count'] * image_count)
+        if image_score < FIGURE_PAGE_MIN_SCORE:
+            drawing_paths = min(len(page.get_cdrawings()) / 50, 1.0)
+        
+        # Caption lines only break ties between structurally similar pages, so
+        # a text-only page that mentions "Figure 3" is not a figure page
+        captions = 0.0
+        if image_area > 0 or drawing_paths > 0:
+            captions = min(len(CAPTION_LINE_PATTERN.findall(page_texts.get(page.number))), 4) / 4
+        
+        return (image_area, image_count, drawing_paths, captions)
\ No newline at end of file
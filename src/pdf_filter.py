@@ -6,15 +6,23 @@ identifying academic papers using a scoring system.
 """
 
 import re
+import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Any, Tuple, List, Optional, NamedTuple
-from dataclasses import dataclass
+from typing import Dict, Any, Tuple, List, Optional, NamedTuple, Set
+from dataclasses import dataclass, asdict, replace
 
-import fitz  # PyMuPDF
+from .pdf_session import PDFSession
+from .utils.hashing import cache_key
+from .utils.pdf_sniff import sniff_pdf
+from .utils.timing import StageTimer
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the scoring logic changes, to invalidate cached verdicts
+FILTER_VERSION = 5
+
 
 class FilterResult(NamedTuple):
     """Result of PDF filtering."""
@@ -33,9 +41,60 @@ class ScoringRule:
     is_regex: bool = False
 
 
+class PatternMatcher:
+    """
+    Match a fixed set of patterns against text in a single scan.
+    
+    Patterns are compiled once. Literal patterns shared by several rules are
+    checked only once, with a plain substring search, which in CPython is
+    much faster than a regex alternation over the same literals.
+    """
+    
+    def __init__(self, patterns: List[Tuple[str, str, bool]]):
+        """
+        Initialize pattern matcher.
+        
+        Args:
+            patterns: (pattern_id, pattern, is_regex) entries. Literal patterns
+                are matched case-insensitively against lowercased text.
+        """
+        self._literals: Dict[str, List[str]] = {}
+        self._regexes: List[Tuple[re.Pattern, str]] = []
+        
+        for pattern_id, pattern, is_regex in patterns:
+            if not pattern:
+                continue
+            if is_regex:
+                self._regexes.append((re.compile(pattern, re.IGNORECASE), pattern_id))
+            else:
+                self._literals.setdefault(pattern.lower(), []).append(pattern_id)
+    
+    def scan(self, text: str) -> Set[str]:
+        """
+        Find which patterns occur in the text.
+        
+        Args:
+            text: Lowercased text to scan
+        
+        Returns:
+            Set of matching pattern IDs
+        """
+        found = set()
+        for literal, pattern_ids in self._literals.items():
+            if literal in text:
+                found.update(pattern_ids)
+        for regex, pattern_id in self._regexes:
+            if pattern_id not in found and regex.search(text):
+                found.add(pattern_id)
+        return found
+
+
 class PDFFilter:
     """Filter PDFs to identify academic papers using a scoring system."""
     
+    # Funnel stages, cheapest first
+    STAGES = ('filename', 'size', 'metadata', 'content')
+    
     # Default scoring rules
     DEFAULT_POSITIVE_RULES = {
         'doi_found': ScoringRule(
@@ -104,6 +163,17 @@ class PDFFilter:
         ),
     }
     
+    # Filename keywords typical of academic papers
+    FILENAME_KEYWORDS = ['paper', 'article', 'journal', 'conference', 'proceedings']
+    
+    # Keywords counted in the content scan
+    ACADEMIC_KEYWORDS = [
+        'abstract', 'introduction', 'methodology', 'results',
+        'discussion', 'conclusion', 'references', 'bibliography',
+        'keywords', 'corresponding author', 'doi:', 'issn',
+        'received:', 'accepted:', 'published:'
+    ]
+    
     # Academic publishers
     ACADEMIC_PUBLISHERS = [
         'elsevier', 'springer', 'wiley', 'nature', 'science',
@@ -112,6 +182,37 @@ class PDFFilter:
         'latex', 'pdflatex', 'xelatex', 'lualatex'
     ]
     
+    # Default weights of the numeric features scored by each stage. Rule
+    # features ('negative:<rule>', 'positive:<rule>') are weighted by the
+    # rule scores; these can be overridden in scoring_rules.weights.
+    DEFAULT_FEATURE_WEIGHTS = {
+        'filename_keywords': 5,   # Per academic keyword in the filename
+        'filename_year': 5,
+        'size_too_small': -50,
+        'size_too_large': -30,
+        'size_optimal': 10,
+        'pages_too_few': -30,
+        'pages_too_many': -20,
+        'pages_typical': 15,
+        'pages_other': 5,
+        'academic_tool': 20,
+        'metadata_title': 5,
+        'metadata_author': 5,
+        'content_keywords': 10,   # Per academic keyword, when at least 3 are found
+    }
+    
+    # Features of which at most one is set
+    EXCLUSIVE_FEATURES = (
+        ('size_too_small', 'size_too_large', 'size_optimal'),
+        ('pages_too_few', 'pages_too_many', 'pages_typical', 'pages_other'),
+    )
+    
+    # Largest value of count features (others are 0 or 1)
+    COUNT_FEATURE_LIMITS = {
+        'filename_keywords': len(FILENAME_KEYWORDS),
+        'content_keywords': len(ACADEMIC_KEYWORDS),
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize PDF filter.
@@ -133,6 +234,13 @@ class PDFFilter:
         self.min_size_mb = filter_config.get('min_size_mb', 0.1)
         self.max_size_mb = filter_config.get('max_size_mb', 100)
         
+        # Filename and size scores at or below these reject the file outright
+        self.filename_reject_score = filter_config.get('filename_reject_score', -100)
+        self.size_reject_score = filter_config.get('size_reject_score', -50)
+        
+        # Incomplete files modified more recently than this are deferred, not scored
+        self.incomplete_grace_seconds = filter_config.get('incomplete_grace_seconds', 60)
+        
         # Load custom scoring rules
         self.positive_rules = self._load_scoring_rules(
             config.get('scoring_rules', {}).get('positive', {}),
@@ -142,13 +250,123 @@ class PDFFilter:
             config.get('scoring_rules', {}).get('negative', {}),
             self.DEFAULT_NEGATIVE_RULES
         )
+        
+        # Features scored by each stage, and their weights
+        self.stage_features = {
+            'filename': [f"negative:{name}" for name in self.negative_rules] +
+                        ['filename_keywords', 'filename_year'],
+            'size': ['size_too_small', 'size_too_large', 'size_optimal'],
+            'metadata': ['pages_too_few', 'pages_too_many', 'pages_typical', 'pages_other',
+                         'academic_tool', 'metadata_title', 'metadata_author'],
+            'content': [f"positive:{name}" for name in self.positive_rules] + ['content_keywords'],
+        }
+        self.feature_names = [name for stage in self.STAGES for name in self.stage_features[stage]]
+        self.feature_weights = self._load_feature_weights(config.get('scoring_rules', {}).get('weights', {}))
+        
+        # All patterns of a level are compiled into one matcher, scanned once
+        self._filename_matcher = PatternMatcher(
+            [(f"negative:{name}", rule.pattern, rule.is_regex) for name, rule in self.negative_rules.items()] +
+            [(f"keyword:{keyword}", keyword, False) for keyword in self.FILENAME_KEYWORDS] +
+            [('year', r'(19|20)\d{2}', True)]
+        )
+        self._content_matcher = PatternMatcher(
+            [(f"positive:{name}", rule.pattern, rule.is_regex) for name, rule in self.positive_rules.items()] +
+            [(f"keyword:{keyword}", keyword, False) for keyword in self.ACADEMIC_KEYWORDS]
+        )
+        
+        self.stage_bounds = self._stage_bounds()
     
-    def filter_pdf(self, pdf_path: Path) -> FilterResult:
+    def _stage_bounds(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Minimum and maximum score each funnel stage can contribute.
+        
+        Derived from the feature weights; they decide when later stages can
+        be skipped.
+        
+        Returns:
+            Dictionary of stage name to (min_score, max_score)
+        """
+        bounds = {}
+        for stage, names in self.stage_features.items():
+            low = high = 0
+            remaining = set(names)
+            
+            # At most one feature of an exclusive group is set
+            for group in self.EXCLUSIVE_FEATURES:
+                if remaining.issuperset(group):
+                    weights = [self.feature_weights[name] for name in group]
+                    low += min(0, min(weights))
+                    high += max(0, max(weights))
+                    remaining.difference_update(group)
+            
+            for name in remaining:
+                contribution = self.feature_weights[name] * self.COUNT_FEATURE_LIMITS.get(name, 1)
+                low += min(0, contribution)
+                high += max(0, contribution)
+            
+            bounds[stage] = (low, high)
+        return bounds
+    
+    def _decided(self, score: float, remaining: Tuple[str, ...]) -> bool:
+        """
+        Check whether the remaining stages can still change the verdict.
+        
+        Args:
+            score: Score accumulated so far
+            remaining: Stages not yet run
+        
+        Returns:
+            True if the score is guaranteed to stay on one side of the threshold
+        """
+        if not self.academic_only:
+            return False
+        
+        highest = score + sum(self.stage_bounds[stage][1] for stage in remaining)
+        if highest < self.academic_threshold:
+            return True
+        
+        # A stage that can reject the file outright has to run before it is accepted
+        reject_scores = {'filename': self.filename_reject_score, 'size': self.size_reject_score}
+        if any(stage in reject_scores and self.stage_bounds[stage][0] <= reject_scores[stage]
+               for stage in remaining):
+            return False
+        
+        lowest = score + sum(self.stage_bounds[stage][0] for stage in remaining)
+        return lowest >= self.academic_threshold
+    
+    def fingerprint(self) -> str:
+        """
+        Fingerprint of every setting that affects the verdict.
+        
+        Cached verdicts are only valid for the same fingerprint.
+        
+        Returns:
+            Hex digest of the filter configuration
+        """
+        settings = {
+            'version': FILTER_VERSION,
+            'enabled': self.enabled,
+            'academic_only': self.academic_only,
+            'academic_threshold': self.academic_threshold,
+            'min_pages': self.min_pages,
+            'max_pages': self.max_pages,
+            'min_size_mb': self.min_size_mb,
+            'max_size_mb': self.max_size_mb,
+            'filename_reject_score': self.filename_reject_score,
+            'size_reject_score': self.size_reject_score,
+            'positive_rules': {name: asdict(rule) for name, rule in self.positive_rules.items()},
+            'negative_rules': {name: asdict(rule) for name, rule in self.negative_rules.items()},
+            'feature_weights': self.feature_weights,
+        }
+        return cache_key(json.dumps(settings, sort_keys=True))
+    
+    def filter_pdf(self, pdf_path: Path, session: Optional[PDFSession] = None) -> FilterResult:
         """
         Filter a PDF file using funnel approach.
         
         Args:
             pdf_path: Path to the PDF file
+            session: Optional shared PDF session reused by the metadata and content levels
             
         Returns:
             FilterResult with acceptance decision and details
@@ -163,16 +381,25 @@ class PDFFilter:
         
         score = 0
         reasons = []
-        details = {}
+        # Wall time of each level in milliseconds, for finding the slow one
+        timer = StageTimer()
+        details = {'timings': timer.timings}
+        
+        # Level 0: Header and trailer bytes (no PDF parsing)
+        sniff_verdict = self._sniff_file(pdf_path, reasons, details)
+        timer.lap('sniff')
+        if sniff_verdict is not None:
+            return sniff_verdict
         
         # Level 1: Filename check (fastest)
         filename_score, filename_reasons = self._check_filename(pdf_path)
+        timer.lap('filename')
         score += filename_score
         reasons.extend(filename_reasons)
         details['filename_score'] = filename_score
         
         # Early rejection for very negative filename scores
-        if filename_score <= -100:
+        if filename_score <= self.filename_reject_score:
             return FilterResult(
                 accepted=False,
                 score=score,
@@ -180,14 +407,18 @@ class PDFFilter:
                 details=details
             )
         
+        if self._decided(score, self.STAGES[1:]):
+            return self._verdict(score, reasons, details, skipped=self.STAGES[1:])
+        
         # Level 2: File size check (fast)
         size_score, size_reasons = self._check_file_size(pdf_path)
+        timer.lap('size')
         score += size_score
         reasons.extend(size_reasons)
         details['size_score'] = size_score
         
         # Early rejection for invalid file sizes
-        if size_score <= -50:
+        if size_score <= self.size_reject_score:
             return FilterResult(
                 accepted=False,
                 score=score,
@@ -195,26 +426,49 @@ class PDFFilter:
                 details=details
             )
         
+        if self._decided(score, self.STAGES[2:]):
+            return self._verdict(score, reasons, details, skipped=self.STAGES[2:])
+        
+        skipped: Tuple[str, ...] = ()
         try:
-            # Level 3: PDF metadata check (medium speed)
-            metadata_score, metadata_reasons = self._check_metadata(pdf_path)
-            score += metadata_score
-            reasons.extend(metadata_reasons)
-            details['metadata_score'] = metadata_score
-            
-            # Level 4: Quick content scan (slower)
-            content_score, content_reasons = self._quick_content_scan(pdf_path)
-            score += content_score
-            reasons.extend(content_reasons)
-            details['content_score'] = content_score
+            # Levels 3 and 4 share one document handle, opened only now
+            with PDFSession.borrow(pdf_path, session) as pdf:
+                # Level 3: PDF metadata check (medium speed), timed with the open
+                metadata_score, metadata_reasons = self._check_metadata(pdf_path, pdf)
+                timer.lap('metadata')
+                score += metadata_score
+                reasons.extend(metadata_reasons)
+                details['metadata_score'] = metadata_score
+                
+                # Level 4: Quick content scan (slower), stopped once acceptance is certain
+                if self._decided(score, self.STAGES[3:]):
+                    skipped = self.STAGES[3:]
+                else:
+                    content_score, content_reasons = self._quick_content_scan(
+                        pdf_path, pdf,
+                        accept_at=self.academic_threshold - score if self.academic_only else None
+                    )
+                    timer.lap('content')
+                    score += content_score
+                    reasons.extend(content_reasons)
+                    details['content_score'] = content_score
             
         except Exception as e:
             logger.warning(f"Error analyzing PDF {pdf_path}: {e}")
             reasons.append(f"Analysis error: {str(e)}")
             details['error'] = str(e)
+            timer.lap('content' if 'metadata_score' in details else 'metadata')
         
-        # Final decision
+        return self._verdict(score, reasons, details, skipped=skipped)
+    
+    def _verdict(self, score: float, reasons: List[str], details: Dict[str, Any],
+                 skipped: Tuple[str, ...] = ()) -> FilterResult:
+        """Apply the threshold to the accumulated score."""
         details['total_score'] = score
+        if skipped:
+            details['skipped_stages'] = list(skipped)
+            reasons.append(f"Skipped (verdict already decided): {', '.join(skipped)}")
+        
         accepted = not self.academic_only or score >= self.academic_threshold
         
         if not accepted:
@@ -229,49 +483,129 @@ class PDFFilter:
             details=details
         )
     
+    def _sniff_file(self, pdf_path: Path, reasons: List[str],
+                    details: Dict[str, Any]) -> Optional[FilterResult]:
+        """
+        Reject non-PDFs and defer files still being written.
+        
+        Returns:
+            FilterResult if the file is decided without further levels, else None
+        """
+        try:
+            sniff = sniff_pdf(pdf_path)
+            age = time.time() - pdf_path.stat().st_mtime
+        except Exception as e:
+            # Unreadable files are reported by the later levels
+            logger.debug(f"Could not sniff {pdf_path}: {e}")
+            return None
+        
+        details['sniff'] = sniff.status
+        
+        if sniff.status == 'not_pdf':
+            return FilterResult(
+                accepted=False,
+                score=-100,
+                reasons=[f"Not a PDF: {sniff.reason}"],
+                details=details
+            )
+        
+        if sniff.status == 'truncated':
+            if age < self.incomplete_grace_seconds:
+                # Probably still downloading; the verdict is not final
+                details['deferred'] = sniff.reason
+                return FilterResult(
+                    accepted=False,
+                    score=0,
+                    reasons=[f"Deferred: {sniff.reason}"],
+                    details=details
+                )
+            # Left as is for long enough: let PyMuPDF try to repair it
+            reasons.append(f"File may be damaged: {sniff.reason}")
+        
+        return None
+    
+    def _weighted(self, features: Dict[str, float]) -> float:
+        """Score of a set of features under the current weights."""
+        return sum(self.feature_weights[name] * value for name, value in features.items())
+    
+    def extract_features(self, pdf_path: Path, session: Optional[PDFSession] = None) -> Dict[str, float]:
+        """
+        Extract every scoring feature of a PDF, without early termination.
+        
+        The score filter_pdf would give the file (without skipped stages) is
+        the dot product of these features with feature_weights.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            session: Optional shared PDF session
+        
+        Returns:
+            Dictionary of feature name to value (missing features are 0)
+        """
+        features = {}
+        features.update(self._filename_features(pdf_path)[0])
+        features.update(self._size_features(pdf_path)[0])
+        try:
+            with PDFSession.borrow(pdf_path, session) as pdf:
+                features.update(self._metadata_features(pdf_path, pdf)[0])
+                features.update(self._content_features(pdf_path, pdf)[0])
+        except Exception as e:
+            logger.warning(f"Error analyzing PDF {pdf_path}: {e}")
+        return features
+    
     def _check_filename(self, pdf_path: Path) -> Tuple[float, List[str]]:
         """Check filename against patterns."""
-        score = 0
+        features, reasons = self._filename_features(pdf_path)
+        return self._weighted(features), reasons
+    
+    def _filename_features(self, pdf_path: Path) -> Tuple[Dict[str, float], List[str]]:
+        """Filename features: matched rules, academic keywords and a year."""
+        features = {}
         reasons = []
-        filename_lower = pdf_path.name.lower()
+        found = self._filename_matcher.scan(pdf_path.name.lower())
         
         # Check negative patterns
         for rule_name, rule in self.negative_rules.items():
-            if rule.pattern in filename_lower:
-                score += rule.score
+            if f"negative:{rule_name}" in found:
+                features[f"negative:{rule_name}"] = 1
                 reasons.append(f"Filename: {rule.description}")
         
         # Check positive patterns
-        for keyword in ['paper', 'article', 'journal', 'conference', 'proceedings']:
-            if keyword in filename_lower:
-                score += 5
+        for keyword in self.FILENAME_KEYWORDS:
+            if f"keyword:{keyword}" in found:
+                features['filename_keywords'] = features.get('filename_keywords', 0) + 1
                 reasons.append(f"Filename: Contains '{keyword}'")
         
         # Check for year patterns (common in academic papers)
-        if re.search(r'(19|20)\d{2}', pdf_path.name):
-            score += 5
+        if 'year' in found:
+            features['filename_year'] = 1
             reasons.append("Filename: Contains year pattern")
         
-        return score, reasons
+        return features, reasons
     
     def _check_file_size(self, pdf_path: Path) -> Tuple[float, List[str]]:
         """Check file size."""
-        score = 0
+        features, reasons = self._size_features(pdf_path)
+        return self._weighted(features), reasons
+    
+    def _size_features(self, pdf_path: Path) -> Tuple[Dict[str, float], List[str]]:
+        """File size features."""
+        features = {}
         reasons = []
         
         try:
             size_mb = pdf_path.stat().st_size / (1024 * 1024)
             
             if size_mb < self.min_size_mb:
-                score -= 50
+                features['size_too_small'] = 1
                 reasons.append(f"File too small: {size_mb:.1f}MB < {self.min_size_mb}MB")
             elif size_mb > self.max_size_mb:
-                score -= 30
+                features['size_too_large'] = 1
                 reasons.append(f"File too large: {size_mb:.1f}MB > {self.max_size_mb}MB")
             else:
                 # Optimal size range for academic papers (0.5-10MB)
                 if 0.5 <= size_mb <= 10:
-                    score += 10
+                    features['size_optimal'] = 1
                     reasons.append(f"File size optimal: {size_mb:.1f}MB")
                 else:
                     reasons.append(f"File size: {size_mb:.1f}MB")
@@ -280,32 +614,39 @@ class PDFFilter:
             logger.warning(f"Error checking file size: {e}")
             reasons.append("Could not check file size")
         
-        return score, reasons
+        return features, reasons
     
-    def _check_metadata(self, pdf_path: Path) -> Tuple[float, List[str]]:
+    def _check_metadata(self, pdf_path: Path,
+                        session: Optional[PDFSession] = None) -> Tuple[float, List[str]]:
         """Check PDF metadata."""
-        score = 0
+        features, reasons = self._metadata_features(pdf_path, session)
+        return self._weighted(features), reasons
+    
+    def _metadata_features(self, pdf_path: Path,
+                           session: Optional[PDFSession] = None) -> Tuple[Dict[str, float], List[str]]:
+        """Page count and document metadata features."""
+        features = {}
         reasons = []
         
         try:
-            with fitz.open(pdf_path) as doc:
-                metadata = doc.metadata
+            with PDFSession.borrow(pdf_path, session) as pdf:
+                metadata = pdf.metadata
                 
                 # Check page count
-                page_count = len(doc)
+                page_count = pdf.page_count
                 if page_count < self.min_pages:
-                    score -= 30
+                    features['pages_too_few'] = 1
                     reasons.append(f"Too few pages: {page_count} < {self.min_pages}")
                 elif page_count > self.max_pages:
-                    score -= 20
+                    features['pages_too_many'] = 1
                     reasons.append(f"Too many pages: {page_count} > {self.max_pages}")
                 else:
                     # Typical academic paper range (8-40 pages)
                     if 8 <= page_count <= 40:
-                        score += 15
+                        features['pages_typical'] = 1
                         reasons.append(f"Page count typical: {page_count}")
                     else:
-                        score += 5
+                        features['pages_other'] = 1
                         reasons.append(f"Page count: {page_count}")
                 
                 # Check producer/creator for academic tools
@@ -314,86 +655,137 @@ class PDFFilter:
                 
                 for tool in self.ACADEMIC_PUBLISHERS:
                     if tool in producer or tool in creator:
-                        score += 20
+                        features['academic_tool'] = 1
                         reasons.append(f"Academic tool detected: {tool}")
                         break
                 
                 # Check for title
                 if metadata.get('title'):
-                    score += 5
+                    features['metadata_title'] = 1
                     reasons.append("Has metadata title")
                 
                 # Check for author
                 if metadata.get('author'):
-                    score += 5
+                    features['metadata_author'] = 1
                     reasons.append("Has metadata author")
                     
         except Exception as e:
             logger.warning(f"Error checking metadata: {e}")
             reasons.append("Could not check metadata")
         
-        return score, reasons
+        return features, reasons
     
-    def _quick_content_scan(self, pdf_path: Path) -> Tuple[float, List[str]]:
-        """Quick scan of first and last few pages."""
-        score = 0
+    def _quick_content_scan(self, pdf_path: Path,
+                            session: Optional[PDFSession] = None,
+                            accept_at: Optional[float] = None) -> Tuple[float, List[str]]:
+        """
+        Quick scan of first and last few pages.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            session: Optional shared PDF session
+            accept_at: Content score that guarantees acceptance; pages are no
+                longer extracted once it is certain to be reached
+        """
+        features, reasons = self._content_features(pdf_path, session, accept_at)
+        return self._weighted(features), reasons
+    
+    def _content_features(self, pdf_path: Path, session: Optional[PDFSession] = None,
+                          accept_at: Optional[float] = None) -> Tuple[Dict[str, float], List[str]]:
+        """Content features: matched rules and academic keywords of the first and last pages."""
+        features = {}
         reasons = []
         
         try:
-            with fitz.open(pdf_path) as doc:
+            with PDFSession.borrow(pdf_path, session) as pdf:
+                page_count = pdf.page_count
+                
                 # Scan first 3 pages and last 2 pages
                 pages_to_scan = []
-                if len(doc) > 0:
-                    pages_to_scan.extend(range(min(3, len(doc))))
-                if len(doc) > 5:
-                    pages_to_scan.extend(range(len(doc) - 2, len(doc)))
+                if page_count > 0:
+                    pages_to_scan.extend(range(min(3, page_count)))
+                if page_count > 5:
+                    pages_to_scan.extend(range(page_count - 2, page_count))
                 
-                text_sample = ""
-                for page_num in pages_to_scan:
+                # Patterns do not span pages, so pages are matched one at a time
+                found: Set[str] = set()
+                for scanned, page_num in enumerate(pages_to_scan, 1):
                     try:
-                        page = doc[page_num]
-                        text_sample += page.get_text().lower() + "\n"
+                        found |= self._content_matcher.scan(pdf.page_texts.get(page_num).lower())
                     except:
                         continue
+                    
+                    if accept_at is not None and scanned < len(pages_to_scan):
+                        if self._lowest_content_score(found) >= accept_at:
+                            reasons.append(f"Content: scan stopped after {scanned} of {len(pages_to_scan)} pages")
+                            break
                 
-                # Check positive patterns
-                for rule_name, rule in self.positive_rules.items():
-                    if rule.is_regex:
-                        if re.search(rule.pattern, text_sample, re.IGNORECASE):
-                            score += rule.score
-                            reasons.append(f"Content: {rule.description}")
-                    else:
-                        if rule.pattern in text_sample:
-                            score += rule.score
-                            reasons.append(f"Content: {rule.description}")
-                
-                # Check for academic keywords
-                academic_keywords = [
-                    'abstract', 'introduction', 'methodology', 'results',
-                    'discussion', 'conclusion', 'references', 'bibliography',
-                    'keywords', 'corresponding author', 'doi:', 'issn',
-                    'received:', 'accepted:', 'published:'
-                ]
-                
-                found_keywords = []
-                for keyword in academic_keywords:
-                    if keyword in text_sample:
-                        found_keywords.append(keyword)
-                
-                if len(found_keywords) >= 3:
-                    score += 10 * len(found_keywords)
-                    reasons.append(f"Multiple academic keywords: {', '.join(found_keywords[:5])}")
+                features, content_reasons = self._found_content_features(found)
+                reasons[:0] = content_reasons
                     
         except Exception as e:
             logger.warning(f"Error scanning content: {e}")
             reasons.append("Could not scan content")
         
-        return score, reasons
+        return features, reasons
+    
+    def _lowest_content_score(self, found: Set[str]) -> float:
+        """
+        Lowest content score the scan can still end with, given the patterns found so far.
+        
+        Found patterns stay found; rules not found yet can only lower the score
+        by their negative weights. The keyword count only grows, so a negative
+        content_keywords weight can still take every keyword.
+        
+        Args:
+            found: Pattern IDs found on the pages scanned so far
+        
+        Returns:
+            Lower bound of the final content score
+        """
+        features, _ = self._found_content_features(found)
+        keyword_weight = self.feature_weights['content_keywords']
+        keywords = features.pop('content_keywords', 0)
+        
+        lowest = self._weighted(features) + min(
+            keyword_weight * keywords,
+            keyword_weight * self.COUNT_FEATURE_LIMITS['content_keywords']
+        )
+        lowest += sum(
+            min(0, self.feature_weights[f"positive:{rule_name}"])
+            for rule_name in self.positive_rules
+            if f"positive:{rule_name}" not in found
+        )
+        return lowest
+    
+    def _found_content_features(self, found: Set[str]) -> Tuple[Dict[str, float], List[str]]:
+        """Content features of the patterns found by the content scan."""
+        features = {}
+        reasons = []
+        
+        # Check positive patterns
+        for rule_name, rule in self.positive_rules.items():
+            if f"positive:{rule_name}" in found:
+                features[f"positive:{rule_name}"] = 1
+                reasons.append(f"Content: {rule.description}")
+        
+        # Check for academic keywords
+        found_keywords = [
+            keyword for keyword in self.ACADEMIC_KEYWORDS
+            if f"keyword:{keyword}" in found
+        ]
+        
+        if len(found_keywords) >= 3:
+            features['content_keywords'] = len(found_keywords)
+            reasons.append(f"Multiple academic keywords: {', '.join(found_keywords[:5])}")
+        
+        return features, reasons
     
     def _load_scoring_rules(self, custom_rules: Dict[str, Any], 
                            default_rules: Dict[str, ScoringRule]) -> Dict[str, ScoringRule]:
         """Load and merge custom scoring rules with defaults."""
-        rules = default_rules.copy()
+        # Copy the rules so score overrides do not leak into the class defaults
+        rules = {name: replace(rule) for name, rule in default_rules.items()}
         
         for rule_name, rule_config in custom_rules.items():
             if isinstance(rule_config, (int, float)):
@@ -409,4 +801,18 @@ class PDFFilter:
                     is_regex=rule_config.get('is_regex', False)
                 )
         
-        return rules
\ No newline at end of file
+        return rules
+    
+    def _load_feature_weights(self, custom_weights: Dict[str, Any]) -> Dict[str, float]:
+        """Merge custom feature weights with the defaults and the rule scores."""
+        weights: Dict[str, float] = dict(self.DEFAULT_FEATURE_WEIGHTS)
+        weights.update({f"negative:{name}": rule.score for name, rule in self.negative_rules.items()})
+        weights.update({f"positive:{name}": rule.score for name, rule in self.positive_rules.items()})
+        
+        for name, weight in custom_weights.items():
+            if name not in weights:
+                logger.warning(f"Unknown filter feature in scoring_rules.weights: {name}")
+                continue
+            weights[name] = float(weight)
+        
+        return weights
@@ -22,12 +22,21 @@ from watchdog.events import FileSystemEventHandler, FileCreatedEvent
 from .pdf_extractor import PDFExtractor
 from .paper_abstractor import PaperAbstractor
 from .note_formatter import NoteFormatter
+from .note_stream import NoteStream
 from .pdf_filter import PDFFilter
+from .extraction_pool import ExtractionPool, PreparedPDF
+from .verdict_cache import VerdictCache
+from .filter_report import should_quarantine
 from .utils.path_resolver import PathResolver, create_resolver
+from .utils.timing import TimingHistogram
+from .utils.quarantine import quarantine_pdf
 from .utils.note_utils import extract_yaml_frontmatter, generate_filename_from_yaml, handle_rename, create_short_title, clean_filename
 
 logger = logging.getLogger(__name__)
 
+# Delay before a file deferred as incomplete is checked again
+DEFERRED_RETRY_SECONDS = 10
+
 
 class PDFEventHandler(FileSystemEventHandler):
     """Handle file system events for PDF files."""
@@ -124,6 +133,17 @@ class PDFMonitor:
         self.note_formatter = NoteFormatter(config)
         self.pdf_filter = PDFFilter(config)
         
+        # CPU-bound filtering, extraction and rendering run on a separate process pool
+        self.extraction_pool = ExtractionPool(config)
+        
+        # Filter verdicts of unchanged files are reused across scans and restarts
+        self.verdict_cache: Optional[VerdictCache] = None
+        if self.use_cache and self.pdf_filter.enabled:
+            self.verdict_cache = VerdictCache(
+                self.cache_dir / 'filter_verdicts.json',
+                self.pdf_filter.fingerprint()
+            )
+        
         # Processing queue and state
         self.processing_queue: asyncio.Queue = asyncio.Queue()
         self.processed_files: Set[str] = self._load_processed_files()
@@ -131,6 +151,13 @@ class PDFMonitor:
         self.observer: Optional[Observer] = None
         self.workers_tasks: List[asyncio.Task] = []
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Files still being written, checked again later
+        self.deferred_files: Set[str] = set()
+        self.retry_tasks: Set[asyncio.Task] = set()
+        
+        # Wall time of each filter level over this run
+        self.filter_timings = TimingHistogram()
     
     async def start(self, daemon: bool = False):
         """
@@ -228,16 +255,23 @@ class PDFMonitor:
             self.observer.stop()
             self.observer.join()
         
-        # Cancel worker tasks
-        for task in self.workers_tasks:
+        # Cancel worker and deferred retry tasks
+        for task in [*self.workers_tasks, *self.retry_tasks]:
             task.cancel()
         
         # Wait for tasks to complete
-        await asyncio.gather(*self.workers_tasks, return_exceptions=True)
+        await asyncio.gather(*self.workers_tasks, *self.retry_tasks, return_exceptions=True)
+        
+        # Stop extraction processes and close LLM connections
+        self.extraction_pool.shutdown()
+        await self.paper_abstractor.aclose()
         
-        # Save processed files cache
+        # Save processed files and filter verdict caches
         self._save_processed_files()
+        if self.verdict_cache is not None:
+            self.verdict_cache.save()
         
+        self._log_filter_timings()
         logger.info("PDF monitor stopped")
     
     async def add_to_queue(self, pdf_path: Path):
@@ -247,6 +281,10 @@ class PDFMonitor:
             logger.debug(f"Skipping already processed file: {pdf_path}")
             return
         
+        # Skip unchanged files the filter already rejected
+        if self._is_cached_reject(pdf_path):
+            return
+        
         # Wait a bit for file to be fully written
         await asyncio.sleep(2)
         
@@ -296,118 +334,223 @@ class PDFMonitor:
             Path to the generated note, or None if processing failed
         """
         try:
-            # Apply PDF filter unless forced
-            if not force and self.pdf_filter.enabled:
-                filter_result = self.pdf_filter.filter_pdf(pdf_path)
-                
-                if not filter_result.accepted:
-                    logger.info(f"Filtered out: {pdf_path}")
-                    for reason in filter_result.reasons:
-                        logger.info(f"  - {reason}")
-                    logger.info(f"  Total score: {filter_result.score}")
-                    
-                    # Handle quarantine if enabled
-                    if self.config.get('pdf_filter', {}).get('quarantine_enabled', False):
-                        quarantine_folder = self.config.get('pdf_filter', {}).get('quarantine_folder')
-                        if quarantine_folder:
-                            await self._quarantine_file(pdf_path, Path(quarantine_folder).expanduser(), filter_result)
-                    
-                    return None
-                else:
-                    logger.info(f"Accepted: {pdf_path} (score: {filter_result.score})")
+            prepared = await self.prepare_accepted(pdf_path, force)
+            if prepared is None:
+                return None
             
             logger.info(f"Processing: {pdf_path}")
+            pdf_data = prepared.pdf_data
             
-            # Extract PDF data
-            pdf_data = self.pdf_extractor.extract(pdf_path)
-            
-            # Generate abstract
-            abstract_data = await self.paper_abstractor.generate_abstract(pdf_data)
-            
-            # Format note
-            note_content = self.note_formatter.format_note(pdf_data, abstract_data, pdf_path)
-            
-            # Step 1: Save with temporary filename
-            temp_filename = f"temp_{uuid.uuid4()}.md"
-            temp_path = None
+            # Stream the note into the output folder while it is generated
+            stream = None
+            if self.paper_abstractor.stream_output:
+                stream = NoteStream.for_paper(
+                    Path(self.output_path), pdf_data, pdf_path, self.paper_abstractor, self.note_formatter
+                )
             
             try:
-                # Resolve output path with placeholders if needed
-                if hasattr(self, 'path_resolver') and hasattr(self, 'output_path_template'):
-                    # Use YAML data for context instead of PDF metadata
-                    yaml_data = extract_yaml_frontmatter(note_content)
-                    context = {
-                        'author': yaml_data.get('authors', ['Unknown'])[0].split(',')[0].strip() if yaml_data.get('authors') else 'Unknown',
-                        'paper_year': yaml_data.get('year-published', 'Unknown'),
-                        'title': yaml_data.get('title', pdf_path.stem)[:30],
-                    }
-                    current_output_path = self.path_resolver.resolve_with_placeholders(
-                        self.output_path_template, context
-                    )
-                    current_output_path.mkdir(parents=True, exist_ok=True)
-                    temp_path = current_output_path / temp_filename
-                else:
-                    temp_path = Path(self.output_path) / temp_filename
-                
-                # Write temporary file
-                async with aiofiles.open(temp_path, 'w', encoding='utf-8') as f:
-                    await f.write(note_content)
-                
-                # Step 2: Extract YAML frontmatter
-                yaml_data = extract_yaml_frontmatter(note_content)
-                
-                # Step 3: Generate final filename from YAML
-                final_filename = generate_filename_from_yaml(yaml_data, self.config)
-                final_path = temp_path.parent / f"{final_filename}.md"
-                
-                # Step 4: Rename with conflict handling
-                note_path = handle_rename(temp_path, final_path)
-                temp_path = None  # Mark as successfully renamed
+                # Generate abstract
+                abstract_data = await self.paper_abstractor.generate_abstract(
+                    pdf_data, page_images=prepared.page_images, stream=stream
+                )
                 
-            except Exception as e:
-                # Clean up temp file if it exists
-                if temp_path and temp_path.exists():
-                    try:
-                        temp_path.unlink()
-                    except:
-                        pass
+                # Format note
+                note_content = self.note_formatter.format_note(pdf_data, abstract_data, pdf_path)
+            except Exception:
+                if stream is not None:
+                    await stream.keep_partial(pdf_path)
                 raise
             
-            logger.info(f"Created note: {note_path}")
-            
-            # Mark as processed
-            if self.use_cache:
-                self.processed_files.add(str(pdf_path))
-                self._save_processed_files()
-            
-            return note_path
+            return await self.write_note(pdf_path, note_content, stream)
             
         except Exception as e:
             logger.error(f"Failed to process {pdf_path}: {e}", exc_info=True)
             return None
     
-    async def _quarantine_file(self, pdf_path: Path, quarantine_folder: Path, filter_result):
-        """Move filtered file to quarantine folder."""
+    async def prepare_accepted(self, pdf_path: Path, force: bool = False) -> Optional[PreparedPDF]:
+        """
+        Filter, extract and render a PDF, keeping only accepted papers.
+        
+        Rejected files are logged (and quarantined if enabled) and incomplete
+        files are deferred.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            force: Skip the filter
+        
+        Returns:
+            Prepared PDF, or None if the file was not accepted
+        """
+        # An unchanged file keeps its previous verdict; only accepted ones are processed
+        cached_verdict = None
+        if not force and self.verdict_cache is not None:
+            cached_verdict = self.verdict_cache.get(pdf_path)
+            if cached_verdict is not None and not cached_verdict.accepted:
+                logger.info(f"Filtered out (cached verdict): {pdf_path} (score: {cached_verdict.score})")
+                return None
+        
+        # Filter, extract and render on the extraction pool (one PDF session per file)
+        prepared = await self.extraction_pool.prepare(
+            pdf_path, force=force or cached_verdict is not None
+        )
+        
+        # Apply PDF filter unless forced
+        filter_result = prepared.filter_result or cached_verdict
+        if prepared.filter_result is not None:
+            self.filter_timings.add(prepared.filter_result.details.get('timings', {}))
+            if self.verdict_cache is not None:
+                self.verdict_cache.put(pdf_path, prepared.filter_result)
+        if filter_result is not None and filter_result.details.get('deferred'):
+            self._defer(pdf_path, filter_result.details['deferred'])
+            return None
+        self.deferred_files.discard(str(pdf_path))
+        
+        if filter_result is not None:
+            if not filter_result.accepted:
+                logger.info(f"Filtered out: {pdf_path}")
+                for reason in filter_result.reasons:
+                    logger.info(f"  - {reason}")
+                logger.info(f"  Total score: {filter_result.score}")
+                
+                # Handle quarantine if enabled (not for files that could not be analyzed)
+                if (self.config.get('pdf_filter', {}).get('quarantine_enabled', False)
+                        and should_quarantine(filter_result)):
+                    quarantine_folder = self.config.get('pdf_filter', {}).get('quarantine_folder')
+                    if quarantine_folder:
+                        await self._quarantine_file(pdf_path, Path(quarantine_folder).expanduser(), filter_result)
+                
+                return None
+            else:
+                logger.info(f"Accepted: {pdf_path} (score: {filter_result.score})")
+        
+        return prepared
+    
+    async def write_note(self, pdf_path: Path, note_content: str,
+                         stream: Optional[NoteStream] = None) -> Path:
+        """
+        Save a note under the file name built from its frontmatter.
+        
+        The note is written to a temporary file first and then renamed, so
+        that Obsidian never sees a half-written note under its final name.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            note_content: Formatted note
+            stream: Note the response was streamed into, if any
+        
+        Returns:
+            Path to the note
+        """
+        # Step 1: Save with temporary filename
+        temp_filename = f"temp_{uuid.uuid4()}.md"
+        temp_path = None
+        
         try:
-            quarantine_folder.mkdir(parents=True, exist_ok=True)
+            # Resolve output path with placeholders if needed
+            if hasattr(self, 'path_resolver') and hasattr(self, 'output_path_template'):
+                # Use YAML data for context instead of PDF metadata
+                yaml_data = extract_yaml_frontmatter(note_content)
+                context = {
+                    'author': yaml_data.get('authors', ['Unknown'])[0].split(',')[0].strip() if yaml_data.get('authors') else 'Unknown',
+                    'paper_year': yaml_data.get('year-published', 'Unknown'),
+                    'title': yaml_data.get('title', pdf_path.stem)[:30],
+                }
+                current_output_path = self.path_resolver.resolve_with_placeholders(
+                    self.output_path_template, context
+                )
+                current_output_path.mkdir(parents=True, exist_ok=True)
+                temp_path = current_output_path / temp_filename
+            else:
+                temp_path = Path(self.output_path) / temp_filename
             
-            # Create info file with filter details
-            info_path = quarantine_folder / f"{pdf_path.stem}_filter_info.txt"
-            info_content = f"File: {pdf_path.name}\n"
-            info_content += f"Filtered at: {datetime.now().isoformat()}\n"
-            info_content += f"Score: {filter_result.score}\n"
-            info_content += f"Threshold: {self.pdf_filter.academic_threshold}\n"
-            info_content += "\nReasons:\n"
-            for reason in filter_result.reasons:
-                info_content += f"  - {reason}\n"
+            # Write temporary file (a streamed note already holds the response)
+            if stream is not None:
+                await stream.finish(note_content, temp_path)
+            else:
+                async with aiofiles.open(temp_path, 'w', encoding='utf-8') as f:
+                    await f.write(note_content)
             
-            async with aiofiles.open(info_path, 'w', encoding='utf-8') as f:
-                await f.write(info_content)
+            # Step 2: Extract YAML frontmatter
+            yaml_data = extract_yaml_frontmatter(note_content)
             
-            logger.info(f"Quarantine info saved: {info_path}")
+            # Step 3: Generate final filename from YAML
+            final_filename = generate_filename_from_yaml(yaml_data, self.config)
+            final_path = temp_path.parent / f"{final_filename}.md"
             
+            # Step 4: Rename with conflict handling
+            note_path = handle_rename(temp_path, final_path)
+            temp_path = None  # Mark as successfully renamed
+        
         except Exception as e:
-            logger.warning(f"Failed to quarantine {pdf_path}: {e}")
+            # Clean up temp file if it exists
+            if temp_path and temp_path.exists():
+                try:
+                    temp_path.unlink()
+                except:
+                    pass
+            if stream is not None:
+                await stream.keep_partial(pdf_path)
+            raise
+        
+        logger.info(f"Created note: {note_path}")
+        
+        # Mark as processed
+        if self.use_cache:
+            self.processed_files.add(str(pdf_path))
+            self._save_processed_files()
+        
+        return note_path
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Statistics of the current run.
+        
+        Returns:
+            Dictionary with file counts, the current LLM concurrency limit and
+            the filter level timing summary (stage -> count, total_ms, p50, p95, p99)
+        """
+        return {
+            'processed_files': len(self.processed_files),
+            'queued_files': self.processing_queue.qsize(),
+            'deferred_files': len(self.deferred_files),
+            'llm_concurrency': self.paper_abstractor.concurrency.current_limit,
+            'filter_timings': self.filter_timings.summary(),
+        }
+    
+    def _log_filter_timings(self):
+        """Log the filter level timing percentiles of this run."""
+        for stage, stats in self.filter_timings.summary().items():
+            logger.info(
+                f"Filter timing {stage}: {stats['count']} files, "
+                f"p50 {stats['p50']:.1f}ms, p95 {stats['p95']:.1f}ms, p99 {stats['p99']:.1f}ms"
+            )
+    
+    def _defer(self, pdf_path: Path, reason: str):
+        """Check an incomplete file again later instead of filtering it out."""
+        if str(pdf_path) not in self.deferred_files:
+            logger.info(f"Deferred (file incomplete): {pdf_path} - {reason}")
+            self.deferred_files.add(str(pdf_path))
+        else:
+            logger.debug(f"Still incomplete: {pdf_path} - {reason}")
+        
+        # Only the watch loop retries; batch runs just report the file
+        if self.is_running:
+            task = asyncio.create_task(self._requeue_later(pdf_path))
+            self.retry_tasks.add(task)
+            task.add_done_callback(self.retry_tasks.discard)
+    
+    async def _requeue_later(self, pdf_path: Path):
+        """Put a deferred file back on the queue after a delay."""
+        await asyncio.sleep(DEFERRED_RETRY_SECONDS)
+        if self.is_running and pdf_path.exists():
+            await self.processing_queue.put(pdf_path)
+    
+    async def _quarantine_file(self, pdf_path: Path, quarantine_folder: Path, filter_result):
+        """Move filtered file to quarantine folder."""
+        await asyncio.to_thread(
+            quarantine_pdf, pdf_path, quarantine_folder, filter_result.score,
+            filter_result.reasons, self.pdf_filter.academic_threshold
+        )
     
     async def _process_queue_worker(self, worker_id: int):
         """Worker task to process PDFs from the queue."""
@@ -457,11 +600,11 @@ class PDFMonitor:
             if not any(f.match(p) for p in self.ignore_patterns)
         ]
         
-        # Filter out already processed files
+        # Filter out already processed files and unchanged rejects
         if self.use_cache:
             pdf_files = [
                 f for f in pdf_files
-                if str(f) not in self.processed_files
+                if str(f) not in self.processed_files and not self._is_cached_reject(f)
             ]
         
         logger.info(f"Found {len(pdf_files)} unprocessed PDF files")
@@ -470,6 +613,16 @@ class PDFMonitor:
         for pdf_file in pdf_files:
             await self.add_to_queue(pdf_file)
     
+    def _is_cached_reject(self, pdf_path: Path) -> bool:
+        """Check whether an unchanged file was already rejected by the filter."""
+        if self.verdict_cache is None:
+            return False
+        verdict = self.verdict_cache.get(pdf_path)
+        if verdict is not None and not verdict.accepted:
+            logger.debug(f"Skipping previously rejected file: {pdf_path}")
+            return True
+        return False
+    
     def _load_processed_files(self) -> Set[str]:
         """Load processed files cache."""
         if not self.use_cache:
@@ -501,19 +654,17 @@ class PDFMonitor:
         except Exception as e:
             logger.warning(f"Failed to save cache: {e}")
     
-    async def batch_process(self, folder: Path, recursive: bool = False) -> List[Path]:
+    def find_pdf_files(self, folder: Path, recursive: bool = False) -> List[Path]:
         """
-        Batch process all PDFs in a folder.
+        PDF files of a folder matching the watch patterns.
         
         Args:
-            folder: Folder to process
-            recursive: Process subfolders recursively
+            folder: Folder to search
+            recursive: Search subfolders recursively
             
         Returns:
-            List of generated note paths
+            List of PDF paths, without those matching the ignore patterns
         """
-        logger.info(f"Batch processing folder: {folder}")
-        
         # Find PDF files
         pdf_files = []
         for pattern in self.patterns:
@@ -523,11 +674,25 @@ class PDFMonitor:
                 pdf_files.extend(folder.glob(pattern))
         
         # Filter out ignored patterns
-        pdf_files = [
+        return [
             f for f in pdf_files
             if not any(f.match(p) for p in self.ignore_patterns)
         ]
+    
+    async def batch_process(self, folder: Path, recursive: bool = False) -> List[Path]:
+        """
+        Batch process all PDFs in a folder.
+        
+        Args:
+            folder: Folder to process
+            recursive: Process subfolders recursively
         
+        Returns:
+            List of generated note paths
+        """
+        logger.info(f"Batch processing folder: {folder}")
+        
+        pdf_files = self.find_pdf_files(folder, recursive)
         logger.info(f"Found {len(pdf_files)} PDF files to process")
         
         # Process in batches
@@ -547,5 +712,9 @@ class PDFMonitor:
                 elif result:
                     results.append(result)
         
+        if self.verdict_cache is not None:
+            self.verdict_cache.save()
+        
+        self._log_filter_timings()
         logger.info(f"Batch processing complete. Generated {len(results)} notes")
         return results
\ No newline at end of file
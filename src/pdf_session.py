@@ -0,0 +1,106 @@
+"""
+PDF session module for Obsidian Abstractor.
+
+This module provides a session object that owns a single open PyMuPDF
+document and the facts derived from it (page count, metadata, page texts),
+so that the filter, extractor and image renderer can share one parse of
+each PDF file.
+"""
+
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import fitz  # PyMuPDF
+
+from .utils.page_text import PageTextCache
+
+logger = logging.getLogger(__name__)
+
+
+class PDFSession:
+    """Share one open PDF document across the processing pipeline."""
+    
+    def __init__(self, pdf_path: Path, doc: Optional[fitz.Document] = None):
+        """
+        Initialize PDF session.
+        
+        The document is opened lazily on first access, so stages that only
+        need the file name or size never pay for a parse.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            doc: Already opened document to wrap (not closed by the session)
+        """
+        self.pdf_path = pdf_path
+        self._doc = doc
+        self._owns_doc = doc is None
+        self._page_texts: Optional[PageTextCache] = None
+        self._metadata: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    @contextmanager
+    def borrow(cls, pdf_path: Path,
+               session: Optional['PDFSession'] = None) -> Iterator['PDFSession']:
+        """
+        Yield the given session, or a temporary one that is closed afterwards.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            session: Existing session to reuse, if any
+        
+        Yields:
+            PDFSession for the file
+        """
+        if session is not None:
+            yield session
+            return
+        
+        with fitz.open(pdf_path) as doc:
+            yield cls(pdf_path, doc=doc)
+    
+    @property
+    def doc(self) -> fitz.Document:
+        """Open document, opened on first access."""
+        if self._doc is None:
+            logger.debug(f"Opening PDF: {self.pdf_path}")
+            self._doc = fitz.open(self.pdf_path)
+        return self._doc
+    
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        return len(self.doc)
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Document metadata dictionary."""
+        if self._metadata is None:
+            self._metadata = self.doc.metadata or {}
+        return self._metadata
+    
+    @property
+    def page_texts(self) -> PageTextCache:
+        """Page text cache shared by every stage using this session."""
+        if self._page_texts is None:
+            self._page_texts = PageTextCache(self.doc)
+        return self._page_texts
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the underlying document has been opened."""
+        return self._doc is not None
+    
+    def close(self):
+        """Close the document if this session opened it."""
+        if self._doc is not None and self._owns_doc:
+            self._doc.close()
+        self._doc = None
+        self._page_texts = None
+    
+    def __enter__(self) -> 'PDFSession':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
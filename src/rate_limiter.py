@@ -0,0 +1,156 @@
+"""
+Rate limiting module for Obsidian Abstractor.
+
+This module provides an async token-bucket limiter enforcing requests per
+minute and tokens per minute for the LLM API. One limiter is shared by every
+worker of a process; callers are admitted in arrival order and without any
+delay while capacity is available.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Bucket refilled continuously at a per-minute rate up to a capacity."""
+    
+    def __init__(self, per_minute: float, capacity: float, now: float):
+        """
+        Initialize token bucket (full).
+        
+        Args:
+            per_minute: Refill rate per minute
+            capacity: Maximum level, i.e. the largest burst admitted at once
+            now: Current clock reading
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = now
+    
+    def refill(self, now: float):
+        """Add what has accumulated since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self, cost: float) -> float:
+        """
+        Seconds until the bucket can pay for a cost.
+        
+        Costs above the capacity only wait for a full bucket and leave it in
+        debt, so that oversized requests are delayed rather than refused.
+        """
+        needed = min(cost, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+    
+    def take(self, cost: float):
+        """Remove a cost from the bucket (may go below zero)."""
+        self.level -= cost
+    
+    def give_back(self, amount: float):
+        """Return an overestimated cost."""
+        self.level = min(self.capacity, self.level + amount)
+
+
+class RateLimiter:
+    """Async limiter for requests and tokens per minute with FIFO admission."""
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None,
+                 burst: int = 1, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            requests_per_minute: Requests admitted per minute (0 or None for no limit)
+            tokens_per_minute: Tokens admitted per minute (0 or None for no limit)
+            burst: Requests admitted back to back before the rate applies
+            clock: Monotonic clock in seconds (injectable for tests)
+            sleep: Coroutine function used to wait (injectable for tests)
+        """
+        self.clock = clock
+        self.sleep = sleep
+        now = clock()
+        
+        self.requests = TokenBucket(requests_per_minute, max(1, burst), now) if requests_per_minute else None
+        # A whole minute of tokens, since a single paper can use a large share of it
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute, now) if tokens_per_minute else None
+        
+        # asyncio.Lock wakes waiters in arrival order, which makes admission FIFO.
+        # Created on first use: before Python 3.10 it binds to the loop current
+        # at construction, which is not the one asyncio.run() starts later
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RateLimiter':
+        """
+        Create a limiter from the rate_limit configuration section.
+        
+        Args:
+            config: Configuration dictionary
+        
+        Returns:
+            RateLimiter instance
+        """
+        rate_limit = config.get('rate_limit', {})
+        return cls(
+            requests_per_minute=rate_limit.get('requests_per_minute', 60),
+            tokens_per_minute=rate_limit.get('tokens_per_minute'),
+            burst=rate_limit.get('burst', 1),
+        )
+    
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until one request using the given number of tokens may be sent.
+        
+        Args:
+            tokens: Estimated tokens of the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = self.clock()
+                wait = 0.0
+                if self.requests is not None:
+                    self.requests.refill(now)
+                    wait = self.requests.wait_time(1)
+                if self.tokens is not None and tokens:
+                    self.tokens.refill(now)
+                    wait = max(wait, self.tokens.wait_time(tokens))
+                
+                if wait <= 0:
+                    if self.requests is not None:
+                        self.requests.take(1)
+                    if self.tokens is not None and tokens:
+                        self.tokens.take(tokens)
+                    return waited
+                
+                if wait >= 1:
+                    logger.info(f"Rate limit reached, waiting {wait:.1f} seconds")
+                await self.sleep(wait)
+                waited += wait
+    
+    def reconcile(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """
+        Correct the token bucket once the real usage of a request is known.
+        
+        Args:
+            estimated_tokens: Tokens passed to acquire()
+            actual_tokens: Tokens reported by the API (None if unknown)
+        """
+        if self.tokens is None or actual_tokens is None:
+            return
+        self.tokens.refill(self.clock())
+        if actual_tokens > estimated_tokens:
+            self.tokens.take(actual_tokens - estimated_tokens)
+        else:
+            self.tokens.give_back(estimated_tokens - actual_tokens)
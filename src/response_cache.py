@@ -0,0 +1,124 @@
+"""
+LLM response cache module for Obsidian Abstractor.
+
+This module stores raw Gemini responses on disk, keyed by a hash of the model
+input (text and page images), the backend and model, the prompt template, the
+language and the generation settings, so that re-processing an unchanged paper (a
+re-download under a new name, process --force to change note formatting)
+does not spend API quota.
+"""
+
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .utils.disk_cache import DiskCache
+from .utils.hashing import cache_key
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the stored entry format or the request construction changes
+RESPONSE_CACHE_VERSION = 2
+
+
+class ResponseCache:
+    """Content-addressed cache of LLM response texts."""
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize response cache.
+        
+        Args:
+            config: Configuration dictionary
+        """
+        advanced_config = config.get('advanced', {})
+        self.enabled = advanced_config.get('llm_cache', True)
+        # Bypass skips lookups but still stores fresh responses
+        self.bypass = advanced_config.get('llm_cache_bypass', False)
+        
+        self._store: Optional[DiskCache] = None
+        if self.enabled:
+            cache_dir = Path(advanced_config.get('cache_dir', '~/.cache/obsidian-abstractor')).expanduser()
+            try:
+                self._store = DiskCache(
+                    cache_dir / 'llm_responses',
+                    max_size_mb=advanced_config.get('llm_cache_max_mb', 100),
+                    suffix='.json.gz'
+                )
+            except OSError as e:
+                logger.warning(f"LLM response cache disabled: {e}")
+                self.enabled = False
+    
+    @staticmethod
+    def key(input_text: str, images: Iterable[bytes], backend: str, model: str, prompt_template: str,
+            language: str, generation_config: str, *extra: object) -> str:
+        """
+        Cache key of one LLM request.
+        
+        Args:
+            input_text: Text of the paper given to the model
+            images: Page images given to the model
+            backend: Name of the LLM backend (ai.backend)
+            model: Model name
+            prompt_template: Unformatted prompt template
+            language: Output language
+            generation_config: Serialized generation settings
+            *extra: Other values that change the request (e.g. length limits)
+        
+        Returns:
+            Hex digest identifying the request
+        """
+        input_hash = hashlib.sha256(input_text.encode('utf-8'))
+        for image in images:
+            input_hash.update(hashlib.sha256(image).digest())
+        
+        return cache_key(
+            input_hash.hexdigest(),
+            backend,
+            model,
+            hashlib.sha256(prompt_template.encode('utf-8')).hexdigest(),
+            language,
+            generation_config,
+            *extra,
+            RESPONSE_CACHE_VERSION
+        )
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a stored response.
+        
+        Args:
+            key: Key from key()
+        
+        Returns:
+            Dictionary with 'text', 'usage', 'model' and 'created_at', or None on a miss
+        """
+        if not self._store or self.bypass:
+            return None
+        
+        entry = self._store.get_json(key)
+        if not isinstance(entry, dict) or not isinstance(entry.get('text'), str):
+            return None
+        return entry
+    
+    def put(self, key: str, text: str, model: str, usage: Optional[Dict[str, Any]] = None):
+        """
+        Store a response.
+        
+        Args:
+            key: Key from key()
+            text: Raw response text
+            model: Model that produced the response
+            usage: Token usage reported by the API
+        """
+        if not self._store or not text:
+            return
+        
+        self._store.put_json(key, {
+            'text': text,
+            'model': model,
+            'usage': usage or {},
+            'created_at': datetime.now().isoformat(),
+        })
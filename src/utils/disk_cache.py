@@ -0,0 +1,146 @@
+"""
+On-disk cache for Obsidian Abstractor.
+
+This module provides a small key/value store under the cache directory.
+Entries are written atomically, so several worker processes can share one
+cache, and the oldest entries are evicted once a size limit is exceeded.
+"""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Store byte blobs on disk under hex string keys with LRU eviction."""
+    
+    def __init__(self, cache_dir: Path, max_size_mb: Optional[float] = None,
+                 suffix: str = '.bin'):
+        """
+        Initialize disk cache.
+        
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_size_mb: Total size above which least recently used entries
+                are removed (None for no limit)
+            suffix: File name suffix of the entries
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.suffix = suffix
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _entry_path(self, key: str) -> Path:
+        """Path of an entry, sharded by the first two characters of the key."""
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read an entry.
+        
+        Args:
+            key: Entry key
+        
+        Returns:
+            Stored bytes, or None if the entry does not exist
+        """
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Failed to read cache entry {path}: {e}")
+            return None
+        
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+    
+    def put(self, key: str, data: bytes):
+        """
+        Write an entry atomically.
+        
+        Args:
+            key: Entry key
+            data: Bytes to store
+        """
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+            return
+        
+        if self.max_size_bytes is not None:
+            self.evict()
+    
+    def get_json(self, key: str) -> Optional[Any]:
+        """Read a gzip-compressed JSON entry."""
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(gzip.decompress(data).decode('utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding corrupt cache entry {key}: {e}")
+            self.delete(key)
+            return None
+    
+    def put_json(self, key: str, value: Any):
+        """Write a value as a gzip-compressed JSON entry."""
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        self.put(key, gzip.compress(data, compresslevel=6))
+    
+    def delete(self, key: str):
+        """Remove an entry if it exists."""
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size limit."""
+        if self.max_size_bytes is None:
+            return
+        
+        entries = []
+        total_size = 0
+        for path in self.cache_dir.glob(f"*/*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+        
+        if total_size <= self.max_size_bytes:
+            return
+        
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total_size -= size
+            logger.debug(f"Evicted cache entry: {path.name}")
+            if total_size <= self.max_size_bytes:
+                break
@@ -0,0 +1,57 @@
+"""
+Content hashing utilities for Obsidian Abstractor.
+
+This module provides content digests of files, used as keys for the
+on-disk caches so that renamed or moved PDFs still hit the cache.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Digests of files already hashed in this process, keyed by (path, size, mtime)
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+    
+    The result is memoized per process on path, size and modification time,
+    so that several caches keyed on the same file only read it once.
+    
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read at a time
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _digest_memo.get(memo_key)
+    if digest is not None:
+        return digest
+    
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    
+    digest = hasher.hexdigest()
+    _digest_memo[memo_key] = digest
+    return digest
+
+
+def cache_key(*parts: object) -> str:
+    """
+    Combine several values into a single cache key.
+    
+    Args:
+        *parts: Values identifying a cache entry (digests, settings, versions)
+    
+    Returns:
+        Hex digest of the joined values
+    """
+    joined = '\x1f'.join(str(part) for part in parts)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
@@ -0,0 +1,94 @@
+"""
+Page image encoding for Obsidian Abstractor.
+
+This module encodes a rendered page pixmap into the smallest reasonable
+image that fits a byte budget, without rasterizing the page again: it tries
+lossless PNG, then JPEG at decreasing quality, then shrinks the pixmap.
+Pages without color are converted to grayscale first.
+"""
+
+import logging
+from typing import NamedTuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# JPEG qualities tried in order when PNG is over budget
+JPEG_QUALITIES = (85, 70, 55, 40)
+
+# Maximum number of times the pixmap is halved in size
+MAX_SHRINKS = 2
+
+
+class EncodedImage(NamedTuple):
+    """Encoded page image."""
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    scale: float  # Size relative to the rendered pixmap (1.0, 0.5, 0.25)
+
+
+def is_grayscale(pix: fitz.Pixmap) -> bool:
+    """
+    Check whether an RGB pixmap contains only gray pixels.
+    
+    The check runs on a reduced copy, which keeps it cheap for large pages.
+    
+    Args:
+        pix: Pixmap without alpha
+    
+    Returns:
+        True if every sampled pixel has equal red, green and blue values
+    """
+    if pix.n != 3 or pix.alpha:
+        return pix.n == 1
+    
+    sample = pix
+    if pix.width >= 64 and pix.height >= 64:
+        sample = fitz.Pixmap(pix, pix.width // 4, pix.height // 4, None)
+    
+    samples = sample.samples_mv
+    red = bytes(samples[0::3])
+    return red == bytes(samples[1::3]) and red == bytes(samples[2::3])
+
+
+def encode_pixmap(pix: fitz.Pixmap, max_bytes: int) -> EncodedImage:
+    """
+    Encode a pixmap to fit a byte budget.
+    
+    Args:
+        pix: Rendered page pixmap (without alpha)
+        max_bytes: Target maximum size of the encoded image
+    
+    Returns:
+        EncodedImage. If nothing fits, the smallest attempt is returned.
+    """
+    if pix.n == 3 and is_grayscale(pix):
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+    
+    # Text-heavy pages compress best, and losslessly, as PNG
+    data = pix.tobytes("png")
+    if len(data) <= max_bytes:
+        return EncodedImage(data, "image/png", pix.width, pix.height, 1.0)
+    
+    scale = 1.0
+    smallest = EncodedImage(data, "image/png", pix.width, pix.height, scale)
+    for shrinks in range(MAX_SHRINKS + 1):
+        if shrinks:
+            # Halve the existing pixmap instead of rendering the page again
+            pix = fitz.Pixmap(pix, pix.width // 2, pix.height // 2, None)
+            scale /= 2
+        
+        for quality in JPEG_QUALITIES:
+            encoded = EncodedImage(pix.tobytes("jpeg", jpg_quality=quality),
+                                   "image/jpeg", pix.width, pix.height, scale)
+            if len(encoded.data) <= max_bytes:
+                return encoded
+            if len(encoded.data) < len(smallest.data):
+                smallest = encoded
+    
+    logger.warning(f"Could not encode page image within {max_bytes // 1024}KB "
+                   f"(smallest: {len(smallest.data) // 1024}KB)")
+    return smallest
@@ -0,0 +1,232 @@
+"""
+Page text cache for Obsidian Abstractor.
+
+This module provides a per-document store for page text so that every
+extraction step reads the text of a page from PyMuPDF at most once, and a
+helper that extracts the pages of very large documents on several processes.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# Process pool shared by every large document of this process, started on first use
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def read_page_text(page: fitz.Page, flags: Optional[int] = None) -> str:
+    """
+    Text of a page, as every reader of the cache extracts it.
+    
+    Args:
+        page: PyMuPDF page
+        flags: Optional PyMuPDF text flags (None uses the default extraction)
+    
+    Returns:
+        Page text
+    """
+    if flags is None:
+        return page.get_text()
+    return page.get_text("text", flags=flags)
+
+
+class PageTextCache:
+    """Lazily extract and cache the text of each page of a PDF document."""
+    
+    def __init__(self, doc: fitz.Document, max_chars: Optional[int] = None):
+        """
+        Initialize page text cache.
+        
+        Args:
+            doc: PyMuPDF document object
+            max_chars: Total characters kept in the cache before least recently
+                used pages are dropped (None for no limit)
+        """
+        self.doc = doc
+        self.max_chars = max_chars
+        self._texts: OrderedDict[Tuple[int, Optional[int]], str] = OrderedDict()
+        self._cached_chars = 0
+        
+        # Counters used by benchmarks and debug logging
+        self.requests = 0
+        self.extractions = 0
+    
+    def get(self, page_num: int, flags: Optional[int] = None) -> str:
+        """
+        Get the text of a page, extracting it on first access.
+        
+        Args:
+            page_num: Page number (0-indexed)
+            flags: Optional PyMuPDF text flags (None uses the default extraction)
+        
+        Returns:
+            Page text
+        """
+        self.requests += 1
+        key = (page_num, flags)
+        
+        text = self._texts.get(key)
+        if text is None:
+            text = read_page_text(self.doc[page_num], flags)
+            self.extractions += 1
+            self._store(key, text)
+        else:
+            self._texts.move_to_end(key)
+        
+        return text
+    
+    def _store(self, key: Tuple[int, Optional[int]], text: str):
+        """Add a page text, dropping least recently used pages above max_chars."""
+        self._texts[key] = text
+        self._cached_chars += len(text)
+        
+        if self.max_chars is None:
+            return
+        # Always keep the page just stored, even if it alone exceeds the limit
+        while self._cached_chars > self.max_chars and len(self._texts) > 1:
+            _, dropped = self._texts.popitem(last=False)
+            self._cached_chars -= len(dropped)
+    
+    def set_limit(self, max_chars: Optional[int]):
+        """
+        Change the cache size limit, dropping pages if needed.
+        
+        Args:
+            max_chars: Total characters kept in the cache (None for no limit)
+        """
+        self.max_chars = max_chars
+        if max_chars is None:
+            return
+        while self._cached_chars > max_chars and self._texts:
+            _, dropped = self._texts.popitem(last=False)
+            self._cached_chars -= len(dropped)
+    
+    def prefill(self, texts: Dict[int, str], flags: Optional[int] = None):
+        """
+        Store page texts extracted elsewhere (e.g. by extract_pages_parallel).
+        
+        Pages are stored in order until max_chars is reached; the rest are
+        extracted again on demand, so the leading pages stay cached.
+        
+        Args:
+            texts: Mapping of page number (0-indexed) to text
+            flags: PyMuPDF text flags the texts were extracted with
+        """
+        for page_num, text in texts.items():
+            if self.max_chars is not None and self._cached_chars + len(text) > self.max_chars:
+                break
+            self._store((page_num, flags), text)
+        self.extractions += len(texts)
+    
+    def iter_pages(self, flags: Optional[int] = None,
+                   pages: Optional[Iterable[int]] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Iterate over (page_number, text) for all pages, or the given pages.
+        
+        Pages whose text cannot be extracted are logged and skipped.
+        
+        Args:
+            flags: Optional PyMuPDF text flags
+            pages: Optional page numbers to visit, in order (default: all pages)
+        
+        Yields:
+            Tuples of (page_number, text) with 0-indexed page numbers
+        """
+        if pages is None:
+            pages = range(len(self.doc))
+        for page_num in pages:
+            try:
+                yield page_num, self.get(page_num, flags)
+            except Exception as e:
+                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+    
+    def stats(self) -> Dict[str, int]:
+        """Return text lookup statistics for this document."""
+        return {
+            'requests': self.requests,
+            'get_text_calls': self.extractions,
+            'cached_pages': len(self._texts),
+        }
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int,
+                        flags: Optional[int]) -> List[Tuple[int, str]]:
+    """
+    Extract the text of a range of pages in a worker process.
+    
+    Each worker opens its own document handle; PyMuPDF documents cannot be
+    shared across processes.
+    
+    Returns:
+        List of (page_number, text) for pages that could be extracted
+    """
+    texts = []
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(start, stop):
+            try:
+                texts.append((page_num, read_page_text(doc[page_num], flags)))
+            except Exception as e:
+                logger.warning(f"Failed to extract text from page {page_num + 1}: {e}")
+    return texts
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for page extraction, created once per process.
+    
+    Workers are spawned rather than forked, since callers run next to the
+    watcher's observer and asyncio threads.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def extract_pages_parallel(pdf_path: Path, page_count: int, workers: int,
+                           flags: Optional[int] = None) -> Dict[int, str]:
+    """
+    Extract the text of every page, split into contiguous ranges across processes.
+    
+    The process pool is reused by later documents, so its startup is paid once.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        page_count: Number of pages in the document
+        workers: Number of worker processes
+        flags: Optional PyMuPDF text flags
+    
+    Returns:
+        Mapping of page number (0-indexed) to text, in page order.
+        Pages that failed are missing and can be retried serially.
+    """
+    executor = _get_executor(max(1, workers))
+    workers = max(1, min(workers, page_count))
+    chunk_size = -(-page_count // workers)  # ceiling division
+    starts = list(range(0, page_count, chunk_size))
+    stops = [min(start + chunk_size, page_count) for start in starts]
+    
+    texts: Dict[int, str] = {}
+    results = executor.map(
+        _extract_page_range,
+        [str(pdf_path)] * len(starts),
+        starts,
+        stops,
+        [flags] * len(starts)
+    )
+    # map preserves submission order, so pages are merged in order
+    for chunk in results:
+        texts.update(chunk)
+    
+    return texts
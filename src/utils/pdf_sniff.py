@@ -0,0 +1,81 @@
+"""
+Byte-level PDF sniffing for Obsidian Abstractor.
+
+This module inspects the first and last bytes of a file to tell whether it
+looks like a complete PDF, without building a document. It catches HTML
+error pages saved as .pdf, empty or preallocated files and downloads that
+are still being written, before PyMuPDF is asked to open them.
+"""
+
+import re
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+# The header may be preceded by junk within the first 1024 bytes
+HEAD_BYTES = 1024
+
+# startxref and %%EOF are expected within the last 1024 bytes
+TAIL_BYTES = 1024
+
+# Total file length declared by a linearized PDF in its first object
+LINEARIZED_LENGTH_PATTERN = re.compile(rb'/Linearized\b.{0,256}?/L\s+(\d+)', re.DOTALL)
+
+HTML_MARKERS = (b'<!doctype html', b'<html', b'<head', b'<?xml')
+
+
+class SniffResult(NamedTuple):
+    """Result of sniffing a file."""
+    status: str  # 'pdf', 'truncated' or 'not_pdf'
+    reason: str
+    version: Optional[str] = None
+    linearized_length: Optional[int] = None
+
+
+def sniff_pdf(pdf_path: Path) -> SniffResult:
+    """
+    Check the header and trailer bytes of a file.
+    
+    Args:
+        pdf_path: Path to the file
+    
+    Returns:
+        SniffResult. 'truncated' means the file starts like a PDF (or is
+        empty) but is shorter than it should be; it may still be written.
+    
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(pdf_path, 'rb') as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return SniffResult('truncated', "Empty file")
+        
+        f.seek(0)
+        head = f.read(HEAD_BYTES)
+        if size > HEAD_BYTES:
+            f.seek(size - TAIL_BYTES)
+            tail = f.read()
+        else:
+            tail = head
+    
+    offset = head.find(b'%PDF-')
+    if offset < 0:
+        if not head.strip(b'\x00'):
+            return SniffResult('truncated', "File contains only zero bytes")
+        start = head.lstrip().lower()
+        if start.startswith(HTML_MARKERS):
+            return SniffResult('not_pdf', "HTML or XML document, not a PDF")
+        return SniffResult('not_pdf', "No PDF header")
+    
+    version = head[offset + 5:offset + 8].decode('ascii', errors='replace')
+    
+    match = LINEARIZED_LENGTH_PATTERN.search(head)
+    linearized_length = int(match.group(1)) if match else None
+    if linearized_length is not None and linearized_length > size:
+        return SniffResult('truncated', f"Incomplete file: {size} of {linearized_length} bytes",
+                           version, linearized_length)
+    
+    if b'%%EOF' not in tail and b'startxref' not in tail:
+        return SniffResult('truncated', "No end-of-file marker", version, linearized_length)
+    
+    return SniffResult('pdf', f"PDF {version}", version, linearized_length)
@@ -0,0 +1,76 @@
+"""
+Quarantine of rejected PDFs for Obsidian Abstractor.
+
+This module moves PDFs rejected by the filter to a quarantine folder, next
+to a text file explaining the verdict. The filter command and the folder
+monitor both use it, so quarantined files are named the same way.
+"""
+
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def quarantine_destination(pdf_path: Path, quarantine_folder: Path) -> Path:
+    """
+    Free path for a PDF in the quarantine folder.
+    
+    An existing file of the same name is never overwritten: a counter is
+    appended to the stem instead (paper.pdf, paper_1.pdf, paper_2.pdf, ...).
+    
+    Args:
+        pdf_path: Path to the PDF
+        quarantine_folder: Destination folder
+    
+    Returns:
+        Path in the quarantine folder that does not exist yet
+    """
+    destination = quarantine_folder / pdf_path.name
+    counter = 1
+    while destination.exists():
+        destination = quarantine_folder / f"{pdf_path.stem}_{counter}{pdf_path.suffix}"
+        counter += 1
+    return destination
+
+
+def quarantine_pdf(pdf_path: Path, quarantine_folder: Path, score: float,
+                   reasons: Iterable[str], threshold: float) -> Optional[Path]:
+    """
+    Move a rejected PDF to the quarantine folder with a filter info file.
+    
+    Args:
+        pdf_path: Path to the rejected PDF
+        quarantine_folder: Destination folder
+        score: Filter score of the file
+        reasons: Reasons given by the filter
+        threshold: Academic threshold the score was compared against
+    
+    Returns:
+        New path of the PDF, or None if it could not be moved
+    """
+    try:
+        quarantine_folder.mkdir(parents=True, exist_ok=True)
+        destination = quarantine_destination(pdf_path, quarantine_folder)
+        shutil.move(str(pdf_path), str(destination))
+        
+        info_content = f"File: {pdf_path.name}\n"
+        info_content += f"Original path: {pdf_path}\n"
+        info_content += f"Filtered at: {datetime.now().isoformat()}\n"
+        info_content += f"Score: {score}\n"
+        info_content += f"Threshold: {threshold}\n"
+        info_content += "\nReasons:\n"
+        for reason in reasons:
+            info_content += f"  - {reason}\n"
+        info_path = destination.with_name(f"{destination.stem}_filter_info.txt")
+        info_path.write_text(info_content, encoding='utf-8')
+        
+        logger.info(f"Quarantined {pdf_path} -> {destination}")
+        return destination
+    
+    except Exception as e:
+        logger.warning(f"Failed to quarantine {pdf_path}: {e}")
+        return None
@@ -0,0 +1,106 @@
+"""
+Timing utilities for Obsidian Abstractor.
+
+This module measures the wall time of consecutive stages of a pipeline and
+aggregates those timings over a run into percentile summaries.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Mapping
+
+
+class StageTimer:
+    """Measure consecutive stages with a single running clock."""
+    
+    def __init__(self):
+        """Initialize stage timer; the first stage starts now."""
+        self.timings: Dict[str, float] = {}
+        self._last = time.perf_counter()
+    
+    def lap(self, stage: str) -> float:
+        """
+        End the current stage and start the next one.
+        
+        Args:
+            stage: Name of the stage that just ended
+        
+        Returns:
+            Wall time of the stage in milliseconds
+        """
+        now = time.perf_counter()
+        elapsed_ms = round((now - self._last) * 1000, 3)
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed_ms
+        self._last = now
+        return elapsed_ms
+
+
+def percentile(sorted_values: Iterable[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted values.
+    
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile between 0 and 1
+    
+    Returns:
+        Value at the percentile (0 if there are no values)
+    """
+    values = list(sorted_values)
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(len(values) * fraction))
+    return values[rank - 1]
+
+
+class TimingHistogram:
+    """Per-stage timing samples of a run, summarized as percentiles."""
+    
+    PERCENTILES = {'p50': 0.50, 'p95': 0.95, 'p99': 0.99}
+    
+    def __init__(self, max_samples: int = 10000):
+        """
+        Initialize timing histogram.
+        
+        Args:
+            max_samples: Samples kept per stage; long runs keep the most recent ones
+        """
+        self.max_samples = max_samples
+        self.samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.totals: Dict[str, float] = {}
+    
+    def add(self, timings: Mapping[str, float]):
+        """
+        Record the stage timings of one item.
+        
+        Args:
+            timings: Milliseconds per stage
+        """
+        for stage, elapsed_ms in timings.items():
+            if stage not in self.samples:
+                self.samples[stage] = deque(maxlen=self.max_samples)
+                self.counts[stage] = 0
+                self.totals[stage] = 0.0
+            self.samples[stage].append(elapsed_ms)
+            self.counts[stage] += 1
+            self.totals[stage] += elapsed_ms
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded timings.
+        
+        Returns:
+            Dictionary of stage -> {'count', 'total_ms', 'p50', 'p95', 'p99'},
+            in the order the stages were first seen
+        """
+        summary = {}
+        for stage, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[stage] = {
+                'count': self.counts[stage],
+                'total_ms': round(self.totals[stage], 3),
+                **{name: percentile(ordered, fraction) for name, fraction in self.PERCENTILES.items()},
+            }
+        return summary
@@ -0,0 +1,173 @@
+"""
+Filter verdict cache module for Obsidian Abstractor.
+
+This module remembers the PDFFilter verdict of every file, keyed by path,
+size and modification time, so that unchanged files (in particular
+rejected ones) are not opened and scored again on every scan. Verdicts are
+tied to a fingerprint of the filter configuration and are discarded when
+scoring rules or thresholds change.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .pdf_filter import FilterResult
+
+logger = logging.getLogger(__name__)
+
+
+class VerdictCache:
+    """Persistent cache of filter verdicts."""
+    
+    def __init__(self, cache_file: Path, fingerprint: str, save_every: int = 25,
+                 save_interval_seconds: float = 10.0):
+        """
+        Initialize verdict cache.
+        
+        New verdicts are written once save_every of them accumulate, and at
+        the latest save_interval_seconds after the first of them, so a crash
+        loses only the last few seconds of filtering. Whatever is left is
+        written when the process exits.
+        
+        Args:
+            cache_file: JSON file holding the verdicts
+            fingerprint: Fingerprint of the filter configuration (PDFFilter.fingerprint())
+            save_every: Number of new verdicts after which the file is written
+            save_interval_seconds: Delay after which unsaved verdicts are written
+        """
+        self.cache_file = cache_file
+        self.fingerprint = fingerprint
+        self.save_every = save_every
+        self.save_interval_seconds = save_interval_seconds
+        self._verdicts: Dict[str, Dict[str, Any]] = self._load()
+        self._unsaved = 0
+        # The timer thread saves while workers keep adding verdicts
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.save)
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load verdicts, discarding them if the filter configuration changed."""
+        if not self.cache_file.exists():
+            return {}
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load filter verdict cache: {e}")
+            return {}
+        
+        if data.get('fingerprint') != self.fingerprint:
+            logger.info("Filter settings changed, discarding cached filter verdicts")
+            return {}
+        
+        return data.get('verdicts', {})
+    
+    @staticmethod
+    def _file_state(pdf_path: Path) -> Optional[Dict[str, int]]:
+        """Size and modification time identifying the current file contents."""
+        try:
+            stat = pdf_path.stat()
+        except OSError:
+            return None
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    def get(self, pdf_path: Path) -> Optional[FilterResult]:
+        """
+        Get the cached verdict for a file, if the file is unchanged.
+        
+        Args:
+            pdf_path: Path to the PDF file
+        
+        Returns:
+            Cached FilterResult, or None if unknown or changed
+        """
+        entry = self._verdicts.get(str(pdf_path))
+        if entry is None:
+            return None
+        
+        state = self._file_state(pdf_path)
+        if state is None or state['size'] != entry['size'] or state['mtime_ns'] != entry['mtime_ns']:
+            return None
+        
+        details = dict(entry.get('details', {}))
+        details['cached_verdict'] = entry.get('checked_at')
+        return FilterResult(
+            accepted=entry['accepted'],
+            score=entry['score'],
+            reasons=entry['reasons'],
+            details=details
+        )
+    
+    def put(self, pdf_path: Path, result: FilterResult):
+        """
+        Store the verdict for a file.
+        
+        Verdicts of files that could not be analyzed or were deferred are not
+        stored, since the cause may be transient (e.g. a download in progress).
+        
+        Args:
+            pdf_path: Path to the PDF file
+            result: Filter result to store
+        """
+        if 'error' in result.details or 'deferred' in result.details:
+            return
+        
+        state = self._file_state(pdf_path)
+        if state is None:
+            return
+        
+        with self._lock:
+            self._verdicts[str(pdf_path)] = {
+                **state,
+                'accepted': result.accepted,
+                'score': result.score,
+                'reasons': list(result.reasons),
+                # Timings describe the run that computed the verdict, not the file
+                'details': {key: value for key, value in result.details.items() if key != 'timings'},
+                'checked_at': datetime.now().isoformat(),
+            }
+            
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self.save()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.save_interval_seconds, self.save)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def save(self):
+        """Write the verdicts to disk if there are unsaved changes."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._unsaved:
+                return
+            
+            data = {
+                'fingerprint': self.fingerprint,
+                'verdicts': self._verdicts,
+                'last_updated': datetime.now().isoformat(),
+            }
+            
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=self.cache_file.parent, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_name, self.cache_file)
+                self._unsaved = 0
+            except Exception as e:
+                logger.warning(f"Failed to save filter verdict cache: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._verdicts)
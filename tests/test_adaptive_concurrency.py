@@ -0,0 +1,148 @@
+"""
+Tests for adaptive LLM concurrency control.
+"""
+
+import asyncio
+
+import pytest
+from google.genai import errors
+
+from src.adaptive_concurrency import AdaptiveConcurrency, is_throttle, retry_after
+
+
+class FakeClock:
+    """Clock advanced by sleeps and by the test."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def throttle_error(retry_delay=None):
+    """Gemini 429 error, optionally with a RetryInfo detail."""
+    details = []
+    if retry_delay is not None:
+        details.append({'@type': 'type.googleapis.com/google.rpc.RetryInfo', 'retryDelay': retry_delay})
+    return errors.ClientError(429, {'error': {'code': 429, 'status': 'RESOURCE_EXHAUSTED', 'details': details}})
+
+
+@pytest.fixture
+def clock():
+    """Fake clock shared by a controller and its test."""
+    return FakeClock()
+
+
+class TestThrottleErrors:
+    """Test cases for throttle detection."""
+    
+    def test_is_throttle(self):
+        """Test that only 429 and 503 count as throttling."""
+        assert is_throttle(throttle_error())
+        assert is_throttle(errors.ServerError(503, {'error': {'code': 503}}))
+        assert not is_throttle(errors.ClientError(400, {'error': {'code': 400}}))
+        assert not is_throttle(ValueError("bad response"))
+    
+    def test_retry_after_from_retry_info(self):
+        """Test that the RetryInfo delay of the error body is read."""
+        assert retry_after(throttle_error('37s')) == 37.0
+        assert retry_after(throttle_error()) is None
+
+
+class TestAdaptiveConcurrency:
+    """Test cases for AdaptiveConcurrency."""
+    
+    def test_throttle_halves_limit_once_per_event(self, clock):
+        """Test multiplicative decrease, applied once for requests in flight together."""
+        controller = AdaptiveConcurrency(max_limit=8, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            started = [await controller.acquire() for _ in range(3)]
+            clock.now += 1
+            for start in started:
+                await controller.release(start, throttle_error())
+        
+        asyncio.run(run())
+        
+        assert controller.current_limit == 4
+        assert controller.in_flight == 0
+    
+    def test_success_grows_limit(self, clock):
+        """Test that the limit grows by about one per window of successes."""
+        controller = AdaptiveConcurrency(max_limit=4, clock=clock, sleep=clock.sleep)
+        controller.limit = 2.0
+        
+        async def run():
+            for _ in range(3):
+                async with controller.slot():
+                    clock.now += 1
+        
+        asyncio.run(run())
+        
+        assert controller.current_limit == 3
+    
+    def test_latency_spike_decreases_limit(self, clock):
+        """Test that latency far above the baseline counts as congestion."""
+        controller = AdaptiveConcurrency(max_limit=4, latency_factor=3.0, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            for latency in (1, 1, 10):
+                async with controller.slot():
+                    clock.now += latency
+        
+        asyncio.run(run())
+        
+        assert controller.current_limit == 2
+    
+    def test_mixed_sizes_without_congestion(self, clock):
+        """Test that slower large requests do not shrink the limit when no request is congested."""
+        controller = AdaptiveConcurrency(max_limit=4, latency_factor=3.0, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            for i in range(20):
+                size, latency = (2_000, 2) if i % 3 else (100_000, 12 + i % 2)
+                async with controller.slot(size=size):
+                    clock.now += latency
+            # A congested large request is still noticed
+            async with controller.slot(size=100_000):
+                clock.now += 60
+        
+        asyncio.run(run())
+        
+        assert controller.limit == 2.0
+    
+    def test_retry_after_pauses_requests(self, clock):
+        """Test that new requests wait for the Retry-After delay."""
+        controller = AdaptiveConcurrency(max_limit=2, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            with pytest.raises(errors.ClientError):
+                async with controller.slot():
+                    raise throttle_error('30s')
+            return await controller.acquire()
+        
+        assert asyncio.run(run()) == pytest.approx(30.0)
+    
+    def test_limit_bounds_requests_in_flight(self, clock):
+        """Test that callers beyond the limit wait for a free slot."""
+        controller = AdaptiveConcurrency(max_limit=2, clock=clock, sleep=clock.sleep)
+        peak = 0
+        
+        async def call():
+            nonlocal peak
+            async with controller.slot():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0)
+        
+        async def run():
+            await asyncio.gather(*(call() for _ in range(6)))
+        
+        asyncio.run(run())
+        
+        assert peak == 2
+        assert controller.in_flight == 0
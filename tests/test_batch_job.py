@@ -0,0 +1,223 @@
+"""
+Tests for bulk processing through a batch prediction job.
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fitz
+import pytest
+from google.genai import types
+
+from src.batch_job import BatchJobRunner, request_json, response_text
+from src.paper_abstractor import GenerationRequest
+from src.pdf_monitor import PDFMonitor
+
+
+class MockGeminiServer:
+    """Local HTTP endpoint answering the file and batch calls of the Gemini API."""
+    
+    def __init__(self, polls_before_done=1):
+        self.requests_jsonl = b''
+        self.polls = 0
+        self.polls_before_done = polls_before_done
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def results(self) -> bytes:
+        """Output file with one markdown note per submitted request."""
+        lines = []
+        for line in self.requests_jsonl.decode('utf-8').splitlines():
+            key = json.loads(line)['key']
+            text = f"---\ntitle: Paper {key}\nauthors:\n- Doe, J.\nyear-published: '2024'\n---\n\n# Paper {key}\n"
+            lines.append(json.dumps({'key': key, 'response': {
+                'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}}],
+                'usageMetadata': {'promptTokenCount': 100},
+            }}))
+        return '\n'.join(lines).encode('utf-8')
+    
+    def _handler(self):
+        mock = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def _reply(self, body, headers=None):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.path.startswith('/upload/v1beta/files'):
+                    self._reply({}, {'X-Goog-Upload-URL': mock.url + 'upload/session'})
+                elif self.path.startswith('/upload/session'):
+                    mock.requests_jsonl += body
+                    self._reply({'file': {'name': 'files/requests', 'state': 'ACTIVE'}},
+                                {'X-Goog-Upload-Status': 'final'})
+                elif self.path.endswith(':batchGenerateContent'):
+                    self._reply({'name': 'batches/job1', 'metadata': {'state': 'BATCH_STATE_PENDING'}})
+                else:
+                    self.send_error(404)
+            
+            def do_GET(self):
+                if self.path.startswith('/v1beta/batches/job1'):
+                    mock.polls += 1
+                    if mock.polls <= mock.polls_before_done:
+                        self._reply({'name': 'batches/job1', 'metadata': {'state': 'BATCH_STATE_RUNNING'}})
+                    else:
+                        self._reply({'name': 'batches/job1', 'metadata': {
+                            'state': 'BATCH_STATE_SUCCEEDED', 'output': {'responsesFile': 'files/results'},
+                        }})
+                elif 'files/results:download' in self.path:
+                    self._reply(mock.results())
+                else:
+                    self.send_error(404)
+        
+        return Handler
+
+
+@pytest.fixture
+def server():
+    """Mock Gemini endpoint, stopped after the test."""
+    mock = MockGeminiServer()
+    yield mock
+    mock.server.shutdown()
+
+
+@pytest.fixture
+def monitor(server, tmp_path):
+    """Monitor with two papers, talking to the mock endpoint."""
+    papers = tmp_path / 'papers'
+    papers.mkdir()
+    for name in ('first.pdf', 'second.pdf'):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"Abstract\nBody of {name}")
+        doc.save(papers / name)
+        doc.close()
+    
+    config = {
+        'api': {'google_ai_key': 'test-key'},
+        'ai': {'base_url': server.url},
+        'abstractor': {'language': 'ja'},
+        'pdf_filter': {'enabled': False},
+        'folder_settings': {'vault_path': str(tmp_path)},
+        'advanced': {'cache_dir': str(tmp_path / 'cache'), 'extraction_workers': 0},
+    }
+    pdf_monitor = PDFMonitor(config, str(tmp_path / 'notes'))
+    (tmp_path / 'notes').mkdir()
+    yield pdf_monitor
+    asyncio.run(pdf_monitor.paper_abstractor.aclose())
+
+
+async def no_wait(seconds):
+    """Sleep replacement that does not wait."""
+
+
+class TestRequestFormat:
+    """Test cases for the batch input and output formats."""
+    
+    def test_request_json(self):
+        """Test that requests use REST field names and base64 image data."""
+        contents = [types.Content(role='user', parts=[
+            types.Part.from_text(text='Summarize'),
+            types.Part.from_bytes(data=b'\x89PNG', mime_type='image/png'),
+        ])]
+        request = GenerationRequest('Summarize', contents,
+                                    types.GenerateContentConfig(temperature=0.7, max_output_tokens=2048),
+                                    'key', 'Instructions')
+        
+        body = request_json(request)
+        
+        assert body['contents'][0]['parts'][1]['inlineData'] == {'data': 'iVBORw==', 'mimeType': 'image/png'}
+        assert body['generationConfig'] == {'temperature': 0.7, 'maxOutputTokens': 2048}
+        assert body['systemInstruction'] == {'parts': [{'text': 'Instructions'}]}
+    
+    def test_response_text(self):
+        """Test that text parts are joined and thoughts are skipped."""
+        response = {'candidates': [{'content': {'parts': [
+            {'text': 'thinking', 'thought': True}, {'text': '# Note'}, {'text': ' body'},
+        ]}}]}
+        
+        assert response_text(response) == '# Note body'
+        assert response_text({}) == ''
+
+
+class TestBatchJobRunner:
+    """Test cases for BatchJobRunner against a mock endpoint."""
+    
+    def test_submit_poll_and_write_notes(self, monitor, server, tmp_path):
+        """Test that accepted papers are submitted as one job and every result becomes a note."""
+        runner = BatchJobRunner(monitor, sleep=no_wait)
+        pdf_files = sorted(monitor.find_pdf_files(tmp_path / 'papers'))
+        
+        job_name, notes = asyncio.run(runner.run(pdf_files))
+        
+        assert job_name == 'batches/job1'
+        assert len(server.requests_jsonl.decode('utf-8').splitlines()) == 2
+        assert sorted(note.read_text(encoding='utf-8').splitlines()[1] for note in notes) == [
+            'title: Paper 0', 'title: Paper 1'
+        ]
+        assert server.polls == 2
+        assert runner.store.load(job_name)['written'] == ['0', '1']
+    
+    def test_resume_by_job_name(self, monitor, server, tmp_path):
+        """Test that a new runner finishes a submitted job once and skips written notes."""
+        pdf_files = sorted(monitor.find_pdf_files(tmp_path / 'papers'))
+        job_name, _ = asyncio.run(BatchJobRunner(monitor, sleep=no_wait).submit(pdf_files))
+        
+        resumed = asyncio.run(BatchJobRunner(monitor, sleep=no_wait).resume(job_name))
+        again = asyncio.run(BatchJobRunner(monitor, sleep=no_wait).resume(job_name))
+        
+        assert len(resumed) == 2
+        assert again == []
+    
+    def test_resume_does_not_extract_again(self, monitor, server, tmp_path):
+        """Test that notes are written from the data saved at submit time."""
+        pdf_files = sorted(monitor.find_pdf_files(tmp_path / 'papers'))
+        runner = BatchJobRunner(monitor, sleep=no_wait)
+        job_name, _ = asyncio.run(runner.submit(pdf_files))
+        
+        def extract(pdf_path, *args, **kwargs):
+            raise AssertionError(f"{pdf_path} extracted again")
+        
+        monitor.extraction_pool.prepare = extract
+        monitor.pdf_extractor.extract = extract
+        notes = asyncio.run(BatchJobRunner(monitor, sleep=no_wait).resume(job_name))
+        
+        assert len(notes) == 2
+        assert runner.store.load(job_name)['items']['0']['pdf_data']['page_count'] == 1
+    
+    def test_cached_responses_are_not_submitted(self, monitor, server, tmp_path):
+        """Test that papers with a cached response get their note without a job."""
+        runner = BatchJobRunner(monitor, sleep=no_wait)
+        pdf_files = sorted(monitor.find_pdf_files(tmp_path / 'papers'))
+        asyncio.run(runner.run(pdf_files))
+        
+        job_name, notes = asyncio.run(runner.run(pdf_files))
+        
+        assert job_name is None
+        assert len(notes) == 2
+    
+    def test_cancelled_preparation_stops_submit(self, monitor, server, tmp_path):
+        """Test that a cancelled preparation cancels the submission instead of skipping the paper."""
+        runner = BatchJobRunner(monitor, sleep=no_wait)
+        pdf_files = sorted(monitor.find_pdf_files(tmp_path / 'papers'))
+        
+        async def cancelled(pdf_path):
+            raise asyncio.CancelledError()
+        
+        monitor.prepare_accepted = cancelled
+        
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(runner.submit(pdf_files))
+        assert server.requests_jsonl == b''
@@ -0,0 +1,173 @@
+"""
+Tests for context caching of the prompt instructions.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from google.genai import errors, types
+
+from src.context_cache import ContextCache, split_prompt_template
+from src.paper_abstractor import PaperAbstractor
+
+TEMPLATE_PATH = Path(__file__).parent.parent / 'config' / 'prompts' / 'academic_abstract.txt'
+
+
+class FakeCaches:
+    """In-memory stand-in for client.aio.caches."""
+    
+    def __init__(self, clock):
+        self.clock = clock
+        self.cached = []
+        self.error = None
+    
+    async def create(self, model, config):
+        if self.error is not None:
+            raise self.error
+        ttl = float(config.ttl.rstrip('s'))
+        cached = types.CachedContent(
+            name=f"cachedContents/{len(self.cached)}",
+            display_name=config.display_name,
+            model=model,
+            expire_time=datetime.fromtimestamp(self.clock() + ttl, tz=timezone.utc),
+        )
+        self.cached.append(cached)
+        return cached
+    
+    async def list(self):
+        async def pager():
+            for cached in self.cached:
+                yield cached
+        return pager()
+
+
+class FakeClock:
+    """Wall clock advanced by the test."""
+    
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fake clock shared by a context cache and its test."""
+    return FakeClock()
+
+
+@pytest.fixture
+def caches(clock):
+    """Fake caches service."""
+    return FakeCaches(clock)
+
+
+class TestSplitPromptTemplate:
+    """Test cases for split_prompt_template."""
+    
+    def test_academic_template(self):
+        """Test that the bundled template splits into paper-free instructions and a request."""
+        template = TEMPLATE_PATH.read_text(encoding='utf-8')
+        
+        instructions, request = split_prompt_template(template, max_length=1000)
+        
+        assert '最大1000文字' in instructions
+        assert "created: '[現在日付]'" in instructions
+        assert '{' + 'pdf_text}' not in instructions
+        assert request.startswith('提供された論文情報：')
+        prompt = request.format(title='T', authors='A', year=2024, pdf_filename='p.pdf',
+                                current_date='2026-01-01', pdf_text='Body', max_length=1000)
+        assert 'Body' in prompt
+    
+    def test_template_without_paper_fields(self):
+        """Test that a template with nothing per paper is sent unchanged."""
+        assert split_prompt_template('Summarize in {max_length} words.', max_length=5) == (
+            '', 'Summarize in {max_length} words.'
+        )
+
+
+class TestContextCache:
+    """Test cases for ContextCache."""
+    
+    def test_reused_until_near_expiry(self, caches, clock):
+        """Test that one cache serves many requests and is replaced before it expires."""
+        cache = ContextCache(caches, 'gemini-2.0-flash-001', ttl_seconds=3600,
+                             refresh_margin_seconds=300, clock=clock)
+        
+        async def run():
+            names = [await cache.get('instructions') for _ in range(3)]
+            clock.now += 3400
+            names.append(await cache.get('instructions'))
+            return names
+        
+        names = asyncio.run(run())
+        
+        assert names == ['cachedContents/0'] * 3 + ['cachedContents/1']
+    
+    def test_template_change_creates_new_cache(self, caches, clock):
+        """Test that edited instructions are cached separately."""
+        cache = ContextCache(caches, 'gemini-2.0-flash-001', clock=clock)
+        
+        async def run():
+            return await cache.get('instructions v1'), await cache.get('instructions v2')
+        
+        assert asyncio.run(run()) == ('cachedContents/0', 'cachedContents/1')
+    
+    def test_reuses_cache_of_earlier_run(self, caches, clock):
+        """Test that a live cache created by another process is found instead of created."""
+        asyncio.run(ContextCache(caches, 'gemini-2.0-flash-001', clock=clock).get('instructions'))
+        
+        name = asyncio.run(ContextCache(caches, 'gemini-2.0-flash-001', clock=clock).get('instructions'))
+        
+        assert name == 'cachedContents/0'
+        assert len(caches.cached) == 1
+    
+    def test_refused_and_transient_errors(self, caches, clock):
+        """Test that a refusal is remembered while a transient failure is retried."""
+        cache = ContextCache(caches, 'gemini-2.0-flash-001', clock=clock)
+        
+        caches.error = errors.ServerError(503, {'error': {'code': 503}})
+        assert asyncio.run(cache.get('transient')) is None
+        caches.error = errors.ClientError(400, {'error': {'code': 400, 'message': 'too small'}})
+        assert asyncio.run(cache.get('refused')) is None
+        
+        caches.error = None
+        assert asyncio.run(cache.get('transient')) == 'cachedContents/0'
+        assert asyncio.run(cache.get('refused')) is None
+
+
+class TestAbstractorContextCache:
+    """Test cases for context caching in PaperAbstractor."""
+    
+    def test_requests_reference_cached_instructions(self, caches, clock, tmp_path):
+        """Test that each paper is sent without the instructions, which are cached once."""
+        abstractor = PaperAbstractor({
+            'api': {'google_ai_key': 'test-key'},
+            'ai': {'context_cache': True},
+            'abstractor': {'language': 'ja'},
+            'advanced': {'cache_dir': str(tmp_path / 'cache')},
+        })
+        abstractor.context_cache = ContextCache(caches, abstractor.model_name, clock=clock)
+        abstractor.backend = Mock()
+        abstractor.backend.generate_content = AsyncMock(return_value=Mock(
+            text="---\ntitle: A Study\n---\n# A Study", usage_metadata=None
+        ))
+        
+        async def run():
+            for body in ('First paper', 'Second paper'):
+                await abstractor.generate_abstract({'text': body, 'metadata': {'title': 'A Study'}})
+        
+        asyncio.run(run())
+        
+        calls = abstractor.backend.generate_content.await_args_list
+        assert len(calls) == 2
+        assert len(caches.cached) == 1
+        for call in calls:
+            assert call.kwargs['config'].cached_content == 'cachedContents/0'
+            assert call.kwargs['config'].system_instruction is None
+            assert 'paper' in call.kwargs['contents']
+            assert '論文種類の判定' not in call.kwargs['contents']
@@ -0,0 +1,110 @@
+"""
+Tests for the extraction cache.
+"""
+
+import pytest
+
+from src.extraction_cache import ExtractionCache
+from src.utils.disk_cache import DiskCache
+
+
+class TestExtractionCache:
+    """Test cases for ExtractionCache class."""
+    
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Configuration with the cache directory in a temporary folder."""
+        return {
+            'pdf': {'extraction_mode': 'auto'},
+            'advanced': {'cache_dir': str(tmp_path / 'cache')},
+        }
+    
+    @pytest.fixture
+    def pdf_data(self):
+        """Extracted data as returned by PDFExtractor.extract."""
+        return {
+            'text': '[Page 1]\nAbstract',
+            'metadata': {'filename': 'paper.pdf', 'title': 'A Paper'},
+            'structure': [],
+            'figures': [],
+            'references': [],
+            'page_count': 1,
+            'pdf_path': '/old/paper.pdf',
+        }
+    
+    def test_roundtrip(self, config, pdf_data, tmp_path):
+        """Test that stored data is returned for the same file."""
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        cache = ExtractionCache(config)
+        
+        assert cache.get(pdf_path) is None
+        cache.put(pdf_path, pdf_data)
+        
+        cached = cache.get(pdf_path)
+        assert cached['text'] == pdf_data['text']
+        assert cached['pdf_path'] == str(pdf_path)
+    
+    def test_keyed_by_content(self, config, pdf_data, tmp_path):
+        """Test that a renamed copy hits and changed contents miss."""
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        cache = ExtractionCache(config)
+        cache.put(pdf_path, pdf_data)
+        
+        copy_path = tmp_path / 'renamed.pdf'
+        copy_path.write_bytes(b'%PDF-1.7 content')
+        cached = cache.get(copy_path)
+        assert cached['metadata']['filename'] == 'renamed.pdf'
+        
+        changed_path = tmp_path / 'changed.pdf'
+        changed_path.write_bytes(b'%PDF-1.7 other content')
+        assert cache.get(changed_path) is None
+    
+    def test_keyed_by_extraction_mode(self, config, pdf_data, tmp_path):
+        """Test that entries are not shared across extraction modes."""
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        ExtractionCache(config).put(pdf_path, pdf_data)
+        
+        config['pdf']['extraction_mode'] = 'layout'
+        assert ExtractionCache(config).get(pdf_path) is None
+    
+    def test_disabled(self, config, pdf_data, tmp_path):
+        """Test that nothing is stored when the cache is disabled."""
+        config['advanced']['extraction_cache'] = False
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        cache = ExtractionCache(config)
+        
+        cache.put(pdf_path, pdf_data)
+        assert cache.get(pdf_path) is None
+        assert not (tmp_path / 'cache').exists()
+
+
+class TestDiskCache:
+    """Test cases for DiskCache class."""
+    
+    def test_eviction_removes_least_recently_used(self, tmp_path):
+        """Test that the oldest entries are removed above the size limit."""
+        import os
+        
+        cache = DiskCache(tmp_path, max_size_mb=2.5 / 1024)  # 2.5KB
+        cache.put('aa01', b'x' * 1024)
+        cache.put('bb02', b'x' * 1024)
+        os.utime(cache._entry_path('aa01'), (1, 1))
+        os.utime(cache._entry_path('bb02'), (2, 2))
+        
+        cache.put('cc03', b'x' * 1024)
+        
+        assert cache.get('aa01') is None
+        assert cache.get('bb02') is not None
+        assert cache.get('cc03') is not None
+    
+    def test_corrupt_entry_discarded(self, tmp_path):
+        """Test that unreadable JSON entries are treated as misses."""
+        cache = DiskCache(tmp_path)
+        cache.put('dd04', b'not gzip')
+        
+        assert cache.get_json('dd04') is None
+        assert cache.get('dd04') is None
@@ -0,0 +1,86 @@
+"""
+Tests for the extraction pool.
+"""
+
+import asyncio
+
+import fitz
+import pytest
+
+from src import extraction_pool
+from src.extraction_pool import ExtractionPool
+
+
+def make_pdf(path, pages):
+    """Write a PDF with some text on each page."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(72, 72, 540, 770), f"Section {i + 1}. " + "word " * 80)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Configuration with a filter that rejects short files and no caches."""
+    return {
+        'pdf_filter': {'enabled': True, 'academic_only': True, 'academic_threshold': 50,
+                       'min_pages': 3, 'min_size_mb': 0},
+        'advanced': {'extraction_cache': False, 'cache_dir': str(tmp_path / 'cache')},
+    }
+
+
+def prepare(pool, pdf_path, force=False):
+    """Prepare one file and shut the pool down."""
+    try:
+        return asyncio.run(pool.prepare(pdf_path, force=force))
+    finally:
+        pool.shutdown()
+
+
+class TestExtractionPool:
+    """Test cases for ExtractionPool."""
+    
+    def test_in_process(self, config, tmp_path):
+        """Test that extraction_workers 0 prepares the file without a process pool."""
+        config['advanced']['extraction_workers'] = 0
+        pool = ExtractionPool(config)
+        
+        prepared = prepare(pool, make_pdf(tmp_path / 'paper.pdf', 4), force=True)
+        
+        assert pool._executor is None
+        assert prepared.filter_result is None
+        assert prepared.pdf_data['page_count'] == 4
+        assert prepared.page_images is None
+    
+    def test_in_process_filtered_out(self, config, tmp_path):
+        """Test that a rejected file comes back with its verdict and no extraction."""
+        config['advanced']['extraction_workers'] = 0
+        
+        prepared = prepare(ExtractionPool(config), make_pdf(tmp_path / 'short.pdf', 1))
+        
+        assert not prepared.filter_result.accepted
+        assert prepared.pdf_data is None
+    
+    def test_pooled(self, config, tmp_path):
+        """Test that the process pool is started with spawn and returns the same result."""
+        config['advanced']['extraction_workers'] = 1
+        pool = ExtractionPool(config)
+        pdf_path = make_pdf(tmp_path / 'paper.pdf', 4)
+        
+        assert pool._get_executor()._mp_context.get_start_method() == 'spawn'
+        prepared = prepare(pool, pdf_path, force=True)
+        
+        assert pool._executor is None
+        assert prepared.pdf_data['page_count'] == 4
+        assert prepared.pdf_data['text'] == pool.pdf_extractor.extract(pdf_path)['text']
+    
+    def test_workers_extract_pages_serially(self, config):
+        """Test that pool workers do not start page extraction pools of their own."""
+        config['pdf'] = {'parallel_page_workers': 8}
+        extraction_pool._init_worker(config)
+        
+        assert extraction_pool._worker_extractor.parallel_page_workers == 1
+        assert ExtractionPool(config).pdf_extractor.parallel_page_workers == 8
@@ -0,0 +1,96 @@
+"""
+Tests for bulk filtering and the filter report.
+"""
+
+import csv
+import json
+
+from src.filter_report import FilterReport, filter_files, find_pdfs, report_row, should_quarantine
+from src.pdf_filter import FilterResult, PDFFilter
+
+
+def make_result(accepted, score, **details):
+    """Build a FilterResult with the given stage scores."""
+    return FilterResult(accepted, score, [f"Score {score}"], details)
+
+
+class TestFilterReport:
+    """Test cases for the bulk filter helpers."""
+    
+    def test_find_pdfs(self, tmp_path):
+        """Test that ignore patterns and recursion are honored."""
+        (tmp_path / 'sub').mkdir()
+        for name in ['a.pdf', 'draft_b.pdf', 'sub/c.pdf', 'notes.txt']:
+            (tmp_path / name).write_bytes(b'%PDF-1.7')
+        
+        flat = find_pdfs(tmp_path, ['*.pdf'], ['*draft*'])
+        deep = find_pdfs(tmp_path, ['*.pdf'], ['*draft*'], recursive=True)
+        
+        assert [p.name for p in flat] == ['a.pdf']
+        assert [p.name for p in deep] == ['a.pdf', 'c.pdf']
+    
+    def test_filter_files_in_process(self, tmp_path):
+        """Test that every file yields a verdict."""
+        paths = [tmp_path / 'invoice_2024.pdf', tmp_path / 'other.pdf']
+        for path in paths:
+            path.write_bytes(b'not a pdf')
+        config = {'pdf_filter': {'academic_only': True, 'min_size_mb': 0}}
+        
+        results = list(filter_files(paths, config, workers=0))
+        
+        assert [path for path, _, _ in results] == paths
+        assert all(not result.accepted for _, result, _ in results)
+        assert all(elapsed_ms >= 0 for _, _, elapsed_ms in results)
+    
+    def test_filter_files_in_worker_processes(self, tmp_path):
+        """Test that spawned workers yield the same verdicts in order."""
+        paths = [tmp_path / 'invoice_2024.pdf', tmp_path / 'other.pdf']
+        for path in paths:
+            path.write_bytes(b'not a pdf')
+        config = {'pdf_filter': {'academic_only': True, 'min_size_mb': 0}}
+        
+        results = list(filter_files(paths, config, workers=2))
+        
+        assert [path for path, _, _ in results] == paths
+        assert all(not result.accepted for _, result, _ in results)
+    
+    def test_csv_report_is_ranked(self, tmp_path):
+        """Test that the finished report is sorted by descending score."""
+        report_path = tmp_path / 'report.csv'
+        report = FilterReport(report_path)
+        report.add(report_row(tmp_path / 'low.pdf', make_result(False, -30, metadata_score=-30), 5.0))
+        report.add(report_row(tmp_path / 'high.pdf', make_result(
+            True, 60, metadata_score=60, skipped_stages=['content']), 2.0))
+        report.close()
+        
+        with open(report_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert [row['score'] for row in rows] == ['60', '-30']
+        assert rows[0]['skipped_stages'] == 'content'
+        assert rows[0]['content_score'] == ''
+    
+    def test_jsonl_report(self, tmp_path):
+        """Test that JSONL rows keep lists and numbers."""
+        report_path = tmp_path / 'report.jsonl'
+        report = FilterReport(report_path)
+        report.add(report_row(tmp_path / 'a.pdf', make_result(True, 80, content_score=80), 1.234))
+        report.close()
+        
+        row = json.loads(report_path.read_text(encoding='utf-8'))
+        assert row['score'] == 80
+        assert row['elapsed_ms'] == 1.23
+        assert row['reasons'] == ['Score 80']
+    
+    def test_analysis_errors_not_quarantined(self, tmp_path):
+        """Test that only files rejected on their score are quarantined."""
+        broken = tmp_path / 'broken.pdf'
+        broken.write_bytes(b'%PDF-1.7\n' + b'x' * 2000 + b'\n%%EOF')
+        result = PDFFilter({'pdf_filter': {'enabled': True, 'academic_only': True,
+                                           'min_size_mb': 0}}).filter_pdf(broken)
+        
+        assert not result.accepted
+        assert not should_quarantine(result)
+        assert should_quarantine(make_result(False, -50))
+        assert not should_quarantine(make_result(True, 80))
+        assert not should_quarantine(make_result(False, 0, deferred='size changing'))
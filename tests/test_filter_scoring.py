@@ -0,0 +1,140 @@
+"""
+Tests for vectorized filter scoring and calibration.
+"""
+
+import fitz
+import numpy as np
+import pytest
+
+from src.filter_scoring import (
+    FeatureScorer, calibrate, calibration_config, choose_threshold, evaluate, threshold_curve
+)
+from src.pdf_filter import PDFFilter
+
+
+@pytest.fixture
+def paper_path(tmp_path):
+    """Small PDF with academic content and metadata."""
+    path = tmp_path / 'paper_2024.pdf'
+    doc = fitz.open()
+    for _ in range(10):
+        doc.new_page().insert_text((72, 72), "Abstract\nIntroduction\nResults\nReferences\ndoi:10.1234/abc.1")
+    doc.set_metadata({'title': 'A Paper', 'producer': 'pdfTeX'})
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class TestFeatureScorer:
+    """Test cases for FeatureScorer."""
+    
+    def test_matrix_score_matches_filter(self, paper_path):
+        """Test that the matrix product reproduces the funnel score."""
+        pdf_filter = PDFFilter({'pdf_filter': {'academic_only': False, 'min_size_mb': 0}})
+        scorer = FeatureScorer(pdf_filter)
+        
+        X = scorer.matrix([pdf_filter.extract_features(paper_path), {}])
+        result = pdf_filter.filter_pdf(paper_path)
+        
+        assert scorer.scores(X)[0] == result.score
+        assert scorer.scores(X)[1] == 0
+    
+    def test_outright_rejects_match_filter(self, tmp_path):
+        """Test that files rejected by their filename score alone are rejected by the scorer too."""
+        path = tmp_path / 'invoice.pdf'
+        doc = fitz.open()
+        for _ in range(10):
+            doc.new_page().insert_text((72, 72), "Abstract\nIntroduction\nResults\nReferences\ndoi:10.1234/abc.1")
+        doc.save(path)
+        doc.close()
+        pdf_filter = PDFFilter({'pdf_filter': {'academic_only': True, 'academic_threshold': 50, 'min_size_mb': 0}})
+        scorer = FeatureScorer(pdf_filter)
+        
+        X = scorer.matrix([pdf_filter.extract_features(path)])
+        
+        assert scorer.scores(X)[0] >= scorer.threshold
+        assert not pdf_filter.filter_pdf(path).accepted
+        assert not scorer.accepted(X)[0]
+    
+    def test_weight_overrides(self):
+        """Test that scoring_rules.weights changes scores and stage bounds."""
+        config = {'scoring_rules': {'weights': {'size_optimal': 25, 'unknown_feature': 1}}}
+        pdf_filter = PDFFilter(config)
+        
+        assert pdf_filter.feature_weights['size_optimal'] == 25
+        assert 'unknown_feature' not in pdf_filter.feature_weights
+        assert pdf_filter.stage_bounds['size'] == (-50, 25)
+
+
+class TestCalibration:
+    """Test cases for threshold selection and weight fitting."""
+    
+    def test_threshold_curve(self):
+        """Test precision and recall at each distinct score."""
+        scores = np.array([90, 70, 70, 20])
+        labels = np.array([1, 1, 0, 0])
+        
+        thresholds, precision, recall = threshold_curve(scores, labels)
+        
+        assert thresholds.tolist() == [90, 70, 20]
+        assert precision.tolist() == [1.0, 2 / 3, 0.5]
+        assert recall.tolist() == [0.5, 1.0, 1.0]
+    
+    def test_choose_threshold(self):
+        """Test that the threshold lies between the classes it separates."""
+        scores = np.array([90, 80, 40, 10])
+        labels = np.array([1, 1, 0, 0])
+        
+        threshold = choose_threshold(scores, labels)
+        
+        assert threshold == 60
+        assert evaluate(scores, labels, threshold).f1 == 1.0
+    
+    def test_min_precision(self):
+        """Test that the best recall at the required precision is chosen."""
+        scores = np.array([90, 80, 70, 60, 50])
+        labels = np.array([1, 1, 0, 1, 0])
+        
+        assert choose_threshold(scores, labels, min_precision=1.0) == 75
+        assert choose_threshold(scores, labels, min_precision=0.7) == 55
+    
+    def test_calibrate_separable(self):
+        """Test that fitted weights separate labeled files and map to config sections."""
+        pdf_filter = PDFFilter({'pdf_filter': {'academic_only': True}})
+        scorer = FeatureScorer(pdf_filter)
+        papers = [{'positive:doi_found': 1, 'metadata_author': 1}] * 5
+        others = [{'metadata_author': 1, 'pages_too_few': 1}] * 5
+        X = scorer.matrix(papers + others)
+        labels = np.r_[np.ones(5), np.zeros(5)]
+        
+        result = calibrate(scorer, X, labels)
+        suggested = calibration_config(result, pdf_filter)
+        
+        assert result.after.precision == 1.0
+        assert result.after.recall == 1.0
+        assert result.weights['positive:doi_found'] > 0
+        assert result.weights['pages_too_few'] < 0
+        # Features without variation in the labeled set keep their weight
+        assert result.weights['metadata_author'] == pdf_filter.feature_weights['metadata_author']
+        assert 'doi_found' in suggested['scoring_rules']['positive']
+        assert suggested['pdf_filter']['academic_threshold'] == result.threshold
+    
+    def test_calibrate_rescales_reject_scores(self):
+        """Test that the outright-reject scores follow the weights of their stages."""
+        pdf_filter = PDFFilter({'pdf_filter': {'academic_only': True}})
+        scorer = FeatureScorer(pdf_filter)
+        papers = [{'positive:doi_found': 1, 'filename_year': 1}] * 5
+        others = [{'negative:invoice_pattern': 1, 'size_too_small': 1}] * 5
+        X = scorer.matrix(papers + others)
+        labels = np.r_[np.ones(5), np.zeros(5)]
+        
+        result = calibrate(scorer, X, labels)
+        suggested = calibration_config(result, pdf_filter)
+        
+        weights = result.weights
+        assert result.reject_scores['filename'] == pytest.approx(
+            -100 * min(weights[name] for name in pdf_filter.stage_features['filename']) / -100, abs=0.1
+        )
+        assert result.reject_scores['size'] == pytest.approx(-50 * weights['size_too_small'] / -50, abs=0.1)
+        assert result.after.recall == 1.0
+        assert suggested['pdf_filter']['size_reject_score'] == result.reject_scores['size']
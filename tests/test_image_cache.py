@@ -0,0 +1,92 @@
+"""
+Tests for the page image cache.
+"""
+
+import pytest
+
+import fitz
+
+from src.image_cache import ImageCache
+from src.utils.image_encoding import encode_pixmap, is_grayscale
+
+
+class TestImageCache:
+    """Test cases for ImageCache class."""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Image cache in a temporary folder."""
+        return ImageCache({'advanced': {'cache_dir': str(tmp_path / 'cache')}})
+    
+    @pytest.fixture
+    def pdf_key(self, cache, tmp_path):
+        """Content hash of a small PDF file."""
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        return cache.pdf_key(pdf_path)
+    
+    def test_roundtrip(self, cache, pdf_key):
+        """Test that a stored image and its info are returned."""
+        image_bytes = b'\x89PNG\r\n\x1a\n\x00binary\ndata'
+        cache.put(pdf_key, 0, 150, 'png', image_bytes, {'width': 10, 'height': 20})
+        
+        assert cache.get(pdf_key, 0, 150, 'png') == (image_bytes, {'width': 10, 'height': 20})
+    
+    def test_keyed_by_page_dpi_and_format(self, cache, pdf_key):
+        """Test that other pages, DPIs and formats miss."""
+        cache.put(pdf_key, 0, 150, 'png', b'data', {'width': 10, 'height': 20})
+        
+        assert cache.get(pdf_key, 1, 150, 'png') is None
+        assert cache.get(pdf_key, 0, 200, 'png') is None
+        assert cache.get(pdf_key, 0, 150, 'jpeg') is None
+    
+    def test_disabled(self, tmp_path):
+        """Test that a disabled cache stores nothing."""
+        cache = ImageCache({'advanced': {'cache_dir': str(tmp_path), 'image_cache': False}})
+        pdf_path = tmp_path / 'paper.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7 content')
+        
+        assert cache.pdf_key(pdf_path) is None
+        cache.put(None, 0, 150, 'png', b'data', {})
+        assert cache.get(None, 0, 150, 'png') is None
+
+
+class TestImageEncoding:
+    """Test cases for size-targeted page image encoding."""
+    
+    @pytest.fixture
+    def pixmap(self):
+        """Rendered page with black text and a red rectangle."""
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_text((72, 72), "Black text " * 5)
+            page.draw_rect(fitz.Rect(100, 200, 400, 500), color=(1, 0, 0), fill=(1, 0, 0))
+            return page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+    
+    def test_png_within_budget(self, pixmap):
+        """Test that PNG is used when it fits the budget."""
+        encoded = encode_pixmap(pixmap, 10 * 1024 * 1024)
+        
+        assert encoded.mime_type == 'image/png'
+        assert encoded.scale == 1.0
+    
+    def test_smaller_budget_fits(self, pixmap):
+        """Test that a tight budget is met without rendering again."""
+        png_size = len(pixmap.tobytes("png"))
+        
+        encoded = encode_pixmap(pixmap, png_size // 4)
+        
+        assert len(encoded.data) <= png_size // 4
+        assert encoded.mime_type == 'image/jpeg'
+    
+    def test_grayscale_detection(self, pixmap):
+        """Test that colored pages are kept in color and gray pages converted."""
+        assert not is_grayscale(pixmap)
+        
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_text((72, 72), "Black text")
+            gray_page = page.get_pixmap(alpha=False)
+        
+        assert is_grayscale(gray_page)
+        assert encode_pixmap(gray_page, 10 * 1024 * 1024).data == fitz.Pixmap(fitz.csGRAY, gray_page).tobytes("png")
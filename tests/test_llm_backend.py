@@ -0,0 +1,200 @@
+"""
+Tests for the pluggable LLM backends.
+"""
+
+import asyncio
+import random
+
+import pytest
+from google.genai import errors
+
+from src.adaptive_concurrency import is_throttle, retry_after
+from src.llm_backend import FakeBackend, GeminiBackend, create_backend, latency_sampler
+from src.paper_abstractor import PaperAbstractor
+
+
+class FakeClock:
+    """Clock advanced by sleeps and by the test."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock():
+    """Fake clock shared by a backend and its test."""
+    return FakeClock()
+
+
+def generate(backend, contents='paper text'):
+    """Send one request to a backend."""
+    return asyncio.run(backend.generate_content(model='fake', contents=contents))
+
+
+class TestLatencySampler:
+    """Test cases for latency distributions."""
+    
+    def test_distributions(self):
+        """Test that each distribution draws latencies in its range."""
+        rng = random.Random(0)
+        
+        assert latency_sampler({'distribution': 'constant', 'seconds': 0.5})(rng) == 0.5
+        assert 1.0 <= latency_sampler({'distribution': 'uniform', 'min_seconds': 1.0,
+                                       'max_seconds': 2.0})(rng) <= 2.0
+        assert latency_sampler({'distribution': 'lognormal', 'median_seconds': 2.0})(rng) > 0
+        with pytest.raises(ValueError):
+            latency_sampler({'distribution': 'pareto'})
+
+
+class TestFakeBackend:
+    """Test cases for FakeBackend."""
+    
+    def test_canned_response_with_usage(self, clock):
+        """Test that the response fills in the request id and reports token usage."""
+        backend = FakeBackend(markdown='# Note {request_id}', sleep=clock.sleep,
+                              latency={'distribution': 'constant', 'seconds': 1.5})
+        
+        response = generate(backend)
+        
+        assert response.text.startswith('# Note ') and '{request_id}' not in response.text
+        assert response.usage_metadata.prompt_token_count == len('paper text') // 4
+        assert clock.sleeps == [1.5]
+        assert generate(backend).text == response.text
+    
+    def test_same_seed_same_run(self, clock):
+        """Test that throttling and latencies depend only on the seed and the requests."""
+        def run(order):
+            backend = FakeBackend(throttle_rate=0.5, seed=7, sleep=clock.sleep,
+                                  latency={'distribution': 'uniform', 'max_seconds': 1.0})
+            outcomes = {}
+            for contents in order:
+                clock.sleeps.clear()
+                try:
+                    generate(backend, contents)
+                    outcomes[contents] = clock.sleeps[0]
+                except errors.ClientError:
+                    outcomes[contents] = 'throttled'
+            return outcomes
+        
+        papers = [f"paper {i}" for i in range(20)]
+        outcomes = run(papers)
+        
+        assert outcomes == run(list(reversed(papers)))
+        assert 0 < list(outcomes.values()).count('throttled') < len(papers)
+    
+    def test_injected_throttle(self, clock):
+        """Test that injected 429 errors look like Gemini's, retry hint included."""
+        backend = FakeBackend(throttle_rate=1.0, retry_delay_seconds=3.0, sleep=clock.sleep)
+        
+        with pytest.raises(errors.ClientError) as excinfo:
+            generate(backend)
+        
+        assert is_throttle(excinfo.value)
+        assert retry_after(excinfo.value) == 3.0
+        assert backend.stats['throttled'] == 1
+        assert clock.sleeps == []
+    
+    def test_quota(self, clock):
+        """Test that requests over the per-minute quota wait for the oldest one to expire."""
+        backend = FakeBackend(requests_per_minute=2, clock=clock, sleep=clock.sleep)
+        generate(backend, 'a')
+        clock.now = 20.0
+        generate(backend, 'b')
+        
+        with pytest.raises(errors.ClientError) as excinfo:
+            generate(backend, 'c')
+        
+        assert retry_after(excinfo.value) == 40.0
+        clock.now = 60.0
+        assert generate(backend, 'c').text
+    
+    def test_stream(self, clock):
+        """Test that a streamed response adds up to the full one, usage on the last chunk."""
+        backend = FakeBackend(stream_chunk_chars=50, sleep=clock.sleep,
+                              latency={'distribution': 'constant', 'seconds': 2.0})
+        
+        async def run():
+            return [chunk async for chunk in await backend.generate_content_stream(
+                model='fake', contents='paper text'
+            )]
+        
+        chunks = asyncio.run(run())
+        
+        assert ''.join(chunk.text for chunk in chunks) == generate(backend).text
+        assert len(chunks) > 1
+        assert all(chunk.usage_metadata is None for chunk in chunks[:-1])
+        assert chunks[-1].usage_metadata.candidates_token_count > 0
+        assert sum(clock.sleeps[:len(chunks)]) == pytest.approx(2.0)
+    
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is refused."""
+        with pytest.raises(ValueError):
+            create_backend({'ai': {'backend': 'openai'}})
+
+
+class TestGeminiBackend:
+    """Test cases for the Gemini backend's shared client."""
+    
+    def test_shared_client_closed_by_last_backend(self, monkeypatch):
+        """Test that closing one backend leaves the client of the others open."""
+        config = {'api': {'google_ai_key': 'shared-client-key'}}
+        first = GeminiBackend.from_config(config)
+        second = GeminiBackend.from_config(config)
+        closed = []
+        
+        async def aclose():
+            closed.append(True)
+        
+        monkeypatch.setattr(first.client.aio, 'aclose', aclose)
+        
+        asyncio.run(first.aclose())
+        asyncio.run(first.aclose())
+        assert second.client is first.client
+        assert closed == []
+        
+        asyncio.run(second.aclose())
+        assert closed == [True]
+        third = GeminiBackend.from_config(config)
+        assert third.client is not first.client
+        asyncio.run(third.aclose())
+
+
+class TestAbstractorWithFakeBackend:
+    """Test cases for PaperAbstractor running on the fake backend."""
+    
+    def test_retries_through_throttling_without_api_key(self, tmp_path):
+        """Test that a paper is abstracted offline, retrying past injected 429 errors."""
+        abstractor = PaperAbstractor({
+            'ai': {'backend': 'fake', 'fake': {
+                'latency': {'distribution': 'constant', 'seconds': 0},
+                'throttle_rate': 0.5,
+                'retry_delay_seconds': 0,
+                'seed': 3,
+            }},
+            'abstractor': {'language': 'ja'},
+            'rate_limit': {'request_delay': 0, 'requests_per_minute': 60000},
+            'advanced': {'cache_dir': str(tmp_path / 'cache'), 'retry_attempts': 10},
+        })
+        
+        async def run():
+            return await asyncio.gather(*(
+                abstractor.generate_abstract({'text': f"Paper {i}", 'metadata': {'title': f"Paper {i}"}})
+                for i in range(5)
+            ))
+        
+        results = asyncio.run(run())
+        stats = abstractor.backend.stats
+        
+        assert isinstance(abstractor.backend, FakeBackend)
+        assert all(result['markdown_content'].startswith('---\ntitle: "Fake Paper') for result in results)
+        assert stats['throttled'] > 0
+        assert stats['requests'] == stats['throttled'] + 5
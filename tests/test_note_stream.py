@@ -0,0 +1,135 @@
+"""
+Tests for streaming notes.
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.note_stream import NoteStream
+from src.paper_abstractor import PaperAbstractor
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Configuration with streaming enabled and caches under a temporary directory."""
+    return {
+        'api': {'google_ai_key': 'test-key'},
+        'abstractor': {'language': 'ja', 'stream_output': True},
+        'advanced': {'cache_dir': str(tmp_path / 'cache'), 'retry_attempts': 1},
+    }
+
+
+def chunk_stream(*texts, error=None):
+    """Async iterator of response chunks, optionally failing at the end."""
+    async def chunks():
+        for text in texts:
+            yield Mock(text=text, usage_metadata=None)
+        if error is not None:
+            raise error
+    return chunks()
+
+
+class TestNoteStream:
+    """Test cases for NoteStream."""
+    
+    def test_header_then_chunks(self, tmp_path):
+        """Test that the header is written first and chunks are appended without the code fence."""
+        stream = NoteStream(tmp_path, header='---\ntitle: A\n---\n\n')
+        
+        async def run():
+            await stream.reset()
+            for text in ('```mark', 'down\n# A', '\nBody'):
+                await stream.write(text)
+        
+        asyncio.run(run())
+        
+        assert stream.path.read_text(encoding='utf-8') == '---\ntitle: A\n---\n\n# A\nBody'
+    
+    def test_reset_discards_previous_attempt(self, tmp_path):
+        """Test that a retry starts the note over."""
+        stream = NoteStream(tmp_path)
+        
+        async def run():
+            await stream.reset()
+            await stream.write('first attempt that failed\n')
+            await stream.reset()
+            await stream.write('second attempt\n')
+        
+        asyncio.run(run())
+        
+        assert stream.path.read_text(encoding='utf-8') == 'second attempt\n'
+    
+    def test_finish_moves_final_note(self, tmp_path):
+        """Test that the final note replaces the streamed text at the temporary path."""
+        stream = NoteStream(tmp_path / 'staging')
+        temp_path = tmp_path / 'temp_final.md'
+        
+        async def run():
+            await stream.reset()
+            await stream.write('# Draft\n')
+            return await stream.finish('# Final\n', temp_path)
+        
+        assert asyncio.run(run()) == temp_path
+        assert temp_path.read_text(encoding='utf-8') == '# Final\n'
+        assert not stream.path.exists()
+    
+    def test_keep_partial(self, tmp_path):
+        """Test that streamed text survives a failure and an empty note is removed."""
+        stream = NoteStream(tmp_path, header='---\n---\n\n')
+        empty = NoteStream(tmp_path, header='---\n---\n\n')
+        
+        async def run():
+            await stream.reset()
+            await stream.write('# Partial\n')
+            await empty.reset()
+            return await stream.keep_partial(Path('paper.pdf')), await empty.keep_partial(Path('other.pdf'))
+        
+        partial, nothing = asyncio.run(run())
+        
+        assert partial == tmp_path / 'paper.partial.md'
+        assert partial.read_text(encoding='utf-8') == '---\n---\n\n# Partial\n'
+        assert nothing is None
+        assert list(tmp_path.iterdir()) == [partial]
+
+
+class TestAbstractorStreaming:
+    """Test cases for streamed generation in PaperAbstractor."""
+    
+    def test_streamed_response(self, config, tmp_path):
+        """Test that chunks reach the note as they arrive and the full text is returned and cached."""
+        abstractor = PaperAbstractor(config)
+        abstractor.backend = Mock()
+        abstractor.backend.generate_content_stream = AsyncMock(
+            return_value=chunk_stream("---\ntitle: A Study\n---\n", "# A Study\n", "Body")
+        )
+        stream = NoteStream(tmp_path / 'notes')
+        pdf_data = {'text': 'Paper body', 'metadata': {'title': 'A Study'}, 'pdf_path': 'a.pdf'}
+        
+        result = asyncio.run(abstractor.generate_abstract(pdf_data, stream=stream))
+        
+        assert result['markdown_content'] == "---\ntitle: A Study\n---\n# A Study\nBody"
+        assert stream.path.read_text(encoding='utf-8') == result['markdown_content']
+        
+        cached = NoteStream(tmp_path / 'notes')
+        again = asyncio.run(abstractor.generate_abstract(pdf_data, stream=cached))
+        assert abstractor.backend.generate_content_stream.await_count == 1
+        assert cached.path.read_text(encoding='utf-8') == again['markdown_content']
+    
+    def test_failed_stream_keeps_partial_note(self, config, tmp_path):
+        """Test that text received before the stream died is kept."""
+        abstractor = PaperAbstractor(config)
+        abstractor.backend = Mock()
+        abstractor.backend.generate_content_stream = AsyncMock(
+            return_value=chunk_stream("---\ntitle: A Study\n---\n", error=ConnectionError("reset"))
+        )
+        stream = NoteStream(tmp_path)
+        pdf_data = {'text': 'Paper body', 'metadata': {'title': 'A Study'}, 'pdf_path': 'a.pdf'}
+        
+        with pytest.raises(RuntimeError):
+            asyncio.run(abstractor.generate_abstract(pdf_data, stream=stream))
+        partial = asyncio.run(stream.keep_partial(Path('a.pdf')))
+        
+        assert partial.read_text(encoding='utf-8') == "---\ntitle: A Study\n---\n"
@@ -0,0 +1,131 @@
+"""
+Tests for page text cache functionality.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+import fitz
+
+from src.utils import page_text
+from src.utils.page_text import PageTextCache, extract_pages_parallel
+
+
+class TestPageTextCache:
+    """Test cases for PageTextCache class."""
+    
+    @pytest.fixture
+    def doc(self):
+        """Mock PDF document with three pages."""
+        pages = []
+        for i in range(3):
+            page = MagicMock()
+            page.get_text.return_value = f"Page text {i + 1}"
+            pages.append(page)
+        
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = len(pages)
+        mock_doc.__getitem__.side_effect = lambda i: pages[i]
+        mock_doc.pages = pages
+        return mock_doc
+    
+    def test_text_extracted_once(self, doc):
+        """Test that repeated reads of a page hit PyMuPDF only once."""
+        cache = PageTextCache(doc)
+        
+        assert cache.get(0) == "Page text 1"
+        assert cache.get(0) == "Page text 1"
+        
+        assert doc.pages[0].get_text.call_count == 1
+        assert cache.stats() == {'requests': 2, 'get_text_calls': 1, 'cached_pages': 1}
+    
+    def test_lazy_extraction(self, doc):
+        """Test that pages are not extracted until requested."""
+        cache = PageTextCache(doc)
+        cache.get(2)
+        
+        assert doc.pages[0].get_text.call_count == 0
+        assert doc.pages[2].get_text.call_count == 1
+    
+    def test_flags_cached_separately(self, doc):
+        """Test that text extracted with flags is cached under its own key."""
+        cache = PageTextCache(doc)
+        cache.get(0)
+        cache.get(0, flags=64)
+        cache.get(0, flags=64)
+        
+        assert doc.pages[0].get_text.call_count == 2
+    
+    def test_iter_pages_skips_failures(self, doc):
+        """Test that iteration skips pages whose text cannot be extracted."""
+        doc.pages[1].get_text.side_effect = RuntimeError("broken page")
+        cache = PageTextCache(doc)
+        
+        pages = list(cache.iter_pages())
+        
+        assert [page_num for page_num, _ in pages] == [0, 2]
+    
+    def test_prefill_skips_extraction(self, doc):
+        """Test that prefilled pages are served without calling PyMuPDF."""
+        cache = PageTextCache(doc)
+        cache.prefill({0: "Prefilled 1", 1: "Prefilled 2"})
+        
+        assert cache.get(1) == "Prefilled 2"
+        assert doc.pages[1].get_text.call_count == 0
+    
+    def test_limit_drops_least_recently_used(self, doc):
+        """Test that pages above the character limit are dropped and re-extracted."""
+        cache = PageTextCache(doc, max_chars=25)  # each page is 11 characters
+        cache.get(0)
+        cache.get(1)
+        cache.get(0)
+        cache.get(2)
+        
+        assert cache.stats()['cached_pages'] == 2
+        cache.get(0)
+        cache.get(1)
+        assert doc.pages[0].get_text.call_count == 1
+        assert doc.pages[1].get_text.call_count == 2
+
+
+class TestParallelExtraction:
+    """Test cases for extract_pages_parallel."""
+    
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        """Real seven-page PDF file."""
+        path = tmp_path / 'pages.pdf'
+        with fitz.open() as doc:
+            for i in range(7):
+                page = doc.new_page()
+                page.insert_text((72, 72), f"Content of page {i + 1}")
+            doc.save(path)
+        return path
+    
+    def test_matches_serial_extraction(self, pdf_path):
+        """Test that page ranges split across processes merge back in order."""
+        texts = extract_pages_parallel(pdf_path, 7, workers=3)
+        
+        with fitz.open(pdf_path) as doc:
+            serial = {i: doc[i].get_text() for i in range(len(doc))}
+        
+        assert list(texts) == list(range(7))
+        assert texts == serial
+    
+    def test_matches_cache_with_flags(self, pdf_path):
+        """Test that pages extracted with flags match what the cache reads serially."""
+        flags = fitz.TEXTFLAGS_DICT
+        texts = extract_pages_parallel(pdf_path, 7, workers=2, flags=flags)
+        
+        with fitz.open(pdf_path) as doc:
+            cache = PageTextCache(doc)
+            assert texts == {i: cache.get(i, flags) for i in range(7)}
+    
+    def test_pool_reused_across_documents(self, pdf_path):
+        """Test that later documents reuse the process pool of the first one."""
+        extract_pages_parallel(pdf_path, 7, workers=2)
+        executor = page_text._executor
+        extract_pages_parallel(pdf_path, 7, workers=2)
+        
+        assert page_text._executor is executor
+        assert executor._mp_context.get_start_method() == 'spawn'
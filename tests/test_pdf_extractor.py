@@ -0,0 +1,157 @@
+"""
+Tests for PDF extraction functionality.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+import fitz
+
+from src.pdf_extractor import PDFExtractor, text_budget_chars
+from src.utils.page_text import PageTextCache
+
+
+class TestTextBudget:
+    """Test cases for budgeted text extraction."""
+    
+    @pytest.fixture
+    def doc(self):
+        """In-memory twenty-page PDF with about 500 characters per page."""
+        doc = fitz.open()
+        for i in range(20):
+            page = doc.new_page()
+            page.insert_textbox(fitz.Rect(72, 72, 540, 770), f"Page {i + 1} body. " + "word " * 95)
+        yield doc
+        doc.close()
+    
+    def test_unlimited_budget_keeps_all_pages(self, doc):
+        """Test that a zero budget extracts every page."""
+        extractor = PDFExtractor({'pdf': {'text_budget_chars': 0}, 'advanced': {'extraction_cache': False}})
+        
+        text = extractor.extract_text(doc)
+        
+        assert text.count("[Page ") == 20
+    
+    def test_budget_keeps_head_and_tail(self, doc):
+        """Test that the budget bounds the text and keeps the last pages."""
+        extractor = PDFExtractor({
+            'pdf': {'text_budget_chars': 4000, 'tail_pages': 2},
+            'advanced': {'extraction_cache': False},
+        })
+        
+        text = extractor.extract_text(doc)
+        
+        assert len(text) <= 4000
+        assert "[Page 1]" in text
+        assert "[Page 19]" in text and "[Page 20]" in text
+        assert "[Page 10]" not in text
+        assert "omitted (text budget)" in text
+    
+    def test_middle_pages_not_extracted(self, doc):
+        """Test that pages beyond the budget are never read."""
+        extractor = PDFExtractor({
+            'pdf': {'text_budget_chars': 4000, 'tail_pages': 2},
+            'advanced': {'extraction_cache': False},
+        })
+        page_texts = PageTextCache(doc)
+        
+        extractor.extract_text(doc, page_texts)
+        
+        assert page_texts.stats()['get_text_calls'] < 12
+    
+    def test_structure_and_captions_within_budget(self, doc, tmp_path):
+        """Test that headings and captions are only searched on the pages the budget reached."""
+        doc[9].insert_text((72, 760), "Figure 3: Middle figure")
+        doc[9].insert_text((72, 40), "Discussion")
+        path = tmp_path / 'long.pdf'
+        doc.save(path)
+        config = {'pdf': {'text_budget_chars': 4000, 'tail_pages': 2, 'parallel_page_workers': 1},
+                  'advanced': {'extraction_cache': False}}
+        
+        budgeted = PDFExtractor(config).extract(path)
+        config['pdf']['text_budget_chars'] = 0
+        unlimited = PDFExtractor(config).extract(path)
+        
+        assert [figure['page'] for figure in unlimited['figures']] == [10]
+        assert budgeted['figures'] == []
+        assert 10 in [section['page'] for section in unlimited['structure']]
+        assert 10 not in [section['page'] for section in budgeted['structure']]
+    
+    def test_token_budget_takes_precedence(self):
+        """Test that the token budget is converted to characters."""
+        assert text_budget_chars({'pdf': {'text_budget_chars': 100, 'text_budget_tokens': 50}}) == 200
+        assert text_budget_chars({}) == 60000
+
+
+class TestFigurePageDetection:
+    """Test cases for structural figure page detection."""
+    
+    @pytest.fixture
+    def doc(self):
+        """In-memory PDF with an image page, a plot page, a caption page and text pages."""
+        doc = fitz.open()
+        
+        text_page = doc.new_page()
+        text_page.insert_text((72, 72), "Introduction: figures and results are discussed later.")
+        
+        image_page = doc.new_page()
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+        pix.clear_with(200)
+        image_page.insert_image(fitz.Rect(72, 72, 500, 500), pixmap=pix)
+        image_page.insert_text((72, 530), "Figure 1: Photograph of the setup")
+        
+        plot_page = doc.new_page()
+        for i in range(60):
+            plot_page.draw_line((72 + i * 5, 400), (72 + i * 5, 400 - (i % 7) * 20))
+        plot_page.insert_text((72, 430), "Fig. 2: Measured values")
+        
+        caption_page = doc.new_page()
+        caption_page.insert_text((72, 72), "Table 1: Parameters\nalpha 0.1\nbeta 0.2")
+        
+        plain_page = doc.new_page()
+        plain_page.insert_text((72, 72), "The result table in the figure shows the graph of results.")
+        
+        yield doc
+        doc.close()
+    
+    def test_structural_pages_selected(self, doc):
+        """Test that image and plot pages are selected and caption-only text pages are not."""
+        extractor = PDFExtractor({'advanced': {'extraction_cache': False}})
+        
+        figure_pages = extractor._detect_figure_pages_intelligent(doc)
+        
+        assert {page_num for page_num, _ in figure_pages} == {1, 2}
+    
+    def test_small_logo_not_selected(self):
+        """Test that a text page carrying only a small logo is not a figure page."""
+        extractor = PDFExtractor({'advanced': {'extraction_cache': False}})
+        pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 16), False)
+        pix.clear_with(100)
+        
+        with fitz.open() as doc:
+            page = doc.new_page()
+            page.insert_image(fitz.Rect(500, 20, 540, 60), pixmap=pix)
+            page.insert_text((72, 100), "Figure 2 shows the accuracy of each method.")
+            
+            assert extractor._detect_figure_pages_intelligent(doc) == []
+    
+    def test_drawings_skipped_on_image_pages(self, doc):
+        """Test that vector drawings are only listed on pages the images do not already decide."""
+        extractor = PDFExtractor({'advanced': {'extraction_cache': False}})
+        
+        with patch.object(fitz.Page, 'get_cdrawings', autospec=True,
+                          side_effect=fitz.Page.get_cdrawings) as get_cdrawings:
+            figure_pages = dict(extractor._detect_figure_pages_intelligent(doc))
+        
+        assert 1 in figure_pages and 2 in figure_pages
+        assert [call.args[0].number for call in get_cdrawings.call_args_list] == [0, 2, 3, 4]
+    
+    def test_keywords_alone_do_not_count(self, doc):
+        """Test that pages only mentioning figures in prose are not selected."""
+        extractor = PDFExtractor({'advanced': {'extraction_cache': False}})
+        
+        figure_pages = dict(extractor._detect_figure_pages_intelligent(doc))
+        
+        assert 0 not in figure_pages
+        assert 4 not in figure_pages
@@ -6,7 +6,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-from src.pdf_filter import PDFFilter, FilterResult, ScoringRule
+from src.pdf_filter import PDFFilter, FilterResult, ScoringRule, PatternMatcher
 
 
 class TestPDFFilter:
@@ -103,7 +103,7 @@ class TestPDFFilter:
         assert score == -30
         assert any('too large' in r.lower() for r in reasons)
     
-    @patch('src.pdf_filter.fitz.open')
+    @patch('src.pdf_session.fitz.open')
     def test_metadata_check(self, mock_fitz_open, pdf_filter):
         """Test PDF metadata checking."""
         # Mock PDF document
@@ -125,7 +125,7 @@ class TestPDFFilter:
         assert any('title' in r.lower() for r in reasons)
         assert any('author' in r.lower() for r in reasons)
     
-    @patch('src.pdf_filter.fitz.open')
+    @patch('src.pdf_session.fitz.open')
     def test_content_scan(self, mock_fitz_open, pdf_filter):
         """Test content scanning."""
         # Mock PDF document with academic content
@@ -156,7 +156,7 @@ class TestPDFFilter:
         assert any('References' in r for r in reasons)
         assert any('DOI' in r for r in reasons)
     
-    @patch('src.pdf_filter.fitz.open')
+    @patch('src.pdf_session.fitz.open')
     def test_full_filter_academic_paper(self, mock_fitz_open, pdf_filter):
         """Test full filtering of an academic paper."""
         # Mock file stats
@@ -191,7 +191,7 @@ class TestPDFFilter:
         assert result.score >= 50
         assert 'meets threshold' in result.reasons[0]
     
-    @patch('src.pdf_filter.fitz.open')
+    @patch('src.pdf_session.fitz.open')
     def test_full_filter_non_academic(self, mock_fitz_open, pdf_filter):
         """Test full filtering of a non-academic PDF."""
         # Mock file stats
@@ -206,6 +206,113 @@ class TestPDFFilter:
         assert result.score < 0
         assert 'Invoice pattern' in str(result.reasons)
     
+    @patch('src.pdf_session.fitz.open')
+    def test_full_filter_opens_pdf_once(self, mock_fitz_open, pdf_filter):
+        """Test that the metadata and content levels share one document handle."""
+        pdf_path = Mock(spec=Path)
+        pdf_path.name = 'survey_2024.pdf'
+        pdf_path.stat.return_value.st_size = 3 * 1024 * 1024
+        
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 12
+        mock_doc.metadata = {}
+        mock_doc.__getitem__.return_value.get_text.return_value = "Abstract"
+        mock_fitz_open.return_value.__enter__.return_value = mock_doc
+        
+        pdf_filter.filter_pdf(pdf_path)
+        
+        assert mock_fitz_open.call_count == 1
+    
+    @patch('src.pdf_session.fitz.open')
+    def test_decided_verdict_skips_content_scan(self, mock_fitz_open, pdf_filter):
+        """Test that the content scan is skipped once acceptance is certain."""
+        pdf_path = Mock(spec=Path)
+        pdf_path.name = 'survey_2024.pdf'
+        pdf_path.stat.return_value.st_size = 3 * 1024 * 1024
+        
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 12
+        mock_doc.metadata = {'producer': 'pdfTeX (LaTeX)', 'title': 'Survey', 'author': 'Smith'}
+        mock_fitz_open.return_value.__enter__.return_value = mock_doc
+        
+        result = pdf_filter.filter_pdf(pdf_path)
+        
+        assert result.accepted is True
+        assert result.details['skipped_stages'] == ['content']
+        assert 'content_score' not in result.details
+        assert list(result.details['timings']) == ['sniff', 'filename', 'size', 'metadata']
+        mock_doc.__getitem__.return_value.get_text.assert_not_called()
+    
+    def test_size_check_not_skipped_by_early_acceptance(self, config):
+        """Test that a strongly academic filename does not skip the size stage and its hard reject."""
+        config['scoring_rules']['weights'] = {'filename_keywords': 40}
+        pdf_filter = PDFFilter(config)
+        pdf_path = Mock(spec=Path)
+        pdf_path.name = 'paper_article_journal_conference_2024.pdf'
+        pdf_path.stat.return_value.st_size = 1024
+        pdf_path.stat.return_value.st_mtime = 0
+        
+        result = pdf_filter.filter_pdf(pdf_path)
+        
+        assert result.details['filename_score'] >= pdf_filter.academic_threshold
+        assert result.details['size_score'] == -50
+        assert result.accepted is False
+    
+    @patch('src.pdf_session.fitz.open')
+    def test_content_scan_stops_when_accepted(self, mock_fitz_open, pdf_filter):
+        """Test that remaining pages are not read once the threshold is certain."""
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 10
+        mock_doc.__getitem__.return_value.get_text.return_value = "Abstract\nDOI: 10.1038/s41586-023-1"
+        mock_fitz_open.return_value.__enter__.return_value = mock_doc
+        
+        score, reasons = pdf_filter._quick_content_scan(Path('test.pdf'), accept_at=50)
+        
+        assert score >= 50
+        assert mock_doc.__getitem__.return_value.get_text.call_count == 1
+        assert 'scan stopped after 1 of 5 pages' in reasons[-1]
+    
+    @patch('src.pdf_session.fitz.open')
+    def test_content_scan_with_negative_keyword_weight(self, mock_fitz_open, config):
+        """Test that the scan does not stop early while later keywords can still lower the score."""
+        config['scoring_rules']['weights'] = {'content_keywords': -10}
+        pdf_filter = PDFFilter(config)
+        mock_doc = MagicMock()
+        mock_doc.__len__.return_value = 10
+        mock_doc.__getitem__.return_value.get_text.side_effect = [
+            "Abstract\nDOI: 10.1038/s41586-023-1",
+            "Introduction\nMethodology\nResults\nDiscussion",
+            "Conclusion\nReferences", "", "",
+        ]
+        mock_fitz_open.return_value.__enter__.return_value = mock_doc
+        
+        score, reasons = pdf_filter._quick_content_scan(Path('test.pdf'), accept_at=50)
+        
+        assert mock_doc.__getitem__.return_value.get_text.call_count == 5
+        assert not any('scan stopped' in reason for reason in reasons)
+        assert score < 50
+    
+    def test_stage_bounds_without_academic_only(self, config):
+        """Test that every stage runs when the threshold is not enforced."""
+        config['pdf_filter']['academic_only'] = False
+        pdf_filter = PDFFilter(config)
+        
+        assert not pdf_filter._decided(1000, pdf_filter.STAGES[1:])
+        assert not pdf_filter._decided(-1000, pdf_filter.STAGES[1:])
+    
+    def test_pattern_matcher(self):
+        """Test that literal and regex patterns are matched in one scan."""
+        matcher = PatternMatcher([
+            ('positive:abstract', 'Abstract', False),
+            ('keyword:abstract', 'abstract', False),
+            ('positive:doi', r'10\.\d{4,9}/\S+', True),
+            ('keyword:issn', 'issn', False),
+        ])
+        
+        found = matcher.scan("abstract\ndoi: 10.1109/tpami.2024.1")
+        
+        assert found == {'positive:abstract', 'keyword:abstract', 'positive:doi'}
+    
     def test_custom_scoring_rules(self):
         """Test custom scoring rules."""
         config = {
@@ -0,0 +1,81 @@
+"""
+Tests for the shared PDF session.
+"""
+
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from src.pdf_extractor import PDFExtractor
+from src.pdf_filter import PDFFilter
+from src.pdf_session import PDFSession
+from src.utils.page_text import PageTextCache
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """Small paper-like PDF on disk."""
+    doc = fitz.open()
+    for i in range(6):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(72, 72, 540, 770),
+                            ("Abstract\nWe study sessions. " if i == 0 else f"Section {i}. ") + "word " * 80)
+    path = tmp_path / 'paper.pdf'
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class TestPDFSession:
+    """Test cases for PDFSession."""
+    
+    def test_opened_lazily_and_closed(self, pdf_path):
+        """Test that the document is opened on first access and closed with the session."""
+        with PDFSession(pdf_path) as session:
+            assert not session.is_open
+            assert session.page_count == 6
+            doc = session.doc
+            assert session.is_open
+        
+        assert not session.is_open
+        assert doc.is_closed
+    
+    def test_borrow_reuses_session(self, pdf_path):
+        """Test that borrow yields the given session and leaves it open."""
+        with PDFSession(pdf_path) as session:
+            with PDFSession.borrow(pdf_path, session) as borrowed:
+                assert borrowed is session
+                borrowed.doc
+            assert session.is_open
+    
+    def test_borrow_without_session_closes_temporary(self, pdf_path):
+        """Test that borrow without a session opens a temporary one and closes it afterwards."""
+        with PDFSession.borrow(pdf_path) as borrowed:
+            doc = borrowed.doc
+            assert borrowed.page_count == 6
+        
+        assert doc.is_closed
+    
+    def test_wrapped_document_not_closed(self, pdf_path):
+        """Test that a session does not close a document it did not open."""
+        with fitz.open(pdf_path) as doc:
+            PDFSession(pdf_path, doc=doc).close()
+            assert not doc.is_closed
+    
+    def test_filter_and_extractor_share_one_parse(self, pdf_path):
+        """Test that the filter and the extractor open the file once and read each page once."""
+        config = {'pdf_filter': {'enabled': True, 'min_pages': 1, 'min_size_mb': 0},
+                  'advanced': {'extraction_cache': False}}
+        get_text = PageTextCache.get
+        
+        with patch('src.pdf_session.fitz.open', wraps=fitz.open) as opened, \
+                patch.object(fitz.Page, 'get_text', autospec=True, side_effect=fitz.Page.get_text) as page_reads, \
+                patch.object(PageTextCache, 'get', autospec=True, side_effect=get_text) as lookups:
+            with PDFSession(pdf_path) as session:
+                PDFFilter(config).filter_pdf(pdf_path, session=session)
+                pdf_data = PDFExtractor(config).extract(pdf_path, session=session)
+        
+        assert opened.call_count == 1
+        assert pdf_data['page_count'] == 6
+        assert page_reads.call_count < lookups.call_count
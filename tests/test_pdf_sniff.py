@@ -0,0 +1,115 @@
+"""
+Tests for byte-level PDF sniffing.
+"""
+
+import os
+import time
+
+import fitz
+import pytest
+
+from src.pdf_filter import PDFFilter
+from src.utils.pdf_sniff import sniff_pdf
+
+
+@pytest.fixture
+def pdf_bytes():
+    """Bytes of a small, complete PDF."""
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page().insert_text((72, 72), "Abstract " * 50)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestSniffPDF:
+    """Test cases for sniff_pdf."""
+    
+    def test_complete_pdf(self, tmp_path, pdf_bytes):
+        """Test that a complete PDF passes."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(pdf_bytes)
+        
+        result = sniff_pdf(path)
+        
+        assert result.status == 'pdf'
+        assert result.version is not None
+    
+    def test_html_page(self, tmp_path):
+        """Test that an HTML error page saved as .pdf is not a PDF."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(b'\n<!DOCTYPE html><html><body>403 Forbidden</body></html>')
+        
+        assert sniff_pdf(path).status == 'not_pdf'
+    
+    @pytest.mark.parametrize('content', [b'', b'\x00' * 4096])
+    def test_empty_or_preallocated(self, tmp_path, content):
+        """Test that empty and zero-filled files count as not yet written."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(content)
+        
+        assert sniff_pdf(path).status == 'truncated'
+    
+    def test_truncated_download(self, tmp_path, pdf_bytes):
+        """Test that a file cut off before its trailer is truncated."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(pdf_bytes[:len(pdf_bytes) // 2])
+        
+        assert sniff_pdf(path).status == 'truncated'
+    
+    def test_linearized_length(self, tmp_path):
+        """Test that a linearized file shorter than its declared length is truncated."""
+        head = b'%PDF-1.6\n1 0 obj\n<< /Linearized 1 /L 90000 /H [ 600 150 ] /O 4 /N 2 >>\nendobj\n'
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(head + b'x' * 3000 + b'\nstartxref\n116\n%%EOF\n')
+        
+        result = sniff_pdf(path)
+        
+        assert result.status == 'truncated'
+        assert result.linearized_length == 90000
+
+
+class TestFilterLevelZero:
+    """Test cases for the sniffing level of PDFFilter."""
+    
+    @pytest.fixture
+    def pdf_filter(self):
+        """Filter that accepts small files."""
+        return PDFFilter({'pdf_filter': {'academic_only': True, 'min_size_mb': 0}})
+    
+    def test_not_pdf_rejected(self, tmp_path, pdf_filter):
+        """Test that non-PDFs are rejected without a score from later levels."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(b'<html>Not found</html>')
+        
+        result = pdf_filter.filter_pdf(path)
+        
+        assert result.accepted is False
+        assert result.details['sniff'] == 'not_pdf'
+        assert set(result.details) == {'sniff', 'timings'}
+        assert list(result.details['timings']) == ['sniff']
+    
+    def test_recent_incomplete_deferred(self, tmp_path, pdf_filter, pdf_bytes):
+        """Test that a file still being written is deferred."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(pdf_bytes[:len(pdf_bytes) // 2])
+        
+        result = pdf_filter.filter_pdf(path)
+        
+        assert result.accepted is False
+        assert result.details['deferred']
+        assert 'filename_score' not in result.details
+    
+    def test_old_incomplete_scored(self, tmp_path, pdf_filter, pdf_bytes):
+        """Test that an old truncated file goes through the funnel."""
+        path = tmp_path / 'paper.pdf'
+        path.write_bytes(pdf_bytes[:len(pdf_bytes) // 2])
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        
+        result = pdf_filter.filter_pdf(path)
+        
+        assert 'deferred' not in result.details
+        assert 'filename_score' in result.details
+        assert any('may be damaged' in reason for reason in result.reasons)
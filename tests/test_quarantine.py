@@ -0,0 +1,48 @@
+"""
+Tests for the quarantine of rejected PDFs.
+"""
+
+import asyncio
+
+from src.pdf_filter import FilterResult
+from src.pdf_monitor import PDFMonitor
+from src.utils.quarantine import quarantine_pdf
+
+
+class TestQuarantine:
+    """Test cases for quarantine_pdf."""
+    
+    def test_quarantine_pdf(self, tmp_path):
+        """Test that rejected files are moved without overwriting."""
+        quarantine_folder = tmp_path / 'quarantine'
+        quarantine_folder.mkdir()
+        (quarantine_folder / 'slides.pdf').write_bytes(b'earlier')
+        pdf_path = tmp_path / 'slides.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7')
+        
+        moved = quarantine_pdf(pdf_path, quarantine_folder, -50, ['Score -50'], 50)
+        
+        assert moved == quarantine_folder / 'slides_1.pdf'
+        assert not pdf_path.exists()
+        assert 'Score: -50' in (quarantine_folder / 'slides_1_filter_info.txt').read_text(encoding='utf-8')
+    
+    def test_monitor_uses_same_naming(self, tmp_path):
+        """Test that the folder monitor moves rejected files with the same collision rule."""
+        quarantine_folder = tmp_path / 'quarantine'
+        quarantine_folder.mkdir()
+        (quarantine_folder / 'slides.pdf').write_bytes(b'earlier')
+        pdf_path = tmp_path / 'slides.pdf'
+        pdf_path.write_bytes(b'%PDF-1.7')
+        monitor = PDFMonitor({
+            'api': {'google_ai_key': 'test-key'},
+            'abstractor': {'language': 'ja'},
+            'folder_settings': {'vault_path': str(tmp_path)},
+            'advanced': {'cache_dir': str(tmp_path / 'cache'), 'extraction_workers': 0},
+        }, str(tmp_path / 'notes'))
+        
+        asyncio.run(monitor._quarantine_file(pdf_path, quarantine_folder, FilterResult(False, -50, ['Score -50'], {})))
+        asyncio.run(monitor.paper_abstractor.aclose())
+        
+        assert not pdf_path.exists()
+        assert (quarantine_folder / 'slides_1.pdf').read_bytes() == b'%PDF-1.7'
+        assert (quarantine_folder / 'slides_1_filter_info.txt').exists()
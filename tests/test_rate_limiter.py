@@ -0,0 +1,121 @@
+"""
+Tests for the async token-bucket rate limiter.
+"""
+
+import asyncio
+
+import pytest
+
+from src.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Clock advanced only by the limiter's own sleeps."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock():
+    """Fake clock shared by a limiter and its test."""
+    return FakeClock()
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+    
+    def test_no_delay_with_capacity(self, clock):
+        """Test that requests within capacity are admitted immediately."""
+        limiter = RateLimiter(60, burst=3, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            return [await limiter.acquire() for _ in range(3)]
+        
+        assert asyncio.run(run()) == [0.0, 0.0, 0.0]
+        assert clock.sleeps == []
+    
+    def test_requests_per_minute(self, clock):
+        """Test that requests beyond the burst are spaced at the configured rate."""
+        limiter = RateLimiter(30, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            for _ in range(4):
+                await limiter.acquire()
+        
+        asyncio.run(run())
+        
+        assert clock.sleeps == [pytest.approx(2.0)] * 3
+        assert clock.now == pytest.approx(6.0)
+    
+    def test_tokens_per_minute(self, clock):
+        """Test that the token budget delays requests until it refills."""
+        limiter = RateLimiter(None, tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            await limiter.acquire(5000)
+            return await limiter.acquire(3000)
+        
+        waited = asyncio.run(run())
+        
+        # 2000 missing tokens at 100 tokens per second
+        assert waited == pytest.approx(20.0)
+    
+    def test_oversized_request_waits_for_full_bucket(self, clock):
+        """Test that a request larger than the bucket is delayed, not refused."""
+        limiter = RateLimiter(None, tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            await limiter.acquire(500)
+            return await limiter.acquire(5000)
+        
+        assert asyncio.run(run()) == pytest.approx(30.0)
+        assert limiter.tokens.level < 0
+    
+    def test_fifo_admission(self, clock):
+        """Test that concurrent callers are admitted in arrival order."""
+        limiter = RateLimiter(60, clock=clock, sleep=clock.sleep)
+        admitted = []
+        
+        async def caller(name):
+            await limiter.acquire()
+            admitted.append((name, clock.now))
+        
+        async def run():
+            await asyncio.gather(*(caller(name) for name in 'abcd'))
+        
+        asyncio.run(run())
+        
+        assert [name for name, _ in admitted] == list('abcd')
+        assert [at for _, at in admitted] == pytest.approx([0.0, 1.0, 2.0, 3.0])
+    
+    def test_reconcile(self, clock):
+        """Test that actual usage corrects the token estimate."""
+        limiter = RateLimiter(None, tokens_per_minute=6000, clock=clock, sleep=clock.sleep)
+        
+        async def run():
+            await limiter.acquire(3000)
+        
+        asyncio.run(run())
+        limiter.reconcile(3000, 1000)
+        assert limiter.tokens.level == pytest.approx(5000)
+        
+        limiter.reconcile(1000, 4000)
+        assert limiter.tokens.level == pytest.approx(2000)
+    
+    def test_from_config(self):
+        """Test limiter settings from the rate_limit section."""
+        limiter = RateLimiter.from_config({'rate_limit': {'requests_per_minute': 15, 'burst': 2}})
+        
+        assert limiter.requests.rate == pytest.approx(0.25)
+        assert limiter.requests.capacity == 2
+        assert limiter.tokens is None
@@ -0,0 +1,106 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.paper_abstractor import PaperAbstractor
+from src.response_cache import ResponseCache
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Configuration with the cache under a temporary directory."""
+    return {
+        'api': {'google_ai_key': 'test-key'},
+        'abstractor': {'language': 'ja'},
+        'advanced': {'cache_dir': str(tmp_path / 'cache')},
+    }
+
+
+def make_key(input_text='text', model='gemini-2.0-flash-001', language='en', backend='gemini'):
+    """Cache key with default request settings."""
+    return ResponseCache.key(input_text, [b'page'], backend, model, 'template {pdf_text}', language, '{}')
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+    
+    def test_round_trip(self, config):
+        """Test that a stored response is returned with its usage."""
+        cache = ResponseCache(config)
+        cache.put(make_key(), 'summary', 'gemini-2.0-flash-001', {'prompt_token_count': 10})
+        
+        entry = cache.get(make_key())
+        
+        assert entry['text'] == 'summary'
+        assert entry['usage'] == {'prompt_token_count': 10}
+    
+    def test_key_depends_on_request(self):
+        """Test that input, backend, model and language all change the key."""
+        keys = {make_key(), make_key(input_text='other'), make_key(model='gemini-2.5-pro'),
+                make_key(language='ja'), make_key(backend='fake')}
+        
+        assert len(keys) == 5
+    
+    def test_bypass_and_disabled(self, config):
+        """Test that bypass skips lookups but still stores, and disabling stores nothing."""
+        config['advanced']['llm_cache_bypass'] = True
+        bypassed = ResponseCache(config)
+        bypassed.put(make_key(), 'summary', 'model')
+        
+        assert bypassed.get(make_key()) is None
+        config['advanced']['llm_cache_bypass'] = False
+        assert ResponseCache(config).get(make_key())['text'] == 'summary'
+        
+        config['advanced']['llm_cache'] = False
+        assert ResponseCache(config).get(make_key()) is None
+
+
+class TestAbstractorResponseCache:
+    """Test cases for response caching in PaperAbstractor."""
+    
+    def test_repeat_request_uses_cache(self, config, tmp_path):
+        """Test that the same paper under a new file name reuses the response, linked to its own file."""
+        abstractor = PaperAbstractor(config)
+        abstractor.backend = Mock()
+        abstractor.backend.generate_content = AsyncMock(return_value=Mock(
+            text="---\ntitle: A Study\ncreated: '2020-01-01 00:00:00'\npdf-path: '[[a.pdf]]'\n---\n# A Study",
+            usage_metadata=None
+        ))
+        pdf_data = {'text': 'Paper body', 'metadata': {'title': 'A Study'}}
+        
+        async def run():
+            first = await abstractor.generate_abstract({**pdf_data, 'pdf_path': str(tmp_path / 'a.pdf')})
+            second = await abstractor.generate_abstract({**pdf_data, 'pdf_path': str(tmp_path / "Smith's copy.pdf")})
+            return first, second
+        
+        first, second = asyncio.run(run())
+        
+        assert abstractor.backend.generate_content.await_count == 1
+        assert "pdf-path: '[[a.pdf]]'" in first['markdown_content']
+        assert "pdf-path: '[[Smith''s copy.pdf]]'" in second['markdown_content']
+        assert "created: '2020-01-01" not in second['markdown_content']
+        assert second['markdown_content'].endswith('---\n# A Study')
+    
+    def test_fake_backend_responses_not_served_to_gemini(self, config):
+        """Test that a response cached on the fake backend is not reused with the Gemini API."""
+        pdf_data = {'text': 'Paper body', 'metadata': {'title': 'A Study'}, 'pdf_path': 'a.pdf'}
+        fake = PaperAbstractor({**config, 'ai': {'backend': 'fake', 'fake': {
+            'latency': {'distribution': 'constant', 'seconds': 0},
+        }}})
+        asyncio.run(fake.generate_abstract(pdf_data))
+        
+        abstractor = PaperAbstractor(config)
+        abstractor.backend = Mock()
+        abstractor.backend.generate_content = AsyncMock(return_value=Mock(
+            text="---\ntitle: A Study\n---\n# A Study", usage_metadata=None
+        ))
+        result = asyncio.run(abstractor.generate_abstract(pdf_data))
+        
+        assert fake.backend.stats['requests'] == 1
+        assert abstractor.backend.generate_content.await_count == 1
+        assert 'Fake Paper' not in result['markdown_content']
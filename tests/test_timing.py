@@ -0,0 +1,58 @@
+"""
+Tests for stage timing utilities.
+"""
+
+from src.utils.timing import StageTimer, TimingHistogram, percentile
+
+
+class TestStageTimer:
+    """Test cases for StageTimer."""
+    
+    def test_laps_are_recorded_per_stage(self):
+        """Test that each lap is stored under its stage name."""
+        timer = StageTimer()
+        
+        timer.lap('filename')
+        timer.lap('size')
+        
+        assert list(timer.timings) == ['filename', 'size']
+        assert all(elapsed_ms >= 0 for elapsed_ms in timer.timings.values())
+
+
+class TestTimingHistogram:
+    """Test cases for TimingHistogram."""
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        values = list(range(1, 101))
+        
+        assert percentile(values, 0.50) == 50
+        assert percentile(values, 0.95) == 95
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) == 0.0
+    
+    def test_summary(self):
+        """Test that stages are summarized independently."""
+        histogram = TimingHistogram()
+        for elapsed_ms in range(1, 11):
+            histogram.add({'metadata': elapsed_ms, 'content': elapsed_ms * 10})
+        histogram.add({'metadata': 100})
+        
+        summary = histogram.summary()
+        
+        assert list(summary) == ['metadata', 'content']
+        assert summary['metadata']['count'] == 11
+        assert summary['metadata']['p50'] == 6
+        assert summary['metadata']['p99'] == 100
+        assert summary['content']['total_ms'] == 550
+    
+    def test_sample_limit(self):
+        """Test that counts cover the whole run while samples are bounded."""
+        histogram = TimingHistogram(max_samples=3)
+        for elapsed_ms in [100, 1, 2, 3]:
+            histogram.add({'content': elapsed_ms})
+        
+        summary = histogram.summary()['content']
+        
+        assert summary['count'] == 4
+        assert summary['p99'] == 3
@@ -0,0 +1,99 @@
+"""
+Tests for the filter verdict cache.
+"""
+
+import os
+import time
+
+import pytest
+
+from src.pdf_filter import FilterResult, PDFFilter
+from src.verdict_cache import VerdictCache
+
+
+class TestVerdictCache:
+    """Test cases for VerdictCache class."""
+    
+    @pytest.fixture
+    def pdf_path(self, tmp_path):
+        """Small file standing in for a PDF."""
+        path = tmp_path / 'slides.pdf'
+        path.write_bytes(b'%PDF-1.7 content')
+        return path
+    
+    @pytest.fixture
+    def rejected(self):
+        """Verdict of a rejected file."""
+        return FilterResult(
+            accepted=False,
+            score=-30,
+            reasons=['Score -30 below threshold 50'],
+            details={'total_score': -30}
+        )
+    
+    def test_roundtrip_across_instances(self, tmp_path, pdf_path, rejected):
+        """Test that saved verdicts are returned after a restart."""
+        cache_file = tmp_path / 'filter_verdicts.json'
+        cache = VerdictCache(cache_file, 'abc')
+        
+        assert cache.get(pdf_path) is None
+        cache.put(pdf_path, rejected)
+        cache.save()
+        
+        cached = VerdictCache(cache_file, 'abc').get(pdf_path)
+        assert not cached.accepted
+        assert cached.score == -30
+        assert cached.reasons == rejected.reasons
+        assert 'cached_verdict' in cached.details
+    
+    def test_partial_run_saved_on_timer(self, tmp_path, pdf_path, rejected):
+        """Test that verdicts reach disk without save() or a full batch, as after a crash."""
+        cache_file = tmp_path / 'filter_verdicts.json'
+        other_path = tmp_path / 'handout.pdf'
+        other_path.write_bytes(b'%PDF-1.7 other')
+        cache = VerdictCache(cache_file, 'abc', save_every=25, save_interval_seconds=0.05)
+        cache.put(pdf_path, rejected)
+        cache.put(other_path, rejected)
+        
+        deadline = time.monotonic() + 5
+        while not cache_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        reloaded = VerdictCache(cache_file, 'abc')
+        assert reloaded.get(pdf_path) is not None
+        assert reloaded.get(other_path) is not None
+    
+    def test_changed_file_misses(self, tmp_path, pdf_path, rejected):
+        """Test that a modified file is analyzed again."""
+        cache = VerdictCache(tmp_path / 'filter_verdicts.json', 'abc')
+        cache.put(pdf_path, rejected)
+        
+        stat = pdf_path.stat()
+        os.utime(pdf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert cache.get(pdf_path) is None
+    
+    def test_fingerprint_change_discards(self, tmp_path, pdf_path, rejected):
+        """Test that verdicts are dropped when the filter settings change."""
+        cache_file = tmp_path / 'filter_verdicts.json'
+        cache = VerdictCache(cache_file, 'abc')
+        cache.put(pdf_path, rejected)
+        cache.save()
+        
+        assert VerdictCache(cache_file, 'def').get(pdf_path) is None
+    
+    def test_errors_not_cached(self, tmp_path, pdf_path):
+        """Test that verdicts of files that failed to open are not stored."""
+        cache = VerdictCache(tmp_path / 'filter_verdicts.json', 'abc')
+        cache.put(pdf_path, FilterResult(False, 0, ['Analysis error'], {'error': 'broken'}))
+        
+        assert cache.get(pdf_path) is None
+    
+    def test_filter_fingerprint(self):
+        """Test that the fingerprint follows the verdict-relevant settings."""
+        base = PDFFilter({'pdf_filter': {'academic_threshold': 50}}).fingerprint()
+        
+        assert PDFFilter({'pdf_filter': {'academic_threshold': 50}}).fingerprint() == base
+        assert PDFFilter({'pdf_filter': {'academic_threshold': 60}}).fingerprint() != base
+        
+        rules = {'scoring_rules': {'positive': {'has_doi': {'weight': 99}}}}
+        assert PDFFilter({'pdf_filter': {'academic_threshold': 50}, **rules}).fingerprint() != base
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Page text extraction benchmark.
+
+Runs the PDF extraction pipeline (text, metadata, structure, figures,
+references and page image selection) over one or more PDFs and reports how
+many PyMuPDF ``get_text`` calls each file costs.
+
+"lookups" is the number of page text reads requested by the extractor, which
+is what every read cost before the page text cache existed. "get_text" is the
+number of calls that actually reached PyMuPDF.
+
+Usage:
+    python tools/benchmark_page_text.py paper1.pdf paper2.pdf ...
+    python tools/benchmark_page_text.py ~/Downloads/Papers --recursive
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+import fitz  # PyMuPDF
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pdf_extractor import PDFExtractor  # noqa: E402
+from src.pdf_session import PDFSession  # noqa: E402
+from src.utils.page_text import PageTextCache  # noqa: E402
+
+
+def collect_pdfs(paths: List[str], recursive: bool) -> List[Path]:
+    """Expand files and folders into a list of PDF paths."""
+    pdfs = []
+    for path_str in paths:
+        path = Path(path_str).expanduser()
+        if path.is_dir():
+            pattern = '**/*.pdf' if recursive else '*.pdf'
+            pdfs.extend(sorted(path.glob(pattern)))
+        elif path.suffix.lower() == '.pdf':
+            pdfs.append(path)
+    return pdfs
+
+
+def benchmark_pdf(extractor: PDFExtractor, pdf_path: Path) -> Dict[str, float]:
+    """Run the extraction pipeline on one PDF and count text reads."""
+    counts = {'lookups': 0, 'get_text': 0}
+    
+    original_get = PageTextCache.get
+    original_get_text = fitz.Page.get_text
+    
+    def counting_get(self, *args, **kwargs):
+        counts['lookups'] += 1
+        return original_get(self, *args, **kwargs)
+    
+    def counting_get_text(self, *args, **kwargs):
+        counts['get_text'] += 1
+        return original_get_text(self, *args, **kwargs)
+    
+    with mock.patch.object(PageTextCache, 'get', counting_get), \
+            mock.patch.object(fitz.Page, 'get_text', counting_get_text):
+        start = time.perf_counter()
+        with PDFSession(pdf_path) as session:
+            pdf_data = extractor.extract(pdf_path, session=session)
+            extractor.extract_page_images(pdf_path, session=session)
+        elapsed = time.perf_counter() - start
+    
+    return {
+        'pages': pdf_data['page_count'],
+        'lookups': counts['lookups'],
+        'get_text': counts['get_text'],
+        'seconds': elapsed,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Count PyMuPDF get_text calls per PDF for the extraction pipeline"
+    )
+    parser.add_argument('paths', nargs='+', help='PDF files or folders')
+    parser.add_argument('--recursive', '-r', action='store_true', help='Search folders recursively')
+    parser.add_argument('--layout', action='store_true', help="Use 'layout' extraction mode")
+    args = parser.parse_args()
+    
+    pdfs = collect_pdfs(args.paths, args.recursive)
+    if not pdfs:
+        print("No PDF files found.")
+        return 1
+    
+    config = {
+        # get_text calls are counted in this process, so extract serially
+        'pdf': {
+            'extraction_mode': 'layout' if args.layout else 'auto',
+            'parallel_page_workers': 1,
+        },
+        # Measure actual extraction, not cache hits
+        'advanced': {'image_cache': False, 'extraction_cache': False},
+    }
+    extractor = PDFExtractor(config)
+    
+    print(f"{'file':<40} {'pages':>6} {'lookups':>8} {'get_text':>9} {'ratio':>6} {'time':>8}")
+    total_lookups = 0
+    total_calls = 0
+    for pdf_path in pdfs:
+        try:
+            result = benchmark_pdf(extractor, pdf_path)
+        except Exception as e:
+            print(f"{pdf_path.name[:40]:<40} failed: {e}")
+            continue
+        
+        total_lookups += result['lookups']
+        total_calls += result['get_text']
+        ratio = result['lookups'] / result['get_text'] if result['get_text'] else 0
+        print(f"{pdf_path.name[:40]:<40} {result['pages']:>6} {result['lookups']:>8} "
+              f"{result['get_text']:>9} {ratio:>5.1f}x {result['seconds']:>7.2f}s")
+    
+    if total_calls:
+        print(f"\nTotal: {total_lookups} lookups, {total_calls} get_text calls "
+              f"({total_lookups / total_calls:.1f}x fewer PyMuPDF text extractions)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
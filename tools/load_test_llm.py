@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Offline LLM load test.
+
+Sends synthetic papers through PaperAbstractor on the fake LLM backend, so
+the rate limiter, the adaptive concurrency limit and the retry loop run
+exactly as in watch and batch, without an API key or a network. The fake
+answers after a sampled latency and throttles requests with 429 errors, at
+random (--throttle-rate) or above a per-minute quota (--quota-rpm).
+
+Usage:
+    python tools/load_test_llm.py --papers 200 --median-latency 2 --throttle-rate 0.1
+    python tools/load_test_llm.py --config config/config.yaml --quota-rpm 30 --rpm 60
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import copy
+import logging
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config_loader import ConfigLoader  # noqa: E402
+from src.paper_abstractor import PaperAbstractor  # noqa: E402
+
+
+def merge(base: Dict[str, Any], override: Dict[str, Any]):
+    """Merge override settings into base settings."""
+    for key, value in override.items():
+        if isinstance(base.get(key), dict) and isinstance(value, dict):
+            merge(base[key], value)
+        else:
+            base[key] = value
+
+
+def build_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Configuration of the run: defaults, the config file, then the command line."""
+    config = copy.deepcopy(ConfigLoader.DEFAULT_CONFIG)
+    if args.config:
+        with open(Path(args.config).expanduser(), 'r', encoding='utf-8') as f:
+            merge(config, yaml.safe_load(f) or {})
+    
+    merge(config, {
+        'ai': {
+            'backend': 'fake',
+            'fake': {
+                'latency': {'distribution': 'lognormal', 'median_seconds': args.median_latency,
+                            'sigma': args.latency_sigma},
+                'throttle_rate': args.throttle_rate,
+                'requests_per_minute': args.quota_rpm,
+                'seed': args.seed,
+            },
+        },
+        # The fake renders no pages, and every request must reach the backend
+        'abstractor': {'language': 'ja', 'enable_visual_extraction': False},
+        'advanced': {'llm_cache': False, 'retry_attempts': args.retry_attempts},
+    })
+    if args.rpm is not None:
+        config['rate_limit']['requests_per_minute'] = args.rpm
+    if args.max_concurrency is not None:
+        config['rate_limit']['max_concurrent_requests'] = args.max_concurrency
+    return config
+
+
+async def run(abstractor: PaperAbstractor, papers: int, batch_size: int) -> Dict[str, Any]:
+    """Abstract synthetic papers in batches, as batch_process does."""
+    latencies: List[float] = []
+    failures = 0
+    
+    async def process(i: int):
+        start = time.perf_counter()
+        await abstractor.generate_abstract({
+            'text': f"Synthetic paper {i}. " * 200,
+            'metadata': {'title': f"Synthetic paper {i}"},
+        })
+        latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    for i in range(0, papers, batch_size):
+        results = await asyncio.gather(
+            *(process(j) for j in range(i, min(i + batch_size, papers))), return_exceptions=True
+        )
+        failures += sum(1 for result in results if isinstance(result, Exception))
+    return {'seconds': time.perf_counter() - start, 'latencies': latencies, 'failures': failures}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Load-test the LLM request pipeline against the offline fake backend"
+    )
+    parser.add_argument('--config', help='Configuration file supplying rate_limit settings')
+    parser.add_argument('--papers', type=int, default=100, help='Number of synthetic papers')
+    parser.add_argument('--batch-size', type=int, help='Papers processed together (default: rate_limit.batch_size)')
+    parser.add_argument('--median-latency', type=float, default=2.0, help='Median response latency in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Spread of the lognormal latency')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--quota-rpm', type=int, help='Requests per minute the fake accepts before 429')
+    parser.add_argument('--rpm', type=int, help='Override rate_limit.requests_per_minute')
+    parser.add_argument('--max-concurrency', type=int, help='Override rate_limit.max_concurrent_requests')
+    parser.add_argument('--retry-attempts', type=int, default=5, help='Attempts per paper')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the fake backend')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log every failed attempt')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR)
+    
+    config = build_config(args)
+    abstractor = PaperAbstractor(config)
+    batch_size = args.batch_size or config['rate_limit'].get('batch_size', 5)
+    
+    result = asyncio.run(run(abstractor, args.papers, batch_size))
+    stats = abstractor.backend.stats
+    latencies = sorted(result['latencies'])
+    done = len(latencies)
+    
+    print(f"Papers:        {done} done, {result['failures']} failed in {result['seconds']:.1f}s "
+          f"({done / result['seconds'] * 60:.1f} papers/min)")
+    print(f"Requests:      {stats['requests']} sent, {stats['throttled']} throttled, "
+          f"{stats['requests'] - done - result['failures']} retries")
+    if latencies:
+        p95 = latencies[min(done - 1, int(done * 0.95))]
+        print(f"Paper latency: median {statistics.median(latencies):.2f}s, p95 {p95:.2f}s, "
+              f"max {latencies[-1]:.2f}s")
+    print(f"Concurrency:   max {stats['max_in_flight']} in flight, "
+          f"limit {abstractor.concurrency.current_limit}/{abstractor.concurrency.max_limit} at the end")
+    return 0 if not result['failures'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())